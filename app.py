@@ -1,43 +1,61 @@
-import hashlib
 from contextlib import asynccontextmanager
-from random import randbytes
-from typing import Callable
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from routers import auth_router, exercises_router, health_router, tasks_router, texts_router
-from service_logging import logger
+from routers import (
+    admin_router,
+    auth_router,
+    exercises_router,
+    health_router,
+    metrics_router,
+    tasks_router,
+    texts_router,
+)
+from routers.utils.clients import service_clients
+from routers.utils.jwks import jwks_store
+from routers.utils.observability import ObservabilityMiddleware
+from routers.utils.prober import health_prober
+from routers.utils.sse_hub import sse_hub
+from routers.utils.tracing import tracer
+from service_logging import log_sinks, logger
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     # До запуска приложения
     logger.info("FastAPI application starting up...")
+    await tracer.startup()
+    await service_clients.startup()
+    await jwks_store.startup()
+    await health_prober.startup()
 
     yield
 
     # После запуска
     logger.info("FastAPI application shutting down...")
+    await health_prober.shutdown()
+    await sse_hub.shutdown()
+    await jwks_store.shutdown()
+    await service_clients.shutdown()
+    await tracer.shutdown()
 
-
-gateway = FastAPI(lifespan=lifespan)
+    # Очереди логов записываются до завершения процесса
+    for sink in log_sinks.values():
+        sink.stop()
 
 
-@gateway.middleware("http")
-async def add_request_hash(request: Request, call_next: Callable):
-    request_hash = hashlib.sha1(randbytes(32)).hexdigest()[:10]
-    with logger.contextualize(request_hash=request_hash):
-        response = await call_next(request)
-        return response
-
+gateway = FastAPI(lifespan=lifespan)
 
 gateway.include_router(health_router)
+gateway.include_router(metrics_router)
 gateway.include_router(auth_router)
 gateway.include_router(texts_router)
 gateway.include_router(tasks_router)
 gateway.include_router(exercises_router)
+gateway.include_router(admin_router)
 
+gateway.add_middleware(ObservabilityMiddleware)
 gateway.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # TODO: Изменить в проде
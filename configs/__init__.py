@@ -1,7 +1,22 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .admission import AdmissionConfiguration
+from .auth import AuthConfiguration
+from .cache import CacheConfiguration
+from .deadlines import DeadlinesConfiguration
+from .embedded import EmbeddedConfiguration
+from .passthrough import PassthroughConfiguration
+from .probes import ProbesConfiguration
+from .profiling import ProfilingConfiguration
+from .retries import RetriesConfiguration
 from .services import ServicesConfiguration
+from .status_batch import StatusBatchConfiguration
 from .graylog import GraylogConfiguration
+from .logs import LogsConfiguration
+from .streams import StreamsConfiguration
+from .timing import TimingConfiguration
+from .tracing import TracingConfiguration
+from .uploads import UploadsConfiguration
 
 
 class ProjectConfiguration(BaseSettings):
@@ -10,6 +25,21 @@ class ProjectConfiguration(BaseSettings):
     # * Вложенные группы настроек
     services: ServicesConfiguration = ServicesConfiguration()
     graylog: GraylogConfiguration = GraylogConfiguration()
+    logs: LogsConfiguration = LogsConfiguration()
+    auth: AuthConfiguration = AuthConfiguration()
+    cache: CacheConfiguration = CacheConfiguration()
+    passthrough: PassthroughConfiguration = PassthroughConfiguration()
+    uploads: UploadsConfiguration = UploadsConfiguration()
+    streams: StreamsConfiguration = StreamsConfiguration()
+    deadlines: DeadlinesConfiguration = DeadlinesConfiguration()
+    probes: ProbesConfiguration = ProbesConfiguration()
+    admission: AdmissionConfiguration = AdmissionConfiguration()
+    tracing: TracingConfiguration = TracingConfiguration()
+    timing: TimingConfiguration = TimingConfiguration()
+    profiling: ProfilingConfiguration = ProfilingConfiguration()
+    retry: RetriesConfiguration = RetriesConfiguration()
+    embedded: EmbeddedConfiguration = EmbeddedConfiguration()
+    status_batch: StatusBatchConfiguration = StatusBatchConfiguration()
 
     # * Опциональные переменные
     DEBUG_MODE: bool = False
@@ -0,0 +1,28 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AdmissionConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_ADMISSION_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    RETRY_AFTER: int = 1
+
+    # * Классы роутов ("METHOD /prefix", "/prefix" или "METHOD /path$" для точного пути)
+    EXEMPT_ROUTES: list[str] = ["/health", "/metrics", "/admin", "/docs", "/openapi.json"]
+    LIGHT_ROUTES: list[str] = ["/auth"]
+    HEAVY_ROUTES: list[str] = ["POST /tasks/$"]
+
+    # * Адаптивный лимит одновременных запросов
+    INITIAL_LIMIT: int = 50
+    MIN_LIMIT: int = 5
+    MAX_LIMIT: int = 500
+    HEAVY_MAX_LIMIT: int = 20
+    LATENCY_TOLERANCE: float = 2.0
+    BACKOFF_RATIO: float = 0.9
+    WINDOW: float = 0.1
+    WINDOW_SAMPLES: int = 20
+
+    # * Очередь ожидания
+    QUEUE_SIZE: int = 100
+    QUEUE_TIMEOUT: float = 0.5
@@ -0,0 +1,21 @@
+from typing import Literal
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class AuthConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_AUTH_")
+
+    # * Кэширование результатов авторизации
+    CACHE_ENABLE: bool = True
+    CACHE_SIZE: int = 10000
+    CACHE_TTL: float = 60.0
+    CACHE_NEGATIVE_TTL: float = 5.0
+
+    # * Локальная проверка JWT (remote - через сервис auth, local - на шлюзе)
+    VERIFICATION_MODE: Literal["remote", "local"] = "remote"
+    JWT_ALGORITHMS: list[str] = ["HS256"]
+    JWT_SECRET: str | None = None
+    JWT_PUBLIC_KEY: str | None = None
+    JWKS_URL: str | None = None
+    JWKS_REFRESH_INTERVAL: float = 300.0
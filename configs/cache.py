@@ -0,0 +1,17 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class CacheConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_CACHE_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    SIZE: int = 1000
+    STALE_TTL: float = 60.0
+
+    # * Время жизни ответов по роутам (в секундах, 0 - не кэшировать)
+    TEXTS_TTL: float = 300.0
+    TEXTS_LIST_TTL: float = 60.0
+    EXERCISES_TTL: float = 300.0
+    EXERCISES_LIST_TTL: float = 60.0
+    TASKS_LIST_TTL: float = 5.0
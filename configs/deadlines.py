@@ -0,0 +1,12 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DeadlinesConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_DEADLINES_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+
+    # * Время обработки запроса по роутам (в секундах)
+    DEFAULT: float = 30.0
+    UPLOAD: float = 300.0
@@ -0,0 +1,9 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class EmbeddedConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_EMBEDDED_")
+
+    # * Опциональные переменные
+    TIMEOUT: float = 5.0
+    CONCURRENCY: int = 10
@@ -7,4 +7,5 @@ class GraylogConfiguration(BaseSettings):
     # * Опциональные переменные
     HOST: str = "localhost"
     PORT: int = 12201
+    PROTOCOL: str = "udp"
     ENABLE: bool = False
@@ -0,0 +1,18 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class LogsConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_LOGS_")
+
+    # * Опциональные переменные
+    LEVEL: str = "INFO"
+    ASYNC_MODE: bool = True
+
+    # * Очередь асинхронной записи
+    QUEUE_SIZE: int = 10000
+    BATCH_SIZE: int = 256
+    FLUSH_INTERVAL: float = 0.2
+
+    # * Выборка записей (доля сохраняемых записей от 0 до 1)
+    LEVEL_SAMPLE_RATES: dict[str, float] = {}
+    ROUTE_SAMPLE_RATES: dict[str, float] = {}
@@ -0,0 +1,9 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class PassthroughConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_PASSTHROUGH_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    VALIDATION_RATE: float = 0.01
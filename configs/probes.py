@@ -0,0 +1,11 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ProbesConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_PROBES_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    INTERVAL: float = 5.0
+    TIMEOUT: float = 2.0
+    FAILURE_THRESHOLD: int = 2
@@ -0,0 +1,15 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class ProfilingConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_PROFILING_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    MAX_DURATION: float = 300.0
+
+    # * Профилирование процессора
+    SAMPLE_INTERVAL: float = 0.005
+
+    # * Профилирование памяти (tracemalloc)
+    MEMORY_FRAMES: int = 10
@@ -0,0 +1,9 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class RetriesConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_RETRY_")
+
+    # * Опциональные переменные
+    BUDGET_RATIO: float = 0.1
+    BUDGET_RESERVE: float = 10.0
@@ -7,12 +7,62 @@ class ServiceConfiguration(BaseSettings):
     PORT: int
 
     # * Опциональные переменные
+    NAME: str = "service"
     PROTOCOL: str = "http"
+    HEALTH_PATH: str = "/health"
+
+    # * Настройки пула соединений
+    POOL_SIZE: int = 100
+    POOL_KEEPALIVE_SIZE: int = 20
+    KEEPALIVE_EXPIRY: float = 5.0
+
+    # * Объединение одновременных одинаковых GET запросов
+    COALESCE_REQUESTS: bool = True
+
+    # * Дополнительные экземпляры сервиса (host:port) и балансировка между ними
+    ENDPOINTS: list[str] = []
+    BALANCER_EJECT_FAILURES: int = 5
+    BALANCER_EJECT_DURATION: float = 30.0
+    BALANCER_SLOW_START: float = 30.0
+
+    # * Автоматический выключатель запросов (circuit breaker)
+    BREAKER_ENABLE: bool = True
+    BREAKER_FAILURE_RATE: float = 0.5
+    BREAKER_MIN_REQUESTS: int = 20
+    BREAKER_WINDOW: float = 10.0
+    BREAKER_COOLDOWN: float = 15.0
+    BREAKER_HALF_OPEN_REQUESTS: int = 3
+
+    # * Повтор идемпотентных запросов
+    RETRY_ATTEMPTS: int = 2
+    RETRY_BACKOFF: float = 0.05
+    RETRY_BACKOFF_MAX: float = 1.0
+    RETRY_DEADLINE: float = 5.0
+
+    # * Дублирование медленных GET запросов (hedging)
+    HEDGE_ENABLE: bool = False
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_WINDOW: int = 200
+    HEDGE_MIN_SAMPLES: int = 50
+
+    # * Таймауты (в секундах)
+    CONNECT_TIMEOUT: float = 5.0
+    READ_TIMEOUT: float = 30.0
 
     @property
     def URL(self) -> str:
         return f"{self.PROTOCOL}://{self.HOST}:{self.PORT}"
 
+    @property
+    def ENDPOINT_URLS(self) -> list[str]:
+        urls = [self.URL]
+        for endpoint in self.ENDPOINTS:
+            url = endpoint if "://" in endpoint else f"{self.PROTOCOL}://{endpoint}"
+            if url not in urls:
+                urls.append(url)
+
+        return urls
+
 
 def get_service_configuration(service_name: str) -> ServiceConfiguration:
     env_namespace = f"GATEWAY_SERVICE_{service_name.upper()}_"
@@ -20,6 +70,8 @@ def get_service_configuration(service_name: str) -> ServiceConfiguration:
     class SpecificServiceConfiguration(ServiceConfiguration):
         model_config = SettingsConfigDict(env_prefix=env_namespace)
 
+        NAME: str = service_name
+
     return SpecificServiceConfiguration()
 
 
@@ -29,3 +81,11 @@ class ServicesConfiguration(BaseSettings):
     texts: ServiceConfiguration = get_service_configuration("texts")
     manager: ServiceConfiguration = get_service_configuration("manager")
     exercises: ServiceConfiguration = get_service_configuration("exercises")
+
+    def all(self) -> list[ServiceConfiguration]:
+        """Возвращает конфигурации всех связанных сервисов.
+
+        Returns:
+            list[ServiceConfiguration]: Список конфигураций сервисов.
+        """
+        return [getattr(self, name) for name in type(self).model_fields]
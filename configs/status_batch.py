@@ -0,0 +1,9 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class StatusBatchConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_STATUS_BATCH_")
+
+    # * Опциональные переменные
+    SIZE: int = 100
+    CONCURRENCY: int = 10
@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class StreamsConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_STREAMS_")
+
+    # * Опциональные переменные
+    TIMEOUT: float = 100.0
+    QUEUE_SIZE: int = 32
+    PING_INTERVAL: int = 15
+    MAX_SUBSCRIPTIONS: int = 100
+
+    # * Буфер последних событий для возобновления потока
+    HISTORY_SIZE: int = 16
+    HISTORY_TTL: float = 300.0
+    HISTORY_CHANNELS: int = 10000
@@ -0,0 +1,13 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class TimingConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_TIMING_")
+
+    # * Опциональные переменные
+    ENABLE: bool = True
+    HEADER_ENABLE: bool = False
+
+    # * Журнал медленных запросов
+    SLOW_THRESHOLD: float = 1.0
+    SLOW_BUFFER_SIZE: int = 100
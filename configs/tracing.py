@@ -0,0 +1,16 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class TracingConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_TRACING_")
+
+    # * Опциональные переменные
+    ENABLE: bool = False
+    SAMPLE_RATE: float = 1.0
+
+    # * Экспорт спанов ("console" или "file")
+    EXPORTER: str = "console"
+    FILE_PATH: str = "traces.jsonl"
+    BATCH_SIZE: int = 512
+    QUEUE_SIZE: int = 4096
+    EXPORT_INTERVAL: float = 2.0
@@ -0,0 +1,22 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class UploadsConfiguration(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="GATEWAY_UPLOADS_")
+
+    # * Опциональные переменные
+    MAX_SIZE: int = 50 * 1024 * 1024
+    FIELD_MAX_SIZE: int = 64 * 1024
+    CONTENT_TYPES: list[str] = [
+        "audio/wav",
+        "audio/x-wav",
+        "audio/wave",
+        "audio/mpeg",
+        "audio/mp4",
+        "audio/x-m4a",
+        "audio/aac",
+        "audio/ogg",
+        "audio/webm",
+        "audio/flac",
+        "audio/x-flac",
+    ]
@@ -0,0 +1,106 @@
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from configs import configs
+from schemas.admin import (
+    ClearSlowRequestsResponse,
+    MemoryProfileResponse,
+    SlowRequestResponse,
+)
+from service_logging import logger
+
+from .utils.deadlines import RequestDeadline
+from .utils.profiling import format_collapsed, profiler
+from .utils.protection import AuthorizedUser, RouteProtection
+from .utils.timing import slow_requests
+
+router = APIRouter(
+    prefix="/admin", dependencies=[Depends(RequestDeadline(configs.deadlines.DEFAULT))]
+)
+
+admin_protected = RouteProtection(only_admin=True)
+
+
+@router.get("/slow-requests", summary="Получить журнал медленных запросов", tags=["Admin"])
+async def get_slow_requests(
+    _: Annotated[AuthorizedUser, Depends(admin_protected)],
+    limit: Annotated[int | None, Query(ge=1, description="Максимум запросов")] = None,
+) -> list[SlowRequestResponse]:
+    """Возвращает последние медленные запросы (начиная с последнего) с длительностями фаз."""
+    return slow_requests.get_entries(limit)
+
+
+@router.delete("/slow-requests", summary="Очистить журнал медленных запросов", tags=["Admin"])
+async def clear_slow_requests(
+    auth: Annotated[AuthorizedUser, Depends(admin_protected)],
+) -> ClearSlowRequestsResponse:
+    """Удаляет все запросы из журнала медленных запросов."""
+    removed = slow_requests.clear()
+    logger.info(f"Slow request log cleared by {auth.name}: {removed} entries removed.")
+
+    return ClearSlowRequestsResponse(removed=removed)
+
+
+def check_profiler() -> None:
+    """Проверяет, что профилирование включено и не выполняется в данный момент.
+
+    Raises:
+        HTTPException: Профилирование выключено или уже выполняется.
+    """
+    if not configs.profiling.ENABLE:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+
+    if profiler.active:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Profiling is already in progress"
+        )
+
+
+@router.get("/profile/cpu", summary="Профилировать процессор", tags=["Admin"])
+async def profile_cpu(
+    auth: Annotated[AuthorizedUser, Depends(admin_protected)],
+    duration: Annotated[
+        float, Query(gt=0, le=configs.profiling.MAX_DURATION, description="Длительность (сек.)")
+    ] = 10.0,
+    interval: Annotated[
+        float, Query(ge=0.001, le=1.0, description="Интервал выборки (сек.)")
+    ] = configs.profiling.SAMPLE_INTERVAL,
+) -> PlainTextResponse:
+    """Профилирует цикл событий шлюза выборкой стеков в течение заданного времени.
+    Возвращает стеки в формате collapsed stacks для построения flamegraph.
+    """
+    check_profiler()
+
+    logger.info(f"CPU profiling for {duration}s started by {auth.name}...")
+    stacks, samples = await profiler.profile_cpu(duration, interval)
+    logger.success(f"CPU profiling finished: {samples} samples, {len(stacks)} unique stacks.")
+
+    return PlainTextResponse(content=format_collapsed(stacks))
+
+
+@router.get("/profile/memory", summary="Профилировать память", tags=["Admin"])
+async def profile_memory(
+    auth: Annotated[AuthorizedUser, Depends(admin_protected)],
+    duration: Annotated[
+        float, Query(gt=0, le=configs.profiling.MAX_DURATION, description="Длительность (сек.)")
+    ] = 30.0,
+    frames: Annotated[
+        int, Query(ge=1, le=100, description="Глубина стека выделения")
+    ] = configs.profiling.MEMORY_FRAMES,
+    group_by: Annotated[
+        Literal["lineno", "filename", "traceback"], Query(description="Группировка мест выделения")
+    ] = "lineno",
+    limit: Annotated[int, Query(ge=1, le=1000, description="Максимум мест выделения")] = 20,
+) -> MemoryProfileResponse:
+    """Сравнивает снимки tracemalloc в начале и в конце заданного интервала.
+    Возвращает места выделения памяти по убыванию прироста.
+    """
+    check_profiler()
+
+    logger.info(f"Memory profiling for {duration}s started by {auth.name}...")
+    result = await profiler.profile_memory(duration, frames, group_by, limit)
+    logger.success(f"Memory profiling finished: {result['traced_memory']} bytes traced.")
+
+    return MemoryProfileResponse(**result)
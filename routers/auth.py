@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Body
+from fastapi import APIRouter, Body, Depends
 
 from configs import configs
 from schemas.auth import (
@@ -9,16 +9,22 @@ from schemas.auth import (
 )
 from service_logging import logger
 
+from .utils.deadlines import RequestDeadline
 from .utils.http_proxy import proxy_request
+from .utils.timing import TimedRoute
 
-router = APIRouter(prefix="/auth")
+router = APIRouter(
+    prefix="/auth",
+    dependencies=[Depends(RequestDeadline(configs.deadlines.DEFAULT))],
+    route_class=TimedRoute,
+)
 
 
 @router.post("/login", summary="Аутентификация пользователя", tags=["Auth"])
 async def athenticate_user(user_data: AuthenticateUserRequest) -> AuthenticateUserResponse:
     """Аутентифицирует пользователя в системе ILPS. Возвращает JWT токен доступа в случае успеха."""
     logger.info("User authentication...")
-    async with proxy_request(configs.services.auth.URL) as client:
+    async with proxy_request(configs.services.auth) as client:
         response = await client.post("/login", content=user_data.model_dump_json())
         response.raise_for_status()
 
@@ -30,7 +36,7 @@ async def athenticate_user(user_data: AuthenticateUserRequest) -> AuthenticateUs
 async def register_user(user_data: RegisterUserRequest = Body()) -> RegisterUserResponse:
     """Регистрирует нового пользователя в системе ILPS."""
     logger.info("User registration...")
-    async with proxy_request(configs.services.auth.URL) as client:
+    async with proxy_request(configs.services.auth) as client:
         response = await client.post("/register", content=user_data.model_dump_json())
         response.raise_for_status()
 
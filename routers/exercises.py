@@ -15,12 +15,20 @@ from schemas.exercises import (
 )
 from service_logging import logger
 
-from .utils.embeded import Embedded, EmbeddedResponse
+from .utils.deadlines import RequestDeadline
+from .utils.embeded import Embedded, EmbeddedResponse, embedded_resolvers
 from .utils.http_proxy import proxy_request
 from .utils.pagination import PaginatedResponse, Pagination
+from .utils.passthrough import passthrough_response
 from .utils.protection import AuthorizedUser, RouteProtection
+from .utils.response_cache import response_cache
+from .utils.timing import TimedRoute
 
-router = APIRouter(prefix="/exercises")
+router = APIRouter(
+    prefix="/exercises",
+    dependencies=[Depends(RequestDeadline(configs.deadlines.DEFAULT))],
+    route_class=TimedRoute,
+)
 
 protected = RouteProtection()
 admin_protected = RouteProtection(only_admin=True)
@@ -29,15 +37,23 @@ admin_protected = RouteProtection(only_admin=True)
 @router.get("/", summary="Получить список всех упражнений", tags=["Exercises"])
 async def get_exercises(
     pg: Annotated[Pagination, Depends()],
-    _: Annotated[AuthorizedUser, Depends(protected)],
+    emb: Annotated[Embedded, Depends()],
+    auth: Annotated[AuthorizedUser, Depends(protected)],
 ) -> PaginatedResponse[ExerciseResponse]:
     """Постранично возвращает список всех обучающих упражнений."""
     logger.info("Getting the exercise list...")
-    async with proxy_request(configs.services.exercises.URL) as client:
-        response = await client.get("/", params={"page": pg.page, "size": pg.size})
-        response.raise_for_status()
-
-    paginated_items = PaginatedResponse[ExerciseResponse](**response.json())
+    response = await response_cache.get(
+        configs.services.exercises,
+        "/",
+        ttl=configs.cache.EXERCISES_LIST_TTL,
+        tags=("exercises:list",),
+        params={"page": pg.page, "size": pg.size},
+    )
+
+    data = response.json()
+    embed = await embedded_resolvers.resolve_many(data["items"], emb.get_entities(), auth)
+
+    paginated_items = PaginatedResponse[ExerciseResponse](**data, embedded=embed)
     logger.success(f"Received {len(paginated_items.items)} exercises.")
 
     return paginated_items
@@ -50,9 +66,16 @@ async def get_exercise(
 ) -> DetailExerciseResponse:
     """Возвращает полную информацию о конкретном упражнении по его UUID."""
     logger.info("Getting information about an exercise...")
-    async with proxy_request(configs.services.exercises.URL) as client:
-        response = await client.get(f"/{uuid}")
-        response.raise_for_status()
+    response = await response_cache.get(
+        configs.services.exercises,
+        f"/{uuid}",
+        ttl=configs.cache.EXERCISES_TTL,
+        tags=(f"exercises:{uuid}",),
+    )
+
+    if configs.passthrough.ENABLE:
+        logger.success(f"Exercise received: {uuid}")
+        return passthrough_response(response, DetailExerciseResponse)
 
     item = DetailExerciseResponse(**response.json())
     logger.success(f"Exercise received: ({item.seq_number}){item.id}")
@@ -68,25 +91,18 @@ async def get_exercise(
 async def get_embedded_exercise(
     uuid: Annotated[UUID, Path(...)],
     emb: Annotated[Embedded, Depends()],
-    _: Annotated[AuthorizedUser, Depends(protected)],
+    auth: Annotated[AuthorizedUser, Depends(protected)],
 ) -> EmbeddedResponse[DetailExerciseResponse]:
     """Возвращает полную информацию с доплнительными полями о конкретном упражнении по его UUID."""
-
-    embed = {}
-    entities = emb.get_entities()
-
     logger.info("Getting embedded information about an exercise...")
-    async with proxy_request(configs.services.exercises.URL) as client:
-        response = await client.get(f"/{uuid}")
-        response.raise_for_status()
-        item = DetailExerciseResponse(**response.json())
-
-    if "text" in entities:
-        logger.info("Getting embedding text information...")
-        async with proxy_request(configs.services.texts.URL) as client:
-            response = await client.get(f"/{item.text_id}")
-            response.raise_for_status()
-            embed["text"] = response.json()
+    response = await response_cache.get(
+        configs.services.exercises,
+        f"/{uuid}",
+        ttl=configs.cache.EXERCISES_TTL,
+        tags=(f"exercises:{uuid}",),
+    )
+    item = DetailExerciseResponse(**response.json())
+    embed = await embedded_resolvers.resolve(response.json(), emb.get_entities(), auth)
 
     embedded_item = EmbeddedResponse[DetailExerciseResponse](item=item, embedded=embed)
     logger.success(f"Exercise received: ({embedded_item.item.seq_number}){embedded_item.item.id}")
@@ -101,10 +117,12 @@ async def create_exercise(
 ) -> CreateExerciseResponse:
     """Добавляет новое упражнение в систему."""
     logger.info("Creating an exercise...")
-    async with proxy_request(configs.services.exercises.URL) as client:
+    async with proxy_request(configs.services.exercises) as client:
         response = await client.post("/", content=data.model_dump_json(exclude_none=True))
         response.raise_for_status()
 
+    response_cache.invalidate("exercises:list")
+
     item = CreateExerciseResponse(**response.json())
     logger.success(f"Exercise has been created: ({item.seq_number}){item.id}")
 
@@ -118,10 +136,12 @@ async def delete_exercise(
 ) -> DeleteExerciseResponse:
     """Удаляет упражнение из системы по его UUID."""
     logger.info("Deleting an exercise...")
-    async with proxy_request(configs.services.exercises.URL) as client:
+    async with proxy_request(configs.services.exercises) as client:
         response = await client.delete(f"/{uuid}")
         response.raise_for_status()
 
+    response_cache.invalidate("exercises:list", f"exercises:{uuid}")
+
     item = DeleteExerciseResponse(**response.json())
     logger.success(f"Exercise has been deleted: ({item.seq_number}){item.id}")
 
@@ -136,10 +156,12 @@ async def update_exercise(
 ) -> UpdateExerciseResponse:
     """Обновляет данные текста по его UUID."""
     logger.info("Updating an exercise...")
-    async with proxy_request(configs.services.exercises.URL) as client:
+    async with proxy_request(configs.services.exercises) as client:
         response = await client.patch(f"/{uuid}", content=data.model_dump_json(exclude_none=True))
         response.raise_for_status()
 
+    response_cache.invalidate("exercises:list", f"exercises:{uuid}")
+
     item = UpdateExerciseResponse(**response.json())
     logger.success(f"Exercise has been updated: ({item.seq_number}){item.id}")
 
@@ -3,12 +3,19 @@ import platform
 import socket
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from service_logging import logger
 
+from .utils.admission import admission_controller
+from .utils.balancer import load_balancers
+from .utils.breaker import circuit_breakers
+from .utils.prober import health_prober
+
 router = APIRouter(prefix="/health")
 
+LIVE_RESPONSE = b'{"status":"alive"}'
+
 
 @router.get(path="", summary="Проверка состояния", tags=["Health"])
 async def health_check() -> JSONResponse:
@@ -23,6 +30,9 @@ async def health_check() -> JSONResponse:
                 "os": platform.system(),
                 "os_version": platform.version(),
             },
+            "circuit_breakers": circuit_breakers.stats(),
+            "load_balancers": load_balancers.stats(),
+            "admission": admission_controller.stats(),
             "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         }
 
@@ -34,3 +44,24 @@ async def health_check() -> JSONResponse:
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Health check failed: {str(error)}",
         )
+
+
+@router.get(path="/live", summary="Проверка жизнеспособности", tags=["Health"])
+async def liveness_check() -> Response:
+    """Подтверждает, что процесс шлюза запущен и обрабатывает запросы."""
+    return Response(content=LIVE_RESPONSE, media_type="application/json")
+
+
+@router.get(path="/ready", summary="Проверка готовности", tags=["Health"])
+async def readiness_check() -> Response:
+    """Возвращает результаты последней фоновой проверки связанных сервисов.
+    Если хотя бы один сервис недоступен, возвращается статус 503.
+    """
+    if health_prober.ready:
+        status_code = status.HTTP_200_OK
+    else:
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    return Response(
+        content=health_prober.body, status_code=status_code, media_type="application/json"
+    )
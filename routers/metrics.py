@@ -0,0 +1,226 @@
+from typing import Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from service_logging import log_sinks
+
+from .utils.admission import admission_controller
+from .utils.balancer import load_balancers
+from .utils.breaker import BreakerState, circuit_breakers
+from .utils.clients import service_clients
+from .utils.coalescing import upstream_flight
+from .utils.metrics import MetricFamily, metrics
+from .utils.prober import health_prober
+from .utils.protection import token_cache, verification_flight
+from .utils.response_cache import response_cache
+from .utils.retries import latency_trackers, retry_budget
+from .utils.sse_hub import sse_hub
+from .utils.timing import slow_requests
+from .utils.tracing import tracer
+
+router = APIRouter(prefix="/metrics")
+
+# Поле статистики, суффикс имени метрики, тип и описание
+StatsField = tuple[str, str, str, str]
+
+
+def collect_stats(
+    prefix: str, label: str, stats: dict[str, dict], fields: list[StatsField]
+) -> list[MetricFamily]:
+    """Формирует семейства метрик из статистики нескольких однотипных компонентов.
+
+    Args:
+        prefix (str): Префикс имён метрик.
+        label (str): Имя метки, значением которой служит имя компонента.
+        stats (dict[str, dict]): Статистика по именам компонентов.
+        fields (list[StatsField]): Описание полей статистики.
+
+    Returns:
+        list[MetricFamily]: Семейства метрик.
+    """
+    return [
+        (
+            f"{prefix}_{suffix}",
+            kind,
+            description,
+            [({label: name}, values[key]) for name, values in stats.items()],
+        )
+        for key, suffix, kind, description in fields
+    ]
+
+
+def collect_components() -> Iterable[MetricFamily]:
+    """Собирает метрики из статистики компонентов шлюза."""
+    yield from collect_stats(
+        "gateway_cache",
+        "cache",
+        {"auth_tokens": token_cache.stats(), "responses": response_cache.stats()},
+        [
+            ("size", "entries", "gauge", "Entries in the cache."),
+            ("hits", "hits_total", "counter", "Cache hits."),
+            ("misses", "misses_total", "counter", "Cache misses."),
+            ("evictions", "evictions_total", "counter", "Entries evicted by size limit."),
+        ],
+    )
+    yield (
+        "gateway_cache_stale_hits_total",
+        "counter",
+        "Stale responses served while revalidating.",
+        [({"cache": "responses"}, response_cache.stats()["stale_hits"])],
+    )
+    yield from collect_stats(
+        "gateway_singleflight",
+        "flight",
+        {"upstream": upstream_flight.stats(), "auth": verification_flight.stats()},
+        [
+            ("calls", "calls_total", "counter", "Calls actually executed."),
+            ("collapsed", "collapsed_total", "counter", "Calls joined to an in-flight one."),
+            ("in_flight", "in_flight", "gauge", "Calls currently executing."),
+        ],
+    )
+
+    breakers = circuit_breakers.stats()
+    yield (
+        "gateway_circuit_breaker_state",
+        "gauge",
+        "Circuit breaker state (1 for the current state).",
+        [
+            ({"service": name, "state": state.value}, float(values["state"] == state.value))
+            for name, values in breakers.items()
+            for state in BreakerState
+        ],
+    )
+    yield from collect_stats(
+        "gateway_circuit_breaker",
+        "service",
+        breakers,
+        [
+            ("rejected", "rejected_total", "counter", "Requests rejected by an open breaker."),
+            ("opened", "opened_total", "counter", "Times the breaker opened."),
+        ],
+    )
+
+    budget = retry_budget.stats()
+    yield (
+        "gateway_retry_budget_balance",
+        "gauge",
+        "Retry budget balance.",
+        [({}, budget["balance"])],
+    )
+    yield (
+        "gateway_retries_total",
+        "counter",
+        "Retried and hedged requests.",
+        [({}, budget["retries"])],
+    )
+    yield (
+        "gateway_retry_budget_exhausted_total",
+        "counter",
+        "Retries skipped because the budget was exhausted.",
+        [({}, budget["exhausted"])],
+    )
+    yield from collect_stats(
+        "gateway",
+        "service",
+        latency_trackers.stats(),
+        [
+            ("hedges", "hedged_requests_total", "counter", "Hedged requests sent."),
+            ("hedge_wins", "hedge_wins_total", "counter", "Hedged requests that won the race."),
+        ],
+    )
+
+    endpoints = {
+        (service, endpoint): values
+        for service, balancer in load_balancers.stats().items()
+        for endpoint, values in balancer.items()
+    }
+    for key, suffix, kind, description in [
+        ("outstanding", "outstanding_requests", "gauge", "Requests in flight to the instance."),
+        ("ejected", "ejected", "gauge", "Whether the instance is ejected."),
+        ("ejections", "ejections_total", "counter", "Times the instance was ejected."),
+    ]:
+        yield (
+            f"gateway_endpoint_{suffix}",
+            kind,
+            description,
+            [
+                ({"service": service, "endpoint": endpoint}, float(values[key]))
+                for (service, endpoint), values in endpoints.items()
+            ],
+        )
+
+    yield from collect_stats(
+        "gateway_pool",
+        "service",
+        service_clients.pool_stats(),
+        [
+            ("connections", "connections", "gauge", "Open upstream connections."),
+            ("idle", "idle_connections", "gauge", "Idle keep-alive connections."),
+            ("outstanding", "outstanding_requests", "gauge", "Upstream calls in progress."),
+            ("queued", "queued_requests", "gauge", "Requests waiting for a connection."),
+            ("size", "size", "gauge", "Maximum connections in the pool."),
+        ],
+    )
+
+    hub = sse_hub.stats()
+    for key, suffix, kind, description in [
+        ("channels", "channels", "gauge", "Open upstream task event streams."),
+        ("subscribers", "subscribers", "gauge", "Client task event streams."),
+        ("events", "events_total", "counter", "Task events received from upstream."),
+        ("dropped", "dropped_total", "counter", "Slow subscribers dropped."),
+        ("replayed", "replayed_total", "counter", "Task events replayed on reconnect."),
+    ]:
+        yield f"gateway_sse_{suffix}", kind, description, [({}, hub[key])]
+
+    yield from collect_stats(
+        "gateway_admission",
+        "class",
+        admission_controller.stats(),
+        [
+            ("limit", "limit", "gauge", "Adaptive concurrency limit."),
+            ("inflight", "inflight", "gauge", "Admitted requests in progress."),
+            ("queued", "queued", "gauge", "Requests waiting for admission."),
+            ("rejected", "rejected_total", "counter", "Requests shed with 503."),
+        ],
+    )
+
+    yield from collect_stats(
+        "gateway_log",
+        "sink",
+        {name: sink.stats() for name, sink in log_sinks.items()},
+        [
+            ("written", "written_total", "counter", "Log records written."),
+            ("dropped", "dropped_total", "counter", "Log records dropped on a full queue."),
+        ],
+    )
+
+    spans = tracer.processor.stats()
+    for key, suffix, kind, description in [
+        ("exported", "exported_total", "counter", "Trace spans exported."),
+        ("dropped", "dropped_total", "counter", "Trace spans dropped on a full buffer."),
+    ]:
+        yield f"gateway_trace_spans_{suffix}", kind, description, [({}, spans[key])]
+
+    yield (
+        "gateway_slow_requests_total",
+        "counter",
+        "Requests slower than the capture threshold.",
+        [({}, slow_requests.stats()["captured"])],
+    )
+
+    yield (
+        "gateway_ready",
+        "gauge",
+        "Whether all upstream services passed the last health probe.",
+        [({}, float(health_prober.ready))],
+    )
+
+
+metrics.register_collector(collect_components)
+
+
+@router.get(path="", summary="Метрики Prometheus", tags=["Health"])
+async def get_metrics() -> PlainTextResponse:
+    """Возвращает метрики шлюза в текстовом формате Prometheus."""
+    return PlainTextResponse(content=metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,59 +1,336 @@
-from typing import Annotated
+import asyncio
+from datetime import datetime
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, Path, UploadFile
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Request,
+    WebSocket,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from sse_starlette.sse import EventSourceResponse
 
 from configs import configs
-from schemas.tasks import CreateTaskResponse, DetailTaskResponse, TasksResponse
+from schemas.tasks import (
+    CreateTaskResponse,
+    DetailTaskResponse,
+    TasksResponse,
+    TasksStatusRequest,
+    TasksStatusResponse,
+    TaskStatusResponse,
+)
 from service_logging import logger
 
-from .utils.embeded import Embedded, EmbeddedResponse
-from .utils.http_proxy import proxy_request, proxy_task_sse_request
+from .utils.caching import TTLCache
+from .utils.coalescing import SingleFlight
+from .utils.deadlines import RequestDeadline
+from .utils.embeded import (
+    Embedded,
+    EmbeddedResponse,
+    embedded_resolvers,
+    gather,
+)
+from .utils.http_proxy import proxy_request
+from .utils.multiplex import TaskStreamMultiplexer, authenticate_websocket
+from .utils.ndjson import stream_ndjson
+from .utils.pagination import (
+    CursorKey,
+    CursorPaginatedResponse,
+    CursorPagination,
+    PaginatedResponse,
+    Pagination,
+    encode_cursor,
+)
+from .utils.passthrough import stream_passthrough
 from .utils.protection import AuthorizedUser, RouteProtection
+from .utils.sse_hub import sse_hub
+from .utils.timing import TimedRoute
+from .utils.uploads import MultipartUpload
 
-router = APIRouter(prefix="/tasks")
+router = APIRouter(
+    prefix="/tasks",
+    dependencies=[Depends(RequestDeadline(configs.deadlines.DEFAULT))],
+    route_class=TimedRoute,
+)
+
+# Упорядоченные списки задач пользователей для нарезки страниц
+task_lists: TTLCache[str, list[dict[str, Any]]] = TTLCache(
+    maxsize=configs.cache.SIZE, ttl=configs.cache.TASKS_LIST_TTL
+)
+task_lists_flight: SingleFlight[str, list[dict[str, Any]]] = SingleFlight()
 
 protected = RouteProtection()
 
 
-@router.post("/", summary="Создать задачу на обработку аудио файла", tags=["Tasks"])
+# Тело запроса разбирается вручную, поэтому его схема задаётся явно
+CREATE_TASK_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["title", "text_id", "file"],
+                    "properties": {
+                        "title": {"type": "string"},
+                        "text_id": {"type": "string", "format": "uuid"},
+                        "file": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
+@router.post(
+    "/",
+    summary="Создать задачу на обработку аудио файла",
+    tags=["Tasks"],
+    openapi_extra=CREATE_TASK_OPENAPI,
+    dependencies=[Depends(RequestDeadline(configs.deadlines.UPLOAD))],
+)
 async def create_task(
-    file: Annotated[UploadFile, File(...)],
-    title: Annotated[str, Form(...)],
-    text_id: Annotated[UUID, Form(...)],
+    request: Request,
     auth: Annotated[AuthorizedUser, Depends(protected)],
 ) -> CreateTaskResponse:
     """Создаёт задачу на предобработку и транскрибирование аудиофайла.
     Возвращает UUID созданой задачи с ответом 200, выполняя её в фоне.
+    Аудиофайл передаётся в сервис потоком, не сохраняясь на шлюзе,
+    поэтому поля title и text_id должны предшествовать файлу в теле запроса.
     """
     logger.info("Creating a pronunciation assessment task...")
-    async with proxy_request(configs.services.manager.URL) as client:
-        response = await client.post(
-            "/transcribe",
-            data={"title": title, "text_id": str(text_id), "user_id": str(auth.id)},
-            files={"file": (file.filename, file.file, file.content_type)},
-        )
+    upload = MultipartUpload(
+        request,
+        file_field="file",
+        fields={"title": str, "text_id": UUID},
+        extra={"user_id": str(auth.id)},
+    )
+    await upload.prepare()
+
+    async with proxy_request(configs.services.manager) as client:
+        try:
+            response = await client.post(
+                "/transcribe",
+                content=upload.stream(),
+                headers={"Content-Type": upload.content_type},
+            )
+
+        # Ошибка в запросе клиента прерывает отправку тела запроса в сервис
+        except Exception:
+            if upload.error is not None:
+                raise upload.error from None
+            raise
+
         response.raise_for_status()
 
     item = CreateTaskResponse(**response.json())
+    task_lists.pop(str(auth.id))
     logger.success(f"Task has been created: {item.id}")
 
     return item
 
 
+async def fetch_tasks(user: AuthorizedUser) -> list[dict[str, Any]]:
+    """Получает все задачи пользователя, упорядоченные от новых к старым.
+
+    Сервис-менеджер отдаёт список задач целиком, поэтому страницы нарезаются на шлюзе.
+    Чтобы листание не загружало и не сортировало весь список для каждой страницы,
+    упорядоченный список недолго хранится на шлюзе.
+
+    Args:
+        user (AuthorizedUser): Авторизованный пользователь.
+
+    Raises:
+        HTTPException: Проксированная ошибка от сервиса.
+
+    Returns:
+        list[dict[str, Any]]: Данные задач.
+    """
+    key = str(user.id)
+    if not configs.cache.ENABLE or configs.cache.TASKS_LIST_TTL <= 0:
+        return await load_tasks(key)
+
+    tasks = task_lists.get(key)
+    if tasks is None:
+        tasks = await task_lists_flight.do(key, lambda: load_tasks(key))
+        task_lists.set(key, tasks, ttl=configs.cache.TASKS_LIST_TTL)
+
+    return tasks
+
+
+async def load_tasks(user_id: str) -> list[dict[str, Any]]:
+    """Запрашивает все задачи пользователя у сервиса-менеджера и упорядочивает их.
+
+    Args:
+        user_id (str): Идентификатор пользователя.
+
+    Raises:
+        HTTPException: Проксированная ошибка от сервиса.
+
+    Returns:
+        list[dict[str, Any]]: Данные задач.
+    """
+    async with proxy_request(configs.services.manager) as client:
+        response = await client.post("/", json={"user_id": user_id})
+        response.raise_for_status()
+
+    tasks = response.json()
+    tasks.sort(key=get_task_key, reverse=True)
+
+    return tasks
+
+
+def get_task_key(task: dict[str, Any]) -> CursorKey:
+    """Возвращает позицию задачи в выдаче.
+
+    Args:
+        task (dict[str, Any]): Данные задачи.
+
+    Returns:
+        CursorKey: Время создания и идентификатор задачи.
+    """
+    return datetime.fromisoformat(task["created_at"]), str(task["id"])
+
+
 @router.get("/", summary="Получить список задач", tags=["Tasks"])
-async def get_tasks(auth: Annotated[AuthorizedUser, Depends(protected)]) -> list[TasksResponse]:
-    """Получает список всех задач, когда либо созданных в системе ILPS."""
+async def get_tasks(
+    pg: Annotated[Pagination, Depends()],
+    emb: Annotated[Embedded, Depends()],
+    auth: Annotated[AuthorizedUser, Depends(protected)],
+) -> PaginatedResponse[TasksResponse]:
+    """Получает страницу списка задач пользователя, упорядоченного от новых к старым.
+    При указании сущностей расширения возвращает страницу вместе с ними.
+    Страница вырезается шлюзом из списка, который хранится несколько секунд,
+    поэтому статусы задач в нём могут отставать.
+    """
     logger.info("Getting the task list...")
-    async with proxy_request(configs.services.manager.URL) as client:
-        response = await client.post("/", json={"user_id": str(auth.id)})
-        response.raise_for_status()
+    tasks = await fetch_tasks(auth)
+
+    page = tasks[pg.skip : pg.skip + pg.size]
+    embed = await embedded_resolvers.resolve_many(page, emb.get_entities(), auth)
+
+    paginated_items = PaginatedResponse[TasksResponse](
+        items=page, page=pg.page, size=pg.size, total=len(tasks), embedded=embed
+    )
+    logger.success(f"Received {len(paginated_items.items)} tasks.")
+
+    return paginated_items
+
+
+@router.get("/cursor", summary="Получить список задач с пагинацией по курсору", tags=["Tasks"])
+async def get_tasks_by_cursor(
+    pg: Annotated[CursorPagination, Depends()],
+    emb: Annotated[Embedded, Depends()],
+    auth: Annotated[AuthorizedUser, Depends(protected)],
+) -> CursorPaginatedResponse[TasksResponse]:
+    """Получает страницу списка задач пользователя, упорядоченного от новых к старым.
+    Следующая страница запрашивается по курсору из ответа и не сдвигается
+    при создании новых задач. Страница вырезается шлюзом из списка, который
+    хранится несколько секунд, поэтому статусы задач в нём могут отставать.
+    """
+    logger.info("Getting the task list...")
+    tasks = await fetch_tasks(auth)
+
+    key = pg.get_key()
+    start = 0
+    if key is not None:
+        start = next((i for i, task in enumerate(tasks) if get_task_key(task) < key), len(tasks))
 
-    items = [TasksResponse(**task) for task in response.json()]
-    logger.success(f"Received {len(items)} tasks.")
+    page = tasks[start : start + pg.size]
+    next_cursor = None
+    if start + pg.size < len(tasks):
+        next_cursor = encode_cursor(get_task_key(page[-1]))
 
-    return items
+    embed = await embedded_resolvers.resolve_many(page, emb.get_entities(), auth)
+
+    paginated_items = CursorPaginatedResponse[TasksResponse](
+        items=page, size=pg.size, next_cursor=next_cursor, embedded=embed
+    )
+    logger.success(f"Received {len(paginated_items.items)} tasks.")
+
+    return paginated_items
+
+
+@router.get(
+    "/ndjson",
+    summary="Получить список задач потоком",
+    tags=["Tasks"],
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def stream_tasks(
+    auth: Annotated[AuthorizedUser, Depends(protected)],
+) -> StreamingResponse:
+    """Передаёт все задачи пользователя в формате NDJSON по одной на строку,
+    в порядке сервиса-менеджера. Задачи отправляются по мере получения,
+    не собираясь на шлюзе в общий список.
+    """
+    logger.info("Streaming the task list...")
+    return await stream_ndjson(
+        configs.services.manager, "POST", "/", TasksResponse, json={"user_id": str(auth.id)}
+    )
+
+
+@router.post("/status:batch", summary="Получить статусы нескольких задач", tags=["Tasks"])
+async def get_tasks_status(
+    request: Annotated[TasksStatusRequest, Body(...)],
+    auth: Annotated[AuthorizedUser, Depends(protected)],
+) -> TasksStatusResponse:
+    """Получает статусы и точность произношения нескольких задач за один запрос.
+    Задачи, которые не найдены или недоступны пользователю, перечисляются отдельно.
+    """
+    ids = list(dict.fromkeys(request.ids))
+    if len(ids) > configs.status_batch.SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"No more than {configs.status_batch.SIZE} tasks per request",
+        )
+
+    logger.info(f"Getting the status of {len(ids)} tasks...")
+    semaphore = asyncio.Semaphore(configs.status_batch.CONCURRENCY)
+
+    async def fetch(uuid: UUID) -> TaskStatusResponse | None:
+        async with semaphore:
+            try:
+                async with proxy_request(configs.services.manager) as client:
+                    response = await client.post(f"/{uuid}", json={"user_id": str(auth.id)})
+                    response.raise_for_status()
+
+            except HTTPException as error:
+                if status.HTTP_400_BAD_REQUEST <= error.status_code < 500:
+                    return None
+                raise
+
+        return TaskStatusResponse(**response.json())
+
+    results = await gather([fetch(uuid) for uuid in ids])
+
+    items = {uuid: result for uuid, result in zip(ids, results) if result is not None}
+    missing = [uuid for uuid, result in zip(ids, results) if result is None]
+    logger.success(f"Received the status of {len(items)} tasks.")
+
+    return TasksStatusResponse(items=items, missing=missing)
+
+
+@router.websocket("/stream")
+async def monitor_tasks(websocket: WebSocket) -> None:
+    """Передаёт обновления статусов многих задач по одному WebSocket соединению.
+    Токен доступа передаётся в заголовке Authorization или Query параметре token.
+    Клиент управляет отслеживаемыми задачами сообщениями TaskStreamRequest
+    и получает сообщения TaskStreamEvent.
+    """
+    auth = await authenticate_websocket(websocket, protected)
+    await websocket.accept()
+
+    logger.info("Streaming multiplexed task status updates...")
+    await TaskStreamMultiplexer(websocket, auth).run()
 
 
 @router.get("/{uuid}", summary="Получить актуальную информацию о задаче", tags=["Tasks"])
@@ -65,7 +342,19 @@ async def get_task(
     Возвращает полную информацию о задаче.
     """
     logger.info("Getting information about a task...")
-    async with proxy_request(configs.services.manager.URL) as client:
+    if configs.passthrough.ENABLE:
+        response = await stream_passthrough(
+            configs.services.manager,
+            "POST",
+            f"/{uuid}",
+            DetailTaskResponse,
+            json={"user_id": str(auth.id)},
+        )
+        logger.success(f"Task received: {uuid}")
+
+        return response
+
+    async with proxy_request(configs.services.manager) as client:
         response = await client.post(f"/{uuid}", json={"user_id": str(auth.id)})
         response.raise_for_status()
 
@@ -88,21 +377,13 @@ async def get_embedded_task(
     """Получает текущую информацию по UUID указаной задачи.
     Возвращает полную информацию о задаче, а также доплнительные поля.
     """
-    embed = {}
-    entities = emb.get_entities()
-
     logger.info("Getting information about a task...")
-    async with proxy_request(configs.services.manager.URL) as client:
+    async with proxy_request(configs.services.manager) as client:
         response = await client.post(f"/{uuid}", json={"user_id": str(auth.id)})
         response.raise_for_status()
-        item = DetailTaskResponse(**response.json())
 
-    if "text" in entities:
-        logger.info("Getting embedding text information...")
-        async with proxy_request(configs.services.texts.URL) as client:
-            response = await client.get(f"/{item.text_id}")
-            response.raise_for_status()
-            embed["text"] = response.json()
+    item = DetailTaskResponse(**response.json())
+    embed = await embedded_resolvers.resolve(response.json(), emb.get_entities(), auth)
 
     embedded_item = EmbeddedResponse[DetailTaskResponse](item=item, embedded=embed)
     logger.success(f"Task received: {item.id}")
@@ -114,10 +395,14 @@ async def get_embedded_task(
 async def monitor_task(
     uuid: Annotated[UUID, Path(...)],
     auth: Annotated[AuthorizedUser, Depends(protected)],
+    last_event_id: Annotated[str | None, Header()] = None,
 ) -> EventSourceResponse:
     """Получает информацию об обновлениях статуса задачи
     в реальном времени, используя протокол SSE стриминга.
+    Клиенты, следящие за одной задачей, используют общий поток из сервиса.
+    При переподключении с заголовком Last-Event-ID сначала
+    отправляются пропущенные клиентом события.
     """
     logger.info("Streaming task status updates....")
-    event_generator = proxy_task_sse_request(str(uuid), str(auth.id))
-    return EventSourceResponse(event_generator)
+    event_generator = sse_hub.subscribe(str(uuid), str(auth.id), last_event_id)
+    return EventSourceResponse(event_generator, ping=configs.streams.PING_INTERVAL)
@@ -15,11 +15,20 @@ from schemas.texts import (
 )
 from service_logging import logger
 
+from .utils.deadlines import RequestDeadline
+from .utils.embeded import Embedded, embedded_resolvers
 from .utils.http_proxy import proxy_request
 from .utils.pagination import PaginatedResponse, Pagination
+from .utils.passthrough import passthrough_response
 from .utils.protection import AuthorizedUser, RouteProtection
+from .utils.response_cache import response_cache
+from .utils.timing import TimedRoute
 
-router = APIRouter(prefix="/texts")
+router = APIRouter(
+    prefix="/texts",
+    dependencies=[Depends(RequestDeadline(configs.deadlines.DEFAULT))],
+    route_class=TimedRoute,
+)
 
 protected = RouteProtection()
 admin_protected = RouteProtection(only_admin=True)
@@ -28,15 +37,23 @@ admin_protected = RouteProtection(only_admin=True)
 @router.get("/", summary="Получить список всех текстов", tags=["Texts"])
 async def get_texts(
     pg: Annotated[Pagination, Depends()],
-    _: Annotated[AuthorizedUser, Depends(protected)],
+    emb: Annotated[Embedded, Depends()],
+    auth: Annotated[AuthorizedUser, Depends(protected)],
 ) -> PaginatedResponse[LearningTextResponse]:
     """Возвращает полный список всех обучающих текстов с краткой информацией."""
     logger.info("Getting the text list...")
-    async with proxy_request(configs.services.texts.URL) as client:
-        response = await client.get("/", params={"page": pg.page, "size": pg.size})
-        response.raise_for_status()
-
-    paginated_items = PaginatedResponse[LearningTextResponse](**response.json())
+    response = await response_cache.get(
+        configs.services.texts,
+        "/",
+        ttl=configs.cache.TEXTS_LIST_TTL,
+        tags=("texts:list",),
+        params={"page": pg.page, "size": pg.size},
+    )
+
+    data = response.json()
+    embed = await embedded_resolvers.resolve_many(data["items"], emb.get_entities(), auth)
+
+    paginated_items = PaginatedResponse[LearningTextResponse](**data, embedded=embed)
     logger.success(f"Received {len(paginated_items.items)} texts.")
 
     return paginated_items
@@ -49,9 +66,16 @@ async def get_text(
 ) -> DetailLearningTextResponse:
     """Возвращает полную информацию о конкретном тексте по его UUID."""
     logger.info("Getting information about a text...")
-    async with proxy_request(configs.services.texts.URL) as client:
-        response = await client.get(f"/{uuid}")
-        response.raise_for_status()
+    response = await response_cache.get(
+        configs.services.texts,
+        f"/{uuid}",
+        ttl=configs.cache.TEXTS_TTL,
+        tags=(f"texts:{uuid}",),
+    )
+
+    if configs.passthrough.ENABLE:
+        logger.success(f"Text received: {uuid}")
+        return passthrough_response(response, DetailLearningTextResponse)
 
     item = DetailLearningTextResponse(**response.json())
     logger.success(f"Text received: {item.id}")
@@ -66,10 +90,12 @@ async def create_text(
 ) -> CreateLearningTextResponse:
     """Добавляет новый текст в систему."""
     logger.info("Creating a text...")
-    async with proxy_request(configs.services.texts.URL) as client:
+    async with proxy_request(configs.services.texts) as client:
         response = await client.post("/", content=data.model_dump_json(exclude_none=True))
         response.raise_for_status()
 
+    response_cache.invalidate("texts:list")
+
     item = CreateLearningTextResponse(**response.json())
     logger.success(f"Text has been created: {item.id}")
 
@@ -83,10 +109,12 @@ async def delete_text(
 ) -> DeleteLearningTextResponse:
     """Удаляет текст из системы по его UUID."""
     logger.info("Deleting a text...")
-    async with proxy_request(configs.services.texts.URL) as client:
+    async with proxy_request(configs.services.texts) as client:
         response = await client.delete(f"/{uuid}")
         response.raise_for_status()
 
+    response_cache.invalidate("texts:list", f"texts:{uuid}")
+
     item = DeleteLearningTextResponse(**response.json())
     logger.success(f"Text has been deleted: {item.id}")
 
@@ -101,10 +129,12 @@ async def update_text(
 ) -> UpdateLearningTextResponse:
     """Обновляет данные текста по его UUID."""
     logger.info("Updating a text...")
-    async with proxy_request(configs.services.texts.URL) as client:
+    async with proxy_request(configs.services.texts) as client:
         response = await client.patch(f"/{uuid}", content=data.model_dump_json(exclude_none=True))
         response.raise_for_status()
 
+    response_cache.invalidate("texts:list", f"texts:{uuid}")
+
     item = UpdateLearningTextResponse(**response.json())
     logger.success(f"Text has been updated: {item.id}")
 
@@ -0,0 +1,296 @@
+import asyncio
+import time
+from collections import deque
+
+from configs import configs
+
+# Количество окон до начала оценки задержки
+WARMUP_WINDOWS = 5
+# Скорость изменения базовой задержки за одно окно (экспоненциальное среднее)
+BASELINE_ALPHA = 0.02
+
+# Правило класса роутов: HTTP метод (None - любой), путь и признак точного совпадения
+Rule = tuple[str | None, str, bool]
+
+
+class AdaptiveLimiter:
+    """Адаптивный лимит одновременных запросов (AIMD).
+
+    Задержка оценивается по окнам: окно закрывается, когда прошло не меньше
+    window секунд и получено не меньше window_samples ответов. Средняя задержка
+    окна сравнивается с базовой (долгосрочным средним по окнам), поэтому устойчивое
+    сочетание быстрых и медленных роутов одного класса не считается перегрузкой.
+    Если средняя задержка окна превышает базовую более чем в заданное число раз,
+    лимит уменьшается в заданное число раз. Иначе, если лимит использовался
+    хотя бы наполовину, он растёт примерно на единицу за каждые limit запросов.
+    Таймауты сервисов уменьшают лимит сразу, но уменьшения происходят
+    не чаще одного раза за окно. Запросы сверх лимита ожидают в ограниченной очереди.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        tolerance: float,
+        backoff_ratio: float,
+        window: float,
+        window_samples: int,
+        queue_size: int,
+        queue_timeout: float,
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            name (str): Имя класса роутов.
+            initial_limit (int): Начальный лимит.
+            min_limit (int): Минимальный лимит.
+            max_limit (int): Максимальный лимит.
+            tolerance (float): Допустимое превышение базовой задержки (во сколько раз).
+            backoff_ratio (float): Множитель уменьшения лимита.
+            window (float): Минимальная длительность окна оценки задержки в секундах.
+            window_samples (int): Минимальное количество ответов в окне.
+            queue_size (int): Максимум запросов в очереди ожидания.
+            queue_timeout (float): Максимальное время ожидания в очереди в секундах.
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.tolerance = tolerance
+        self.backoff_ratio = backoff_ratio
+        self.window = window
+        self.window_samples = window_samples
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.inflight = 0
+
+        self.rejected = 0
+        self.decreases = 0
+
+        self._waiters: deque[asyncio.Future] = deque()
+        self._baseline: float | None = None
+        self._windows = 0
+        self._decreased_at = float("-inf")
+
+        self._window_started = time.monotonic()
+        self._window_total = 0.0
+        self._window_count = 0
+        self._window_utilized = False
+
+    async def acquire(self) -> bool:
+        """Занимает место для запроса, при необходимости ожидая в очереди.
+        Занятое место должно быть освобождено вызовом release.
+
+        Returns:
+            bool: False, если запрос отклонён.
+        """
+        if self.inflight < int(self.limit) and not self._waiters:
+            self.inflight += 1
+            return True
+
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await waiter
+            return True
+
+        except BaseException as error:
+            # Место могло быть передано запросу одновременно с отменой ожидания
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+
+            if isinstance(error, TimeoutError):
+                self.rejected += 1
+                return False
+            raise
+
+    def release(self, latency: float | None = None, overloaded: bool = False) -> None:
+        """Освобождает место запроса и передаёт его первому ожидающему.
+
+        Args:
+            latency (float | None): Задержка ответа в секундах (None - без учёта).
+            overloaded (bool): Признак перегрузки сервиса (например, таймаут).
+        """
+        if latency is not None:
+            self._update(latency, overloaded)
+
+        self.inflight -= 1
+
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self.inflight += 1
+
+    def stats(self) -> dict[str, float | int | None]:
+        """Возвращает состояние лимита.
+
+        Returns:
+            dict[str, float | int | None]: Лимит, запросы в обработке и в очереди,
+            отклонённые запросы, уменьшения лимита и базовая задержка.
+        """
+        return {
+            "limit": round(self.limit, 1),
+            "inflight": self.inflight,
+            "queued": len(self._waiters),
+            "rejected": self.rejected,
+            "decreases": self.decreases,
+            "latency_ms": None if self._baseline is None else round(self._baseline * 1000, 2),
+        }
+
+    def _update(self, latency: float, overloaded: bool) -> None:
+        """Учитывает задержку запроса и изменяет лимит по завершении окна."""
+        now = time.monotonic()
+        self._window_total += latency
+        self._window_count += 1
+        if self.inflight * 2 >= self.limit:
+            self._window_utilized = True
+
+        if overloaded:
+            self._decrease(now)
+
+        if now - self._window_started < self.window or self._window_count < self.window_samples:
+            return
+
+        average = self._window_total / self._window_count
+        if self._baseline is None:
+            self._baseline = average
+
+        congested = self._windows >= WARMUP_WINDOWS and average > self.tolerance * self._baseline
+
+        if congested:
+            self._decrease(now)
+
+        elif self._window_utilized and self._decreased_at < self._window_started:
+            self.limit = min(self.max_limit, self.limit + self._window_count / self.limit)
+
+        # Выбросы не смещают базовую задержку больше допустимого превышения
+        average = min(average, self.tolerance * self._baseline)
+        self._baseline += BASELINE_ALPHA * (average - self._baseline)
+
+        self._windows += 1
+        self._window_started = now
+        self._window_total = 0.0
+        self._window_count = 0
+        self._window_utilized = False
+
+    def _decrease(self, now: float) -> None:
+        """Уменьшает лимит, если с прошлого уменьшения прошло не меньше окна."""
+        if now - self._decreased_at < max(self.window, self._baseline or 0.0):
+            return
+
+        self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        self._decreased_at = now
+        self.decreases += 1
+
+    def _remove(self, waiter: asyncio.Future) -> None:
+        """Удаляет запрос из очереди ожидания."""
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+class AdmissionController:
+    """Контроль допуска запросов клиентов по классам роутов.
+
+    Лёгкие, обычные и тяжёлые роуты получают независимые адаптивные лимиты,
+    поэтому всплеск загрузок аудиофайлов не вытесняет, например, вход в систему.
+    Роуты проверки состояния не ограничиваются.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        settings = configs.admission
+
+        self._exempt = [self._parse_rule(rule) for rule in settings.EXEMPT_ROUTES]
+        self._rules = [
+            *((self._parse_rule(rule), "light") for rule in settings.LIGHT_ROUTES),
+            *((self._parse_rule(rule), "heavy") for rule in settings.HEAVY_ROUTES),
+        ]
+        self._limiters = {
+            "light": self._create_limiter("light", settings.MAX_LIMIT),
+            "default": self._create_limiter("default", settings.MAX_LIMIT),
+            "heavy": self._create_limiter("heavy", settings.HEAVY_MAX_LIMIT),
+        }
+
+    def get_limiter(self, method: str, path: str) -> AdaptiveLimiter | None:
+        """Возвращает лимит класса, к которому относится роут.
+
+        Args:
+            method (str): HTTP метод запроса.
+            path (str): Путь запроса.
+
+        Returns:
+            AdaptiveLimiter | None: Лимит или None, если роут не ограничивается.
+        """
+        if not configs.admission.ENABLE:
+            return None
+
+        if any(self._matches(rule, method, path) for rule in self._exempt):
+            return None
+
+        for rule, name in self._rules:
+            if self._matches(rule, method, path):
+                return self._limiters[name]
+
+        return self._limiters["default"]
+
+    def stats(self) -> dict[str, dict[str, float | int | None]]:
+        """Возвращает состояние лимитов всех классов роутов.
+
+        Returns:
+            dict[str, dict[str, float | int | None]]: Состояние по именам классов.
+        """
+        return {name: limiter.stats() for name, limiter in self._limiters.items()}
+
+    @staticmethod
+    def _create_limiter(name: str, max_limit: int) -> AdaptiveLimiter:
+        """Создаёт лимит класса роутов согласно конфигурации."""
+        settings = configs.admission
+
+        return AdaptiveLimiter(
+            name,
+            initial_limit=min(settings.INITIAL_LIMIT, max_limit),
+            min_limit=settings.MIN_LIMIT,
+            max_limit=max_limit,
+            tolerance=settings.LATENCY_TOLERANCE,
+            backoff_ratio=settings.BACKOFF_RATIO,
+            window=settings.WINDOW,
+            window_samples=settings.WINDOW_SAMPLES,
+            queue_size=settings.QUEUE_SIZE,
+            queue_timeout=settings.QUEUE_TIMEOUT,
+        )
+
+    @staticmethod
+    def _parse_rule(rule: str) -> Rule:
+        """Разбирает правило вида "METHOD /prefix" или "/prefix".
+        Путь, оканчивающийся на "$", должен совпадать с путём запроса полностью.
+        """
+        method, _, path = rule.strip().rpartition(" ")
+        exact = path.endswith("$")
+        return method.upper() or None, path.removesuffix("$"), exact
+
+    @staticmethod
+    def _matches(rule: Rule, method: str, path: str) -> bool:
+        """Проверяет, подходит ли запрос под правило."""
+        rule_method, rule_path, exact = rule
+        if rule_method is not None and rule_method != method:
+            return False
+
+        return path == rule_path if exact else path.startswith(rule_path)
+
+
+admission_controller = AdmissionController()
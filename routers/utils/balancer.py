@@ -0,0 +1,290 @@
+import random
+import time
+from typing import AsyncIterator
+
+from httpx import URL, AsyncBaseTransport, AsyncByteStream, Request, Response, TransportError
+
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+
+class Endpoint:
+    """Экземпляр сервиса и его текущее состояние."""
+
+    def __init__(self, url: URL) -> None:
+        """Конструктор класса.
+
+        Args:
+            url (URL): Адрес экземпляра.
+        """
+        self.url = url
+
+        self.outstanding = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.recovered_at: float | None = None
+
+    @property
+    def name(self) -> str:
+        """Адрес экземпляра в виде host:port."""
+        return f"{self.url.host}:{self.url.port}"
+
+    def is_ejected(self, now: float) -> bool:
+        """Исключён ли экземпляр из балансировки.
+
+        Args:
+            now (float): Текущее время (time.monotonic).
+
+        Returns:
+            bool: Флаг исключения.
+        """
+        return now < self.ejected_until
+
+    def get_weight(self, now: float, slow_start: float) -> float:
+        """Возвращает вес экземпляра, плавно растущий после возвращения в балансировку.
+
+        Args:
+            now (float): Текущее время (time.monotonic).
+            slow_start (float): Длительность разогрева в секундах.
+
+        Returns:
+            float: Вес от 0.1 до 1.
+        """
+        if self.recovered_at is None or slow_start <= 0:
+            return 1.0
+
+        progress = (now - self.recovered_at) / slow_start
+        if progress >= 1:
+            self.recovered_at = None
+            return 1.0
+
+        return max(0.1, progress)
+
+
+class LoadBalancer:
+    """Клиентская балансировка запросов между экземплярами сервиса.
+
+    Экземпляр выбирается по принципу двух случайных вариантов (power of two choices)
+    с наименьшим числом выполняющихся запросов с учётом веса. Экземпляр, подряд
+    не ответивший заданное число раз, временно исключается, а по возвращении
+    получает нагрузку постепенно (slow start).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        urls: list[str],
+        eject_failures: int,
+        eject_duration: float,
+        slow_start: float,
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            name (str): Имя сервиса.
+            urls (list[str]): Адреса экземпляров сервиса.
+            eject_failures (int): Число неудач подряд для исключения экземпляра.
+            eject_duration (float): Время исключения экземпляра в секундах.
+            slow_start (float): Длительность разогрева вернувшегося экземпляра в секундах.
+        """
+        self.name = name
+        self.eject_failures = eject_failures
+        self.eject_duration = eject_duration
+        self.slow_start = slow_start
+
+        self.endpoints = [Endpoint(URL(url)) for url in urls]
+
+    def choose(self) -> Endpoint:
+        """Выбирает экземпляр для очередного запроса.
+
+        Returns:
+            Endpoint: Экземпляр сервиса.
+        """
+        now = time.monotonic()
+        candidates = [endpoint for endpoint in self.endpoints if not endpoint.is_ejected(now)]
+
+        # Если исключены все экземпляры, запросы распределяются между всеми
+        if not candidates:
+            candidates = self.endpoints
+
+        if len(candidates) == 1:
+            return candidates[0]
+
+        first, second = random.sample(candidates, 2)
+        return min(
+            (first, second),
+            key=lambda endpoint: (endpoint.outstanding + 1)
+            / endpoint.get_weight(now, self.slow_start),
+        )
+
+    def record(self, endpoint: Endpoint, success: bool) -> None:
+        """Учитывает исход запроса к экземпляру.
+
+        Args:
+            endpoint (Endpoint): Экземпляр сервиса.
+            success (bool): Успешен ли запрос.
+        """
+        if success:
+            endpoint.failures = 0
+            return
+
+        # Запросы, начатые до исключения, не продлевают его
+        now = time.monotonic()
+        if endpoint.is_ejected(now):
+            return
+
+        endpoint.failures += 1
+        if endpoint.failures < self.eject_failures:
+            return
+
+        endpoint.failures = 0
+        endpoint.ejections += 1
+        endpoint.ejected_until = now + self.eject_duration
+        endpoint.recovered_at = endpoint.ejected_until
+
+        logger.warning(f"Endpoint {endpoint.name} of {self.name} ejected.")
+
+    def stats(self) -> dict[str, dict[str, int | bool]]:
+        """Возвращает состояние экземпляров сервиса.
+
+        Returns:
+            dict[str, dict[str, int | bool]]: Состояние по адресам экземпляров.
+        """
+        now = time.monotonic()
+        return {
+            endpoint.name: {
+                "outstanding": endpoint.outstanding,
+                "ejected": endpoint.is_ejected(now),
+                "ejections": endpoint.ejections,
+            }
+            for endpoint in self.endpoints
+        }
+
+
+class TrackedStream(AsyncByteStream):
+    """Тело ответа, по закрытию которого запрос к экземпляру считается завершённым."""
+
+    def __init__(self, stream: AsyncByteStream, endpoint: Endpoint) -> None:
+        """Конструктор класса.
+
+        Args:
+            stream (AsyncByteStream): Тело ответа нижележащего транспорта.
+            endpoint (Endpoint): Экземпляр сервиса.
+        """
+        self._stream = stream
+        self._endpoint: Endpoint | None = endpoint
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if self._endpoint is not None:
+            self._endpoint.outstanding -= 1
+            self._endpoint = None
+
+        await self._stream.aclose()
+
+
+class LoadBalancingTransport(AsyncBaseTransport):
+    """Транспорт httpx, направляющий каждый запрос на выбранный экземпляр сервиса.
+    Неудачей экземпляра считаются ошибки соединения и ответы со статусом 5xx.
+
+    Для каждой попытки создаётся отдельный запрос к экземпляру, а исходный запрос
+    не изменяется, поэтому повторы и дублирующие запросы выбирают экземпляр заново.
+    Запросы к другим хостам (например, абсолютные URL) передаются без изменений.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, balancer: LoadBalancer) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            balancer (LoadBalancer): Балансировщик сервиса.
+        """
+        self._transport = transport
+        self._balancer = balancer
+
+        # Основной адрес сервиса, на который указывают запросы клиента
+        url = balancer.endpoints[0].url
+        self._origin = (url.scheme, url.host, url.port)
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if (request.url.scheme, request.url.host, request.url.port) != self._origin:
+            return await self._transport.handle_async_request(request)
+
+        endpoint = self._balancer.choose()
+
+        routed = Request(
+            request.method,
+            request.url.copy_with(
+                scheme=endpoint.url.scheme, host=endpoint.url.host, port=endpoint.url.port
+            ),
+            headers=request.headers,
+            stream=request.stream,
+            extensions=dict(request.extensions),
+        )
+        routed.headers["Host"] = routed.url.netloc.decode("ascii")
+
+        endpoint.outstanding += 1
+        try:
+            response = await self._transport.handle_async_request(routed)
+
+        except TransportError:
+            endpoint.outstanding -= 1
+            self._balancer.record(endpoint, success=False)
+            raise
+
+        except BaseException:
+            endpoint.outstanding -= 1
+            raise
+
+        self._balancer.record(endpoint, success=response.status_code < 500)
+        response.stream = TrackedStream(response.stream, endpoint)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class LoadBalancers:
+    """Реестр балансировщиков связанных сервисов."""
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._balancers: dict[str, LoadBalancer] = {}
+
+    def get(self, service: ServiceConfiguration) -> LoadBalancer:
+        """Возвращает балансировщик сервиса, создавая его при первом обращении.
+
+        Args:
+            service (ServiceConfiguration): Конфигурация сервиса.
+
+        Returns:
+            LoadBalancer: Балансировщик сервиса.
+        """
+        balancer = self._balancers.get(service.NAME)
+
+        if balancer is None:
+            balancer = self._balancers[service.NAME] = LoadBalancer(
+                service.NAME,
+                urls=service.ENDPOINT_URLS,
+                eject_failures=service.BALANCER_EJECT_FAILURES,
+                eject_duration=service.BALANCER_EJECT_DURATION,
+                slow_start=service.BALANCER_SLOW_START,
+            )
+
+        return balancer
+
+    def stats(self) -> dict[str, dict[str, dict[str, int | bool]]]:
+        """Возвращает состояние экземпляров всех сервисов.
+
+        Returns:
+            dict[str, dict[str, dict[str, int | bool]]]: Состояние по именам сервисов.
+        """
+        return {name: balancer.stats() for name, balancer in self._balancers.items()}
+
+
+load_balancers = LoadBalancers()
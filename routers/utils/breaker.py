@@ -0,0 +1,265 @@
+import math
+import time
+from collections import deque
+from enum import Enum
+
+from httpx import AsyncBaseTransport, Request, Response, TransportError
+
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+
+class BreakerState(Enum):
+    """Перечисление состояний автоматического выключателя."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(TransportError):
+    """Запрос отклонён без обращения к сервису, так как выключатель разомкнут."""
+
+    def __init__(self, message: str, retry_after: float, request: Request) -> None:
+        """Конструктор класса.
+
+        Args:
+            message (str): Описание ошибки.
+            retry_after (float): Через сколько секунд можно повторить запрос.
+            request (Request): Отклонённый запрос httpx.
+        """
+        super().__init__(message, request=request)
+        self.retry_after = retry_after
+
+    def get_retry_after(self) -> str:
+        """Возвращает значение заголовка Retry-After (целое число секунд)."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class CircuitBreaker:
+    """Автоматический выключатель (circuit breaker) запросов к сервису.
+
+    В замкнутом состоянии запросы проходят, а их исходы учитываются в скользящем
+    окне. При превышении доли неудачных запросов выключатель размыкается
+    и запросы отклоняются сразу. По истечении времени охлаждения пропускается
+    несколько пробных запросов: при их успехе выключатель замыкается,
+    при неудаче - снова размыкается.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float,
+        min_requests: int,
+        window: float,
+        cooldown: float,
+        half_open_requests: int,
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            name (str): Имя сервиса.
+            failure_rate (float): Доля неудачных запросов для размыкания (от 0 до 1).
+            min_requests (int): Минимум запросов в окне для оценки доли неудач.
+            window (float): Длительность скользящего окна в секундах.
+            cooldown (float): Время в разомкнутом состоянии в секундах.
+            half_open_requests (int): Количество пробных запросов.
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown = cooldown
+        self.half_open_requests = half_open_requests
+
+        self.rejected = 0
+        self.opened = 0
+
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._probes = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> BreakerState:
+        """Текущее состояние выключателя."""
+        if self._state is BreakerState.OPEN and self.retry_after() <= 0:
+            self._transition(BreakerState.HALF_OPEN)
+
+        return self._state
+
+    def retry_after(self) -> float:
+        """Возвращает, через сколько секунд выключатель пропустит пробный запрос.
+
+        Returns:
+            float: Время в секундах.
+        """
+        return self._opened_at + self.cooldown - time.monotonic()
+
+    def allow(self) -> bool:
+        """Проверяет, может ли запрос быть отправлен в сервис.
+        Разрешённый запрос должен завершиться вызовом record или release.
+
+        Returns:
+            bool: Флаг разрешения запроса.
+        """
+        state = self.state
+
+        if state is BreakerState.OPEN:
+            self.rejected += 1
+            return False
+
+        if state is BreakerState.HALF_OPEN:
+            if self._probes >= self.half_open_requests:
+                self.rejected += 1
+                return False
+
+            self._probes += 1
+
+        return True
+
+    def record(self, success: bool) -> None:
+        """Учитывает исход разрешённого запроса.
+
+        Args:
+            success (bool): Успешен ли запрос.
+        """
+        if self._state is BreakerState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+            if not success:
+                self._transition(BreakerState.OPEN)
+                return
+
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_requests:
+                self._transition(BreakerState.CLOSED)
+            return
+
+        if self._state is BreakerState.OPEN:
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, success))
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        total = len(self._outcomes)
+        if total >= self.min_requests and failures / total >= self.failure_rate:
+            self._transition(BreakerState.OPEN)
+
+    def release(self) -> None:
+        """Освобождает разрешение запроса, исход которого неизвестен (например, отменён)."""
+        if self._state is BreakerState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def stats(self) -> dict[str, str | int]:
+        """Возвращает состояние и статистику выключателя.
+
+        Returns:
+            dict[str, str | int]: Состояние, отклонённые запросы и размыкания.
+        """
+        return {"state": self.state.value, "rejected": self.rejected, "opened": self.opened}
+
+    def _transition(self, state: BreakerState) -> None:
+        """Переводит выключатель в новое состояние."""
+        if state is BreakerState.OPEN:
+            self._opened_at = time.monotonic()
+            self.opened += 1
+            logger.warning(f"Circuit breaker for {self.name} opened.")
+
+        elif state is BreakerState.CLOSED:
+            logger.info(f"Circuit breaker for {self.name} closed.")
+
+        self._state = state
+        self._outcomes.clear()
+        self._probes = 0
+        self._probe_successes = 0
+
+
+class CircuitBreakerTransport(AsyncBaseTransport):
+    """Транспорт httpx, отклоняющий запросы к сервису при разомкнутом выключателе.
+    Неудачей считаются ошибки соединения и ответы со статусом 5xx.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, breaker: CircuitBreaker) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            breaker (CircuitBreaker): Выключатель сервиса.
+        """
+        self._transport = transport
+        self._breaker = breaker
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if not self._breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit breaker for {self._breaker.name} is open",
+                retry_after=self._breaker.retry_after(),
+                request=request,
+            )
+
+        success = None
+        try:
+            response = await self._transport.handle_async_request(request)
+            success = response.status_code < 500
+
+        except TransportError:
+            success = False
+            raise
+
+        finally:
+            if success is None:
+                self._breaker.release()
+            else:
+                self._breaker.record(success)
+
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class CircuitBreakers:
+    """Реестр выключателей связанных сервисов."""
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, service: ServiceConfiguration) -> CircuitBreaker:
+        """Возвращает выключатель сервиса, создавая его при первом обращении.
+
+        Args:
+            service (ServiceConfiguration): Конфигурация сервиса.
+
+        Returns:
+            CircuitBreaker: Выключатель сервиса.
+        """
+        breaker = self._breakers.get(service.NAME)
+
+        if breaker is None:
+            breaker = self._breakers[service.NAME] = CircuitBreaker(
+                service.NAME,
+                failure_rate=service.BREAKER_FAILURE_RATE,
+                min_requests=service.BREAKER_MIN_REQUESTS,
+                window=service.BREAKER_WINDOW,
+                cooldown=service.BREAKER_COOLDOWN,
+                half_open_requests=service.BREAKER_HALF_OPEN_REQUESTS,
+            )
+
+        return breaker
+
+    def stats(self) -> dict[str, dict[str, str | int]]:
+        """Возвращает состояние выключателей всех сервисов.
+
+        Returns:
+            dict[str, dict[str, str | int]]: Состояние выключателей по именам сервисов.
+        """
+        return {name: breaker.stats() for name, breaker in self._breakers.items()}
+
+
+circuit_breakers = CircuitBreakers()
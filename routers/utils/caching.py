@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Ограниченный по размеру in-memory кэш с вытеснением по LRU
+    и временем жизни записей. Ведёт счётчики попаданий и промахов.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Конструктор класса.
+
+        Args:
+            maxsize (int): Максимальное количество записей.
+            ttl (float): Время жизни записи по умолчанию в секундах.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Возвращает значение по ключу, если оно есть и не устарело.
+
+        Args:
+            key (K): Ключ записи.
+
+        Returns:
+            V | None: Значение или None при промахе.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Сохраняет значение, вытесняя самые давно использованные записи.
+
+        Args:
+            key (K): Ключ записи.
+            value (V): Значение.
+            ttl (float | None, optional): Время жизни записи. Defaults to None.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        """Удаляет запись по ключу.
+
+        Args:
+            key (K): Ключ записи.
+
+        Returns:
+            V | None: Удалённое значение или None.
+        """
+        entry = self._entries.pop(key, None)
+        return entry[1] if entry else None
+
+    def keys(self) -> list[K]:
+        """Возвращает ключи всех записей кэша, включая устаревшие.
+
+        Returns:
+            list[K]: Список ключей.
+        """
+        return list(self._entries)
+
+    def peek(self, key: K) -> V | None:
+        """Возвращает значение без учёта статистики и порядка вытеснения.
+
+        Args:
+            key (K): Ключ записи.
+
+        Returns:
+            V | None: Значение или None.
+        """
+        entry = self._entries.get(key)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        """Удаляет все записи кэша."""
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает статистику использования кэша.
+
+        Returns:
+            dict[str, int]: Размер, попадания, промахи и вытеснения.
+        """
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
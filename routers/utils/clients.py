@@ -0,0 +1,143 @@
+from httpx import AsyncBaseTransport, AsyncClient, AsyncHTTPTransport, Limits, Timeout
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+from .balancer import LoadBalancingTransport, load_balancers
+from .breaker import CircuitBreakerTransport, circuit_breakers
+from .coalescing import CoalescingTransport, upstream_flight
+from .deadlines import DeadlineTransport
+from .metrics import MetricsTransport
+from .retries import HedgingTransport, RetryTransport, latency_trackers, retry_budget
+from .timing import ServerTimingTransport
+from .tracing import TracingTransport
+
+
+class ServiceClients:
+    """Реестр долгоживущих HTTP клиентов для связанных микросервисов.
+
+    Каждый сервис получает собственный клиент httpx с пулом keep-alive
+    соединений, поэтому TCP (и TLS) соединения переиспользуются между
+    запросами, а не открываются заново на каждый проксируемый вызов.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._clients: dict[str, AsyncClient] = {}
+        self._transports: dict[str, tuple[MetricsTransport, AsyncHTTPTransport]] = {}
+
+    async def startup(self) -> None:
+        """Создаёт клиенты для всех сервисов из конфигурации проекта."""
+        for service in configs.services.all():
+            self.get(service)
+
+        logger.info(f"HTTP clients initialized: {', '.join(self._clients)}")
+
+    async def shutdown(self) -> None:
+        """Закрывает все клиенты и их пулы соединений."""
+        for name, client in self._clients.items():
+            await client.aclose()
+            logger.info(f"HTTP client for {name} closed.")
+
+        self._clients.clear()
+        self._transports.clear()
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Возвращает состояние пулов соединений всех клиентов.
+
+        Незавершённые обращения к сервису считаются транспортом метрик. Каждое из них
+        занимает соединение или ожидает его, поэтому очередь к пулу - это обращения
+        сверх занятых соединений.
+
+        Returns:
+            dict[str, dict[str, int]]: Открытые и простаивающие соединения, незавершённые
+            и ожидающие соединения обращения и размер пула по именам сервисов.
+        """
+        stats = {}
+        for service in configs.services.all():
+            transports = self._transports.get(service.NAME)
+            if transports is None:
+                continue
+
+            metered, transport = transports
+
+            # httpx не открывает пул транспорта, поэтому без него остаются только счётчики
+            pool = getattr(transport, "_pool", None)
+            connections = list(getattr(pool, "connections", ()))
+            active = sum(not connection.is_idle() for connection in connections)
+
+            stats[service.NAME] = {
+                "connections": len(connections),
+                "idle": len(connections) - active,
+                "outstanding": metered.outstanding,
+                "queued": max(metered.outstanding - active, 0),
+                "size": service.POOL_SIZE,
+            }
+
+        return stats
+
+    def get(self, service: ServiceConfiguration) -> AsyncClient:
+        """Возвращает клиент сервиса, создавая его при первом обращении.
+
+        Args:
+            service (ServiceConfiguration): Конфигурация сервиса.
+
+        Returns:
+            AsyncClient: Асинхронный клиент httpx.
+        """
+        client = self._clients.get(service.NAME)
+
+        if client is None or client.is_closed:
+            client = self._create_client(service)
+            self._clients[service.NAME] = client
+
+        return client
+
+    def _create_client(self, service: ServiceConfiguration) -> AsyncClient:
+        """Создаёт клиент httpx с пулом соединений согласно конфигурации сервиса.
+        При нескольких экземплярах сервиса запросы распределяются между ними.
+        При необходимости транспорт оборачивается автоматическим выключателем,
+        дублированием медленных запросов, повтором неудачных запросов
+        и слоем объединения GET запросов. Все запросы ограничиваются
+        оставшимся временем обработки запроса клиента и сопровождаются
+        контекстом трассировки, а каждое обращение к сервису учитывается в метриках
+        и в фазе upstream запроса клиента.
+
+        Args:
+            service (ServiceConfiguration): Конфигурация сервиса.
+
+        Returns:
+            AsyncClient: Асинхронный клиент httpx.
+        """
+        limits = Limits(
+            max_connections=service.POOL_SIZE,
+            max_keepalive_connections=service.POOL_KEEPALIVE_SIZE,
+            keepalive_expiry=service.KEEPALIVE_EXPIRY,
+        )
+        timeout = Timeout(service.READ_TIMEOUT, connect=service.CONNECT_TIMEOUT)
+
+        pool = AsyncHTTPTransport(limits=limits)
+        metered = MetricsTransport(pool, service)
+        self._transports[service.NAME] = (metered, pool)
+
+        transport: AsyncBaseTransport = metered
+        if len(service.ENDPOINT_URLS) > 1:
+            transport = LoadBalancingTransport(transport, load_balancers.get(service))
+        if service.BREAKER_ENABLE:
+            transport = CircuitBreakerTransport(transport, circuit_breakers.get(service))
+        if service.HEDGE_ENABLE:
+            tracker = latency_trackers.get(service)
+            transport = HedgingTransport(transport, service, tracker, retry_budget)
+        if service.RETRY_ATTEMPTS > 0:
+            transport = RetryTransport(transport, service, retry_budget)
+        if service.COALESCE_REQUESTS:
+            transport = CoalescingTransport(transport, upstream_flight, timeout)
+        transport = DeadlineTransport(transport)
+        transport = ServerTimingTransport(transport, service)
+        transport = TracingTransport(transport, service)
+
+        return AsyncClient(base_url=service.URL, transport=transport, timeout=timeout)
+
+
+service_clients = ServiceClients()
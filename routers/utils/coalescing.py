@@ -0,0 +1,159 @@
+import asyncio
+from contextvars import Context
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from httpx import AsyncBaseTransport, Request, Response, Timeout
+
+from .deadlines import DEADLINE_HEADER
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """Объединяет одновременные одинаковые вызовы в один.
+
+    Пока вызов с некоторым ключом выполняется, все последующие вызовы
+    с тем же ключом не выполняются повторно, а ожидают результат первого.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self.calls = 0
+        self.collapsed = 0
+
+        self._in_flight: dict[K, asyncio.Task[V]] = {}
+
+    async def do(
+        self, key: K, function: Callable[[], Awaitable[V]], context: Context | None = None
+    ) -> V:
+        """Выполняет вызов или присоединяется к уже выполняющемуся с тем же ключом.
+
+        Вызов выполняется в отдельной задаче, поэтому отмена одного
+        из ожидающих не прерывает его для остальных.
+
+        Args:
+            key (K): Ключ вызова.
+            function (Callable[[], Awaitable[V]]): Фабрика вызова.
+            context (Context | None, optional): Контекст задачи вызова.
+                Defaults to None (копия контекста первого вызвавшего).
+
+        Returns:
+            V: Результат вызова.
+        """
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.get_running_loop().create_task(function(), context=context)
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+            self._in_flight[key] = task
+            self.calls += 1
+
+        else:
+            self.collapsed += 1
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает статистику объединения вызовов.
+
+        Returns:
+            dict[str, int]: Выполненные, объединённые и текущие вызовы.
+        """
+        return {
+            "calls": self.calls,
+            "collapsed": self.collapsed,
+            "in_flight": len(self._in_flight),
+        }
+
+    def _forget(self, key: K, task: asyncio.Task[V]) -> None:
+        """Удаляет завершившийся вызов из списка выполняющихся.
+
+        Args:
+            key (K): Ключ вызова.
+            task (asyncio.Task[V]): Завершившаяся задача.
+        """
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        # Исключение забирается, даже если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+
+class CoalescingTransport(AsyncBaseTransport):
+    """Транспорт httpx, объединяющий одновременные одинаковые GET запросы
+    (с одинаковыми сервисом, путём и query параметрами) в один upstream запрос.
+
+    Общий запрос выполняется в пустом контексте с таймаутами сервиса по умолчанию,
+    а срок обработки каждого запроса клиента ограничивает только его собственное
+    ожидание, поэтому короткий срок одного клиента не прерывает запрос остальных.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        flight: SingleFlight[str, tuple[Response, bytes]],
+        timeout: Timeout,
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            flight (SingleFlight[str, tuple[Response, bytes]]): Группа объединяемых вызовов.
+            timeout (Timeout): Таймауты общего запроса.
+        """
+        self._transport = transport
+        self._flight = flight
+        self._timeout = timeout.as_dict()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+
+        shared = Request(
+            request.method,
+            request.url,
+            headers=[
+                (name, value)
+                for name, value in request.headers.multi_items()
+                if name.lower() != DEADLINE_HEADER.lower()
+            ],
+            extensions={**request.extensions, "timeout": self._timeout},
+        )
+        response, content = await self._flight.do(
+            str(request.url), lambda: self._fetch(shared), context=Context()
+        )
+
+        # Каждый ожидающий получает собственную копию ответа
+        return Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            content=content,
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    async def _fetch(self, request: Request) -> tuple[Response, bytes]:
+        """Выполняет запрос и полностью вычитывает тело ответа.
+
+        Args:
+            request (Request): Запрос httpx.
+
+        Returns:
+            tuple[Response, bytes]: Ответ и его не декодированное тело.
+        """
+        response = await self._transport.handle_async_request(request)
+
+        try:
+            content = b"".join([chunk async for chunk in response.aiter_raw()])
+        finally:
+            await response.aclose()
+
+        return response, content
+
+
+upstream_flight: SingleFlight[str, tuple[Response, bytes]] = SingleFlight()
@@ -0,0 +1,128 @@
+import asyncio
+import re
+import time
+from contextvars import ContextVar
+
+from httpx import AsyncBaseTransport, Request, Response, TimeoutException
+from starlette.datastructures import Headers
+from starlette.requests import HTTPConnection
+
+from configs import configs
+
+# Заголовок с оставшимся временем запроса (в секундах)
+DEADLINE_HEADER = "X-Request-Timeout"
+
+GRPC_TIMEOUT_PATTERN = re.compile(r"^(\d{1,8})([HMSmun])$")
+GRPC_TIMEOUT_UNITS = {"H": 3600.0, "M": 60.0, "S": 1.0, "m": 1e-3, "u": 1e-6, "n": 1e-9}
+
+# Момент (по time.monotonic), после которого ответ клиенту уже не нужен
+request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutException):
+    """Время, отведённое на обработку запроса клиента, истекло."""
+
+
+def parse_timeout(headers: Headers) -> float | None:
+    """Извлекает время ожидания клиента из заголовков X-Request-Timeout
+    (секунды) или grpc-timeout (число с единицей измерения, например 500m).
+
+    Args:
+        headers (Headers): Заголовки запроса клиента.
+
+    Returns:
+        float | None: Время ожидания в секундах или None.
+    """
+    value = headers.get(DEADLINE_HEADER)
+    if value is not None:
+        try:
+            timeout = float(value)
+            return timeout if timeout > 0 else None
+
+        except ValueError:
+            return None
+
+    match = GRPC_TIMEOUT_PATTERN.match(headers.get("grpc-timeout", ""))
+    if match is not None:
+        return int(match.group(1)) * GRPC_TIMEOUT_UNITS[match.group(2)]
+
+    return None
+
+
+def get_remaining() -> float | None:
+    """Возвращает оставшееся время обработки текущего запроса клиента.
+
+    Returns:
+        float | None: Время в секундах или None, если срок не задан.
+    """
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+
+    return deadline - time.monotonic()
+
+
+class RequestDeadline:
+    """Зависимость, задающая срок обработки запроса клиента. Срок определяется
+    политикой роута и сокращается временем ожидания, переданным клиентом.
+    Зависимость роута переопределяет зависимость роутера.
+    """
+
+    def __init__(self, timeout: float | None) -> None:
+        """Конструктор класса.
+
+        Args:
+            timeout (float | None): Время обработки запроса в секундах (None - без срока).
+        """
+        self.timeout = timeout
+
+    async def __call__(self, connection: HTTPConnection) -> None:
+        if not configs.deadlines.ENABLE or self.timeout is None:
+            request_deadline.set(None)
+            return
+
+        timeout = self.timeout
+        client_timeout = parse_timeout(connection.headers)
+        if client_timeout is not None:
+            timeout = min(timeout, client_timeout)
+
+        request_deadline.set(time.monotonic() + timeout)
+
+
+class DeadlineTransport(AsyncBaseTransport):
+    """Транспорт httpx, ограничивающий запрос к сервису оставшимся временем
+    запроса клиента и передающий это время сервису в заголовке X-Request-Timeout.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+        """
+        self._transport = transport
+
+    async def handle_async_request(self, request: Request) -> Response:
+        remaining = get_remaining()
+        if remaining is None:
+            return await self._transport.handle_async_request(request)
+
+        if remaining <= 0:
+            raise DeadlineExceeded("Request deadline exceeded", request=request)
+
+        timeouts = request.extensions.get("timeout", {})
+        request.extensions["timeout"] = {
+            phase: remaining if timeout is None else min(timeout, remaining)
+            for phase, timeout in timeouts.items()
+        }
+        request.headers[DEADLINE_HEADER] = f"{remaining:.3f}"
+
+        try:
+            async with asyncio.timeout(remaining):
+                return await self._transport.handle_async_request(request)
+
+        except TimeoutError:
+            raise DeadlineExceeded("Request deadline exceeded", request=request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
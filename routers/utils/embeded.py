@@ -1,8 +1,43 @@
-from typing import Any, Generic, TypeVar
+import asyncio
+from typing import Any, Awaitable, Callable, Coroutine, Generic, TypeVar
 
+from fastapi import HTTPException
+from httpx import HTTPError
 from pydantic import BaseModel, Field
 
+from configs import configs
+from schemas.auth import AuthorizedUser
+from service_logging import logger
+
+from .http_proxy import proxy_request
+from .response_cache import response_cache
+from .tracing import tracer
+
 M = TypeVar("M", bound=BaseModel)
+T = TypeVar("T")
+
+EntityFetcher = Callable[[Any, AuthorizedUser], Awaitable[dict[str, Any]]]
+
+
+async def gather(coroutines: list[Coroutine[Any, Any, T]]) -> list[T]:
+    """Одновременно выполняет корутины. При ошибке одной из них
+    отменяет остальные и пробрасывает ошибку без изменений.
+
+    Args:
+        coroutines (list[Coroutine[Any, Any, T]]): Корутины.
+
+    Returns:
+        list[T]: Результаты в порядке корутин.
+    """
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+
+    try:
+        return await asyncio.gather(*tasks)
+
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
 
 
 class Embedded(BaseModel):
@@ -24,3 +59,201 @@ class EmbeddedResponse(BaseModel, Generic[M]):
 
     item: M = Field(description="Целевой объект")
     embedded: dict[str, dict[str, Any]] = Field(description="Расширение запроса", default={})
+
+
+class EmbeddedResolver:
+    """Способ получения связанной сущности по внешнему ключу объекта."""
+
+    def __init__(self, entity: str, field: str, fetcher: EntityFetcher, timeout: float) -> None:
+        """Конструктор класса.
+
+        Args:
+            entity (str): Имя сущности в параметре entities.
+            field (str): Поле объекта с идентификатором сущности.
+            fetcher (EntityFetcher): Функция получения сущности по идентификатору.
+            timeout (float): Максимальное время получения сущности в секундах.
+        """
+        self.entity = entity
+        self.field = field
+        self.fetcher = fetcher
+        self.timeout = timeout
+
+    async def resolve(self, item: dict[str, Any], user: AuthorizedUser) -> dict[str, Any] | None:
+        """Получает сущность, связанную с объектом.
+
+        Args:
+            item (dict[str, Any]): Данные объекта.
+            user (AuthorizedUser): Авторизованный пользователь.
+
+        Returns:
+            dict[str, Any] | None: Данные сущности или None, если у объекта нет
+            связи с ней или она не была получена.
+        """
+        entity_id = item.get(self.field)
+        if entity_id is None:
+            return None
+
+        return await self.fetch(entity_id, user)
+
+    async def fetch(self, entity_id: Any, user: AuthorizedUser) -> dict[str, Any] | None:
+        """Получает сущность по идентификатору с ограничением по времени.
+
+        Args:
+            entity_id (Any): Идентификатор сущности.
+            user (AuthorizedUser): Авторизованный пользователь.
+
+        Returns:
+            dict[str, Any] | None: Данные сущности или None, если она не была получена
+            за отведённое время или сервис вернул ошибку.
+        """
+        attributes = {"embedded.entity": self.entity, "embedded.id": str(entity_id)}
+        with tracer.start_span(f"embedded.{self.entity}", attributes=attributes) as span:
+            try:
+                return await asyncio.wait_for(self.fetcher(entity_id, user), self.timeout)
+
+            except TimeoutError:
+                span.status = "error"
+                logger.warning(
+                    f"Embedded {self.entity} {entity_id} timed out after {self.timeout}s."
+                )
+                return None
+
+            # Недоступная сущность не должна лишать клиента основного ответа
+            except (HTTPException, HTTPError) as error:
+                span.status = "error"
+                span.attributes["error"] = type(error).__name__
+                detail = error.detail if isinstance(error, HTTPException) else str(error)
+                logger.warning(f"Embedded {self.entity} {entity_id} is unavailable: {detail}")
+                return None
+
+
+class EmbeddedRegistry:
+    """Реестр способов получения сущностей для расширения ответов."""
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._resolvers: dict[str, EmbeddedResolver] = {}
+
+    def register(
+        self, entity: str, field: str, timeout: float | None = None
+    ) -> Callable[[EntityFetcher], EntityFetcher]:
+        """Декоратор регистрации функции получения сущности.
+
+        Args:
+            entity (str): Имя сущности в параметре entities.
+            field (str): Поле объекта с идентификатором сущности.
+            timeout (float | None, optional): Время получения сущности. Defaults to None.
+
+        Returns:
+            Callable[[EntityFetcher], EntityFetcher]: Декоратор.
+        """
+
+        def decorator(fetcher: EntityFetcher) -> EntityFetcher:
+            self._resolvers[entity] = EmbeddedResolver(
+                entity, field, fetcher, timeout or configs.embedded.TIMEOUT
+            )
+            return fetcher
+
+        return decorator
+
+    async def resolve(
+        self, item: dict[str, Any], entities: list[str], user: AuthorizedUser
+    ) -> dict[str, dict[str, Any]]:
+        """Одновременно получает все запрошенные сущности, связанные с объектом.
+        Сущности, которые не удалось получить, в ответ не попадают.
+
+        Args:
+            item (dict[str, Any]): Данные объекта.
+            entities (list[str]): Запрошенные сущности.
+            user (AuthorizedUser): Авторизованный пользователь.
+
+        Returns:
+            dict[str, dict[str, Any]]: Полученные сущности по их именам.
+        """
+        resolvers = [self._resolvers[entity] for entity in entities if entity in self._resolvers]
+        results = await gather([resolver.resolve(item, user) for resolver in resolvers])
+
+        return {
+            resolver.entity: result
+            for resolver, result in zip(resolvers, results)
+            if result is not None
+        }
+
+    async def resolve_many(
+        self, items: list[dict[str, Any]], entities: list[str], user: AuthorizedUser
+    ) -> dict[str, dict[str, dict[str, Any]]]:
+        """Получает сущности, связанные со списком объектов. Каждая сущность
+        запрашивается один раз, сколько бы объектов на неё ни ссылалось,
+        а количество одновременных запросов ограничено.
+
+        Args:
+            items (list[dict[str, Any]]): Данные объектов.
+            entities (list[str]): Запрошенные сущности.
+            user (AuthorizedUser): Авторизованный пользователь.
+
+        Returns:
+            dict[str, dict[str, dict[str, Any]]]: Полученные сущности
+            по их именам и идентификаторам.
+        """
+        semaphore = asyncio.Semaphore(configs.embedded.CONCURRENCY)
+
+        async def fetch(resolver: EmbeddedResolver, entity_id: str) -> dict[str, Any] | None:
+            async with semaphore:
+                return await resolver.fetch(entity_id, user)
+
+        resolvers = {self._resolvers[entity] for entity in entities if entity in self._resolvers}
+        requests: list[tuple[EmbeddedResolver, str]] = []
+        for resolver in resolvers:
+            entity_ids = {str(item[resolver.field]) for item in items if item.get(resolver.field)}
+            requests.extend((resolver, entity_id) for entity_id in entity_ids)
+
+        results = await gather([fetch(resolver, entity_id) for resolver, entity_id in requests])
+
+        embedded: dict[str, dict[str, dict[str, Any]]] = {}
+        for (resolver, entity_id), result in zip(requests, results):
+            if result is not None:
+                embedded.setdefault(resolver.entity, {})[entity_id] = result
+
+        return embedded
+
+
+embedded_resolvers = EmbeddedRegistry()
+
+
+@embedded_resolvers.register("text", field="text_id")
+async def fetch_text(text_id: Any, _: AuthorizedUser) -> dict[str, Any]:
+    """Получает обучающий текст для расширения ответа."""
+    logger.info("Getting embedding text information...")
+    response = await response_cache.get(
+        configs.services.texts,
+        f"/{text_id}",
+        ttl=configs.cache.TEXTS_TTL,
+        tags=(f"texts:{text_id}",),
+    )
+
+    return response.json()
+
+
+@embedded_resolvers.register("exercise", field="exercise_id")
+async def fetch_exercise(exercise_id: Any, _: AuthorizedUser) -> dict[str, Any]:
+    """Получает упражнение для расширения ответа."""
+    logger.info("Getting embedding exercise information...")
+    response = await response_cache.get(
+        configs.services.exercises,
+        f"/{exercise_id}",
+        ttl=configs.cache.EXERCISES_TTL,
+        tags=(f"exercises:{exercise_id}",),
+    )
+
+    return response.json()
+
+
+@embedded_resolvers.register("task", field="task_id")
+async def fetch_task(task_id: Any, user: AuthorizedUser) -> dict[str, Any]:
+    """Получает задачу пользователя для расширения ответа."""
+    logger.info("Getting embedding task information...")
+    async with proxy_request(configs.services.manager) as client:
+        response = await client.post(f"/{task_id}", json={"user_id": str(user.id)})
+        response.raise_for_status()
+
+    return response.json()
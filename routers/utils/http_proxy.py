@@ -3,61 +3,90 @@ from json import JSONDecodeError
 from typing import AsyncGenerator
 
 from fastapi import HTTPException, status
-from httpx import AsyncClient, ConnectError, ConnectTimeout, HTTPStatusError
+from httpx import AsyncClient, ConnectError, ConnectTimeout, HTTPStatusError, TimeoutException
 
 from configs import configs
+from configs.services import ServiceConfiguration
 from service_logging import logger
 
+from .breaker import CircuitOpenError
+from .clients import service_clients
+
 
 @asynccontextmanager
-async def proxy_request(service_url: str) -> AsyncGenerator[AsyncClient, None]:
+async def proxy_request(service: ServiceConfiguration) -> AsyncGenerator[AsyncClient, None]:
     """Асинхронный контекстный менеджер проксирования HTTP запросов
-    к связанным микросервисам по их URL. Выполняет автоматический
-    отлов и проксирование ошибок, а также логирование хода запроса.
+    к связанным микросервисам. Предоставляет клиент из общего реестра
+    с пулом соединений сервиса. Выполняет автоматический отлов
+    и проксирование ошибок, а также логирование хода запроса.
 
     Args:
-        service_url (str): URL адрес сервиса.
+        service (ServiceConfiguration): Конфигурация сервиса.
 
     Raises:
         HTTPException: Проксированная ошибка от сервиса.
         HTTPException: 503. Ошибка подключения к сервису.
+        HTTPException: 503. Выключатель сервиса разомкнут.
+        HTTPException: 504. Сервис не ответил за отведённое время.
 
     Yields:
         AsyncGenerator[AsyncClient, None]: Генератор асинхронного клиента httpx.
     """
+    service_url = service.URL
     logger.info(f"Proxying a service request to {service_url}")
-    async with AsyncClient(base_url=service_url) as client:
+
+    client = service_clients.get(service)
+    try:
+        yield client
+
+    except HTTPStatusError as error:
+        status_code = error.response.status_code
+
         try:
-            yield client
+            content = error.response.json()
+            detail = content.get("detail", "Unknown error")
+
+        except JSONDecodeError:
+            detail = error.response.content
+
+        message = f"Service at {service_url} returned an error respose: {detail}"
+        logger.error(message)
+
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+        )
 
-        except HTTPStatusError as error:
-            status_code = error.response.status_code
+    except CircuitOpenError as error:
+        logger.warning(f"Service at {service_url} is unavailable: {error}")
 
-            try:
-                content = error.response.json()
-                detail = content.get("detail", "Unknown error")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(error),
+            headers={"Retry-After": error.get_retry_after()},
+        )
 
-            except JSONDecodeError:
-                detail = error.response.content
+    except (ConnectError, ConnectTimeout) as error:
+        detail = str(error)
 
-            message = f"Service at {service_url} returned an error respose: {detail}"
-            logger.error(message)
+        message = f"Service at {service_url} is unavailable: {detail}"
+        logger.error(message)
 
-            raise HTTPException(
-                status_code=status_code,
-                detail=detail,
-            )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+        )
 
-        except (ConnectError, ConnectTimeout) as error:
-            detail = str(error)
+    except TimeoutException as error:
+        detail = str(error) or type(error).__name__
 
-            message = f"Service at {service_url} is unavailable: {detail}"
-            logger.error(message)
+        message = f"Service at {service_url} did not respond in time: {detail}"
+        logger.error(message)
 
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=detail,
-            )
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=detail,
+        )
 
 
 async def proxy_task_sse_request(task_id: str, user_id: str) -> AsyncGenerator[str, None]:
@@ -70,19 +99,24 @@ async def proxy_task_sse_request(task_id: str, user_id: str) -> AsyncGenerator[s
     Yields:
         str: JSON-строка с событием SSE.
     """
-    url = configs.services.manager.URL
-    logger.info(f"Proxying a service SSE request to {url}")
+    service = configs.services.manager
+    logger.info(f"Proxying a service SSE request to {service.URL}")
 
-    async with proxy_request(url) as client:
+    async with proxy_request(service) as client:
         async with client.stream(
-            "POST", f"/{task_id}/stream", json={"user_id": user_id}, timeout=100
+            "POST",
+            f"/{task_id}/stream",
+            json={"user_id": user_id},
+            timeout=configs.streams.TIMEOUT,
         ) as response:
+            if response.is_error:
+                await response.aread()
             response.raise_for_status()
 
             async for line in response.aiter_lines():
                 if line.startswith("data:"):
                     message = line[5:].strip()
-                    logger.info(f"Recived message: {message}")
+                    logger.debug(f"Recived message: {message}")
 
                     yield message
 
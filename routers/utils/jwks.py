@@ -0,0 +1,83 @@
+import asyncio
+
+from fastapi import HTTPException
+from httpx import HTTPError
+from jwt import PyJWK, PyJWKSet
+from jwt.exceptions import PyJWKError, PyJWKSetError
+
+from configs import configs
+from service_logging import logger
+
+from .http_proxy import proxy_request
+
+
+class JWKSStore:
+    """Хранилище публичных ключей (JWKS) сервиса аутентификации.
+
+    Загружает набор ключей при старте приложения и периодически
+    обновляет его в фоне. При ошибке обновления сохраняются
+    последние успешно загруженные ключи.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._keys: dict[str | None, PyJWK] = {}
+        self._refresh_task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Настроена ли загрузка ключей из JWKS."""
+        return configs.auth.JWKS_URL is not None
+
+    async def startup(self) -> None:
+        """Загружает ключи и запускает их периодическое обновление."""
+        if not self.enabled or configs.auth.VERIFICATION_MODE != "local":
+            return
+
+        await self.refresh()
+        self._refresh_task = asyncio.create_task(self._refresh_periodically())
+
+    async def shutdown(self) -> None:
+        """Останавливает фоновое обновление ключей."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    async def refresh(self) -> None:
+        """Загружает актуальный набор ключей из JWKS документа."""
+        try:
+            async with proxy_request(configs.services.auth) as client:
+                response = await client.get(configs.auth.JWKS_URL)
+                response.raise_for_status()
+
+            key_set = PyJWKSet.from_dict(response.json())
+
+        except (HTTPException, HTTPError, PyJWKError, PyJWKSetError, ValueError) as error:
+            logger.error(f"Failed to load JWKS: {error}")
+            return
+
+        self._keys = {key.key_id: key for key in key_set.keys}
+        logger.info(f"JWKS loaded: {len(self._keys)} keys.")
+
+    def get(self, key_id: str | None) -> PyJWK | None:
+        """Возвращает ключ по его идентификатору (kid).
+
+        Args:
+            key_id (str | None): Идентификатор ключа из заголовка токена.
+
+        Returns:
+            PyJWK | None: Ключ или None, если он неизвестен.
+        """
+        if key_id is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+
+        return self._keys.get(key_id)
+
+    async def _refresh_periodically(self) -> None:
+        """Фоновая задача периодического обновления ключей."""
+        while True:
+            await asyncio.sleep(configs.auth.JWKS_REFRESH_INTERVAL)
+            await self.refresh()
+
+
+jwks_store = JWKSStore()
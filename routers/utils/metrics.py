@@ -0,0 +1,323 @@
+import time
+from bisect import bisect_left
+from typing import AsyncIterator, Callable, Iterable
+
+from httpx import AsyncBaseTransport, AsyncByteStream, Request, Response
+
+from configs.services import ServiceConfiguration
+
+# Границы интервалов гистограмм задержек (в секундах)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Семейство метрик: имя, тип, описание и значения по наборам меток
+MetricFamily = tuple[str, str, str, list[tuple[dict[str, str], float]]]
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+def escape_label(value: str) -> str:
+    """Экранирует значение метки для текстового формата Prometheus.
+
+    Args:
+        value (str): Значение метки.
+
+    Returns:
+        str: Экранированное значение.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    """Формирует набор меток вида {name="value",...}.
+
+    Args:
+        names (tuple[str, ...]): Имена меток.
+        values (tuple[str, ...]): Значения меток.
+
+    Returns:
+        str: Набор меток или пустая строка, если меток нет.
+    """
+    if not names:
+        return ""
+
+    pairs = ",".join(f'{name}="{escape_label(str(value))}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+class Counter:
+    """Счётчик с метками. Значения по наборам меток хранятся в словаре,
+    поэтому увеличение счётчика не требует блокировок и новых объектов.
+    """
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        """Конструктор класса.
+
+        Args:
+            name (str): Имя метрики.
+            description (str): Описание метрики.
+            labels (tuple[str, ...], optional): Имена меток. Defaults to ().
+        """
+        self.name = name
+        self.description = description
+        self.labels = labels
+
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        """Увеличивает счётчик.
+
+        Args:
+            labels (tuple[str, ...], optional): Значения меток. Defaults to ().
+            amount (float, optional): Величина увеличения. Defaults to 1.0.
+        """
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{format_labels(self.labels, labels)} {value}")
+
+        return lines
+
+
+class HistogramSeries:
+    """Количество замеров по интервалам и их сумма для одного набора меток."""
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self, size: int) -> None:
+        """Конструктор класса.
+
+        Args:
+            size (int): Количество интервалов (включая +Inf).
+        """
+        self.counts = [0] * size
+        self.total = 0.0
+
+
+class Histogram:
+    """Гистограмма с метками и фиксированными границами интервалов.
+    Замер увеличивает счётчик одного интервала, а накопленные значения
+    вычисляются только при выводе метрик.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            name (str): Имя метрики.
+            description (str): Описание метрики.
+            labels (tuple[str, ...], optional): Имена меток. Defaults to ().
+            buckets (tuple[float, ...], optional): Границы интервалов.
+                Defaults to LATENCY_BUCKETS.
+        """
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = buckets
+
+        self._series: dict[tuple[str, ...], HistogramSeries] = {}
+
+    def observe(self, value: float, labels: tuple[str, ...] = ()) -> None:
+        """Учитывает замер.
+
+        Args:
+            value (float): Значение замера.
+            labels (tuple[str, ...], optional): Значения меток. Defaults to ().
+        """
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = HistogramSeries(len(self.buckets) + 1)
+
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.total += value
+
+    def render(self) -> list[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        bucket_labels = (*self.labels, "le")
+        bounds = [*map(str, self.buckets), "+Inf"]
+
+        for labels, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(bounds, series.counts):
+                cumulative += count
+                label_set = format_labels(bucket_labels, (*labels, bound))
+                lines.append(f"{self.name}_bucket{label_set} {cumulative}")
+
+            label_set = format_labels(self.labels, labels)
+            lines.append(f"{self.name}_sum{label_set} {series.total}")
+            lines.append(f"{self.name}_count{label_set} {cumulative}")
+
+        return lines
+
+
+class MetricsRegistry:
+    """Реестр метрик шлюза. Помимо счётчиков и гистограмм поддерживает
+    сборщики, которые формируют метрики из статистики компонентов при выводе.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._metrics: list[Counter | Histogram] = []
+        self._collectors: list[Collector] = []
+
+    def counter(self, name: str, description: str, labels: tuple[str, ...] = ()) -> Counter:
+        """Создаёт и регистрирует счётчик.
+
+        Args:
+            name (str): Имя метрики.
+            description (str): Описание метрики.
+            labels (tuple[str, ...], optional): Имена меток. Defaults to ().
+
+        Returns:
+            Counter: Счётчик.
+        """
+        metric = Counter(name, description, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, description: str, labels: tuple[str, ...] = ()) -> Histogram:
+        """Создаёт и регистрирует гистограмму задержек.
+
+        Args:
+            name (str): Имя метрики.
+            description (str): Описание метрики.
+            labels (tuple[str, ...], optional): Имена меток. Defaults to ().
+
+        Returns:
+            Histogram: Гистограмма.
+        """
+        metric = Histogram(name, description, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        """Регистрирует сборщик метрик.
+
+        Args:
+            collector (Collector): Функция, возвращающая семейства метрик.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст метрик.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        for collector in self._collectors:
+            for name, kind, description, samples in collector():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_set = format_labels(tuple(labels), tuple(labels.values()))
+                    lines.append(f"{name}{label_set} {float(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+class OutstandingStream(AsyncByteStream):
+    """Тело ответа, по закрытию которого обращение к сервису считается завершённым."""
+
+    def __init__(self, stream: AsyncByteStream, transport: "MetricsTransport") -> None:
+        """Конструктор класса.
+
+        Args:
+            stream (AsyncByteStream): Тело ответа нижележащего транспорта.
+            transport (MetricsTransport): Транспорт, учитывающий обращение.
+        """
+        self._stream = stream
+        self._transport: MetricsTransport | None = transport
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            self._transport.outstanding -= 1
+            self._transport = None
+
+        await self._stream.aclose()
+
+
+class MetricsTransport(AsyncBaseTransport):
+    """Транспорт httpx, учитывающий задержку и исход каждого обращения к сервису
+    (до получения заголовков ответа) и количество незавершённых обращений
+    (до закрытия тела ответа).
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, service: ServiceConfiguration) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            service (ServiceConfiguration): Конфигурация сервиса.
+        """
+        self.outstanding = 0
+
+        self._transport = transport
+        self._service = service.NAME
+
+    async def handle_async_request(self, request: Request) -> Response:
+        started_at = time.perf_counter()
+        outcome = "cancelled"
+
+        self.outstanding += 1
+        try:
+            response = await self._transport.handle_async_request(request)
+            outcome = str(response.status_code)
+
+        except BaseException as error:
+            self.outstanding -= 1
+            if isinstance(error, Exception):
+                outcome = type(error).__name__
+            raise
+
+        finally:
+            upstream_requests.inc((self._service, outcome))
+            upstream_duration.observe(time.perf_counter() - started_at, (self._service,))
+
+        response.stream = OutstandingStream(response.stream, self)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+metrics = MetricsRegistry()
+
+requests_total = metrics.counter(
+    "gateway_requests_total", "Requests handled by the gateway.", ("method", "route", "status")
+)
+request_duration = metrics.histogram(
+    "gateway_request_duration_seconds",
+    "Time until response headers are sent, by route.",
+    ("method", "route"),
+)
+upstream_requests = metrics.counter(
+    "gateway_upstream_requests_total",
+    "Upstream calls by service and outcome (status code or error type).",
+    ("service", "outcome"),
+)
+upstream_duration = metrics.histogram(
+    "gateway_upstream_request_duration_seconds",
+    "Time until upstream response headers are received.",
+    ("service",),
+)
+auth_duration = metrics.histogram(
+    "gateway_auth_verification_duration_seconds",
+    "Access token verification time (cache misses only).",
+    ("mode",),
+)
@@ -0,0 +1,213 @@
+import asyncio
+import json
+from uuid import UUID
+
+from fastapi import HTTPException, WebSocket, WebSocketDisconnect, WebSocketException, status
+from pydantic import ValidationError
+
+from configs import configs
+from schemas.auth import AuthorizedUser
+from schemas.tasks import Status, StreamAction, TaskStreamEvent, TaskStreamRequest
+from service_logging import logger
+
+from .protection import RouteProtection
+from .sse_hub import Event, sse_hub
+
+
+def get_websocket_token(websocket: WebSocket) -> str | None:
+    """Извлекает токен доступа из заголовка Authorization или Query параметра token.
+    Браузеры не позволяют задавать заголовки при открытии WebSocket.
+
+    Args:
+        websocket (WebSocket): Соединение клиента.
+
+    Returns:
+        str | None: Токен доступа или None.
+    """
+    scheme, _, token = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        return token
+
+    return websocket.query_params.get("token")
+
+
+async def authenticate_websocket(
+    websocket: WebSocket, protection: RouteProtection
+) -> AuthorizedUser:
+    """Проверяет токен доступа до установки WebSocket соединения.
+
+    Args:
+        websocket (WebSocket): Соединение клиента.
+        protection (RouteProtection): Защита роута.
+
+    Raises:
+        WebSocketException: 1008. Токен отсутствует или недействителен.
+
+    Returns:
+        AuthorizedUser: Авторизованный пользователь.
+    """
+    token = get_websocket_token(websocket)
+    if token is None:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason="Not authenticated")
+
+    try:
+        return await protection(token)
+
+    except HTTPException as error:
+        raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION, reason=str(error.detail))
+
+
+def to_stream_event(task_id: UUID, event: Event) -> TaskStreamEvent:
+    """Собирает событие мультиплексированного потока из события SSE хаба.
+
+    Args:
+        task_id (UUID): Идентификатор задачи.
+        event (Event): Событие хаба.
+
+    Returns:
+        TaskStreamEvent: Событие для клиента.
+    """
+    try:
+        data = json.loads(event["data"])
+
+    except ValueError:
+        data = None
+
+    if not isinstance(data, dict):
+        return TaskStreamEvent(task_id=task_id, id=event["id"], status=Status.UNKNOWN)
+
+    try:
+        task_status = Status(data.get("status"))
+
+    except ValueError:
+        task_status = Status.UNKNOWN
+
+    return TaskStreamEvent(task_id=task_id, id=event["id"], status=task_status, data=data)
+
+
+class TaskStreamMultiplexer:
+    """Мультиплексированный поток событий многих задач по одному WebSocket соединению.
+
+    Клиент управляет набором отслеживаемых задач сообщениями subscribe/unsubscribe,
+    а события задач рассылаются через общий SSE хаб, как и для отдельных SSE потоков.
+    """
+
+    def __init__(self, websocket: WebSocket, user: AuthorizedUser) -> None:
+        """Конструктор класса.
+
+        Args:
+            websocket (WebSocket): Установленное соединение клиента.
+            user (AuthorizedUser): Авторизованный пользователь.
+        """
+        self.websocket = websocket
+        self.user = user
+
+        self._streams: dict[UUID, asyncio.Task] = {}
+        self._send_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        """Обрабатывает сообщения клиента до закрытия соединения.
+
+        Поддерживаются только текстовые сообщения: при получении двоичного
+        соединение закрывается с кодом 1003.
+        """
+        try:
+            while True:
+                message = await self.websocket.receive()
+
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+
+                text = message.get("text")
+                if text is None:
+                    logger.info("Task stream client sent a binary message.")
+                    await self.websocket.close(
+                        code=status.WS_1003_UNSUPPORTED_DATA,
+                        reason="Only text messages are supported",
+                    )
+                    return
+
+                try:
+                    request = TaskStreamRequest.model_validate_json(text)
+
+                except ValidationError as error:
+                    await self.send(TaskStreamEvent(task_id=None, error=str(error)))
+                    continue
+
+                if request.action is StreamAction.SUBSCRIBE:
+                    await self.subscribe(request)
+                else:
+                    self.unsubscribe(request.task_ids)
+
+        except WebSocketDisconnect:
+            logger.info("Task stream client disconnected.")
+
+        finally:
+            self.unsubscribe(list(self._streams))
+
+    async def subscribe(self, request: TaskStreamRequest) -> None:
+        """Подписывает клиента на события задач.
+
+        Args:
+            request (TaskStreamRequest): Сообщение клиента.
+        """
+        for task_id in request.task_ids:
+            if task_id in self._streams:
+                continue
+
+            if len(self._streams) >= configs.streams.MAX_SUBSCRIPTIONS:
+                error = f"Subscription limit of {configs.streams.MAX_SUBSCRIPTIONS} reached"
+                await self.send(TaskStreamEvent(task_id=task_id, error=error, closed=True))
+                continue
+
+            last_event_id = request.last_event_ids.get(task_id)
+            stream = asyncio.create_task(self._forward(task_id, last_event_id))
+            stream.add_done_callback(self._on_stream_done)
+            self._streams[task_id] = stream
+
+    def unsubscribe(self, task_ids: list[UUID]) -> None:
+        """Отписывает клиента от событий задач.
+
+        Args:
+            task_ids (list[UUID]): Идентификаторы задач.
+        """
+        for task_id in task_ids:
+            stream = self._streams.pop(task_id, None)
+            if stream is not None:
+                stream.cancel()
+
+    async def send(self, event: TaskStreamEvent) -> None:
+        """Отправляет событие клиенту.
+
+        Args:
+            event (TaskStreamEvent): Событие.
+        """
+        async with self._send_lock:
+            await self.websocket.send_text(event.model_dump_json(exclude_defaults=True))
+
+    async def _forward(self, task_id: UUID, last_event_id: str | None) -> None:
+        """Пересылает клиенту события одной задачи из SSE хаба."""
+        try:
+            async for event in sse_hub.subscribe(str(task_id), str(self.user.id), last_event_id):
+                await self.send(to_stream_event(task_id, event))
+
+            await self.send(TaskStreamEvent(task_id=task_id, closed=True))
+
+        except HTTPException as error:
+            await self.send(TaskStreamEvent(task_id=task_id, error=str(error.detail), closed=True))
+
+        # Клиент должен узнать о закрытии потока задачи при любой ошибке
+        except Exception as error:
+            logger.warning(f"Task stream forwarding failed: {error!r}")
+            await self.send(
+                TaskStreamEvent(task_id=task_id, error="Task stream failed", closed=True)
+            )
+
+        finally:
+            if self._streams.get(task_id) is asyncio.current_task():
+                del self._streams[task_id]
+
+    def _on_stream_done(self, stream: asyncio.Task) -> None:
+        """Логирует ошибку отправки клиенту события о закрытии потока задачи."""
+        if not stream.cancelled() and stream.exception() is not None:
+            logger.warning(f"Task stream forwarding failed: {stream.exception()}")
@@ -0,0 +1,98 @@
+import json
+from typing import Any, AsyncGenerator, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from configs.services import ServiceConfiguration
+
+from .passthrough import open_stream
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+async def iter_json_array(chunks: AsyncIterator[str]) -> AsyncGenerator[Any, None]:
+    """Разбирает JSON массив по мере поступления его частей,
+    храня в памяти только ещё не разобранный элемент.
+
+    Args:
+        chunks (AsyncIterator[str]): Части JSON массива.
+
+    Raises:
+        ValueError: Тело не является JSON массивом.
+
+    Yields:
+        Any: Очередной элемент массива.
+    """
+    buffer = ""
+    position = 0
+    started = False
+
+    async for chunk in chunks:
+        buffer = buffer[position:] + chunk
+        position = 0
+
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE + ",":
+                position += 1
+
+            if position == len(buffer):
+                break
+
+            if not started:
+                if buffer[position] != "[":
+                    raise ValueError("Expected a JSON array")
+
+                started = True
+                position += 1
+                continue
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                item, position = _decoder.raw_decode(buffer, position)
+
+            except json.JSONDecodeError:
+                # Элемент ещё не получен целиком
+                break
+
+            yield item
+
+    raise ValueError("Unexpected end of JSON array")
+
+
+async def stream_ndjson(
+    service: ServiceConfiguration,
+    method: str,
+    path: str,
+    model: type[BaseModel],
+    **kwargs: Any,
+) -> StreamingResponse:
+    """Выполняет запрос к сервису, возвращающему JSON массив, и передаёт
+    его элементы клиенту в формате NDJSON по мере получения.
+
+    Args:
+        service (ServiceConfiguration): Конфигурация сервиса.
+        method (str): HTTP метод.
+        path (str): Путь запроса.
+        model (type[BaseModel]): Схема элемента.
+        **kwargs (Any): Параметры запроса httpx.
+
+    Raises:
+        HTTPException: Проксированная ошибка от сервиса.
+
+    Returns:
+        StreamingResponse: Потоковый ответ FastAPI.
+    """
+    response = await open_stream(service, method, path, **kwargs)
+
+    async def stream_items() -> AsyncGenerator[str, None]:
+        try:
+            async for item in iter_json_array(response.aiter_text()):
+                yield model.model_validate(item).model_dump_json() + "\n"
+        finally:
+            await response.aclose()
+
+    return StreamingResponse(stream_items(), media_type="application/x-ndjson")
@@ -0,0 +1,195 @@
+import time
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from configs import configs
+from service_logging import logger
+
+from .admission import AdaptiveLimiter, admission_controller
+from .metrics import request_duration, requests_total
+from .timing import (
+    SERVER_TIMING_HEADER,
+    RequestTimings,
+    format_server_timing,
+    record_phase,
+    request_timings,
+    slow_requests,
+)
+from .tracing import TRACEPARENT_HEADER, TRACESTATE_HEADER, parse_traceparent, tracer
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+
+class RequestObservation:
+    """Состояние наблюдения за обработкой одного запроса клиента.
+
+    Метрики, фазы обработки и освобождение места в лимите фиксируются в момент
+    отправки заголовков ответа, поэтому длительное тело ответа (например, поток
+    событий) не удерживает место в лимите и не искажает задержку запроса.
+    """
+
+    __slots__ = ("request", "timings", "limiter", "started_at", "admitted_at", "status_code")
+
+    def __init__(self, request: Request, timings: RequestTimings | None) -> None:
+        """Конструктор класса.
+
+        Args:
+            request (Request): Запрос клиента.
+            timings (RequestTimings | None): Фазы запроса (None, если фазы не измеряются).
+        """
+        self.request = request
+        self.timings = timings
+        self.limiter: AdaptiveLimiter | None = None
+
+        self.started_at = time.perf_counter()
+        self.admitted_at = 0.0
+        self.status_code: int | None = None
+
+    def respond(self, message: Message, trace_id: str | None) -> None:
+        """Фиксирует отправку заголовков ответа и дополняет их.
+
+        Args:
+            message (Message): Сообщение http.response.start.
+            trace_id (str | None): Идентификатор трассы запроса.
+        """
+        self.status_code = message["status"]
+        headers = MutableHeaders(scope=message)
+
+        if trace_id is not None:
+            headers[TRACE_ID_HEADER] = trace_id
+
+        if self.limiter is not None:
+            overloaded = self.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+            self.limiter.release(time.monotonic() - self.admitted_at, overloaded)
+            self.limiter = None
+
+        self.record_metrics()
+
+        if self.timings is None:
+            return
+
+        phases = self.timings.get_phases()
+        if configs.timing.HEADER_ENABLE:
+            headers[SERVER_TIMING_HEADER] = format_server_timing(phases)
+
+        if phases[-1][2] >= configs.timing.SLOW_THRESHOLD:
+            slow_requests.add(self.request, self.status_code, phases, trace_id)
+
+    def record_metrics(self) -> None:
+        """Учитывает запрос в метриках. Запрос без ответа учитывается со статусом 500."""
+        # Шаблон пути роута вместо самого пути ограничивает количество наборов меток
+        route = self.request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        method = self.request.method
+        status_code = self.status_code or status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        requests_total.inc((method, path, str(status_code)))
+        request_duration.observe(time.perf_counter() - self.started_at, (method, path))
+
+
+class ObservabilityMiddleware:
+    """ASGI middleware наблюдаемости шлюза.
+
+    Последовательно для каждого HTTP запроса измеряет фазы обработки (заголовок
+    Server-Timing и журнал медленных запросов), учитывает запрос в метриках,
+    применяет контроль допуска и создаёт серверный спан трассировки с контекстом
+    логирования. Все этапы выполняются в одном слое и в задаче запроса, без
+    отдельной задачи и буферизации ответа на каждый этап, как в BaseHTTPMiddleware.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Конструктор класса.
+
+        Args:
+            app (ASGIApp): Приложение.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        timings = RequestTimings() if configs.timing.ENABLE else None
+        token = request_timings.set(timings)
+        observation = RequestObservation(request, timings)
+
+        try:
+            limiter = admission_controller.get_limiter(request.method, request.url.path)
+            if limiter is not None:
+                queued_at = time.perf_counter()
+                admitted = await limiter.acquire()
+                record_phase("queue", time.perf_counter() - queued_at)
+
+                if not admitted:
+                    await self._reject(observation, receive, send)
+                    return
+
+                observation.limiter = limiter
+                observation.admitted_at = time.monotonic()
+
+            await self._trace(observation, receive, send)
+
+        finally:
+            request_timings.reset(token)
+
+            # Запрос завершился ошибкой до отправки ответа
+            if observation.limiter is not None:
+                observation.limiter.release()
+            if observation.status_code is None:
+                observation.record_metrics()
+
+    async def _trace(self, observation: RequestObservation, receive: Receive, send: Send) -> None:
+        """Обрабатывает запрос в серверном спане и контексте логирования."""
+        request = observation.request
+        parent = parse_traceparent(
+            request.headers.get(TRACEPARENT_HEADER), request.headers.get(TRACESTATE_HEADER)
+        )
+        attributes = {"http.method": request.method, "http.target": request.url.path}
+
+        with tracer.start_span(
+            request.method, kind="server", attributes=attributes, parent=parent
+        ) as span:
+            trace_id = span.context.trace_id
+
+            async def send_traced(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    observation.respond(message, trace_id)
+
+                    span.attributes["http.status_code"] = observation.status_code
+                    if observation.status_code >= 500:
+                        span.status = "error"
+
+                await send(message)
+
+            # Идентификатор запроса в логах совпадает с окончанием идентификатора трассы
+            request_hash = trace_id[-10:]
+            try:
+                with logger.contextualize(request_hash=request_hash, request_path=request.url.path):
+                    await self.app(request.scope, receive, send_traced)
+
+            finally:
+                route = request.scope.get("route")
+                if route is not None:
+                    span.name = f"{request.method} {route.path}"
+
+    @staticmethod
+    async def _reject(observation: RequestObservation, receive: Receive, send: Send) -> None:
+        """Отвечает на запрос, не допущенный контролем допуска."""
+
+        async def send_rejected(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                observation.respond(message, None)
+
+            await send(message)
+
+        response = JSONResponse(
+            content={"detail": "Gateway is overloaded, retry later"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(configs.admission.RETRY_AFTER)},
+        )
+        await response(observation.request.scope, receive, send_rejected)
@@ -1,5 +1,9 @@
-from typing import Generic, TypeVar
+import base64
+import json
+from datetime import datetime
+from typing import Any, Generic, TypeVar
 
+from fastapi import HTTPException, status
 from pydantic import BaseModel, Field, computed_field
 
 
@@ -26,9 +30,72 @@ class PaginatedResponse(BaseModel, Generic[M]):
     page: int = Field(gt=0, description="Номер страницы")
     size: int = Field(ge=0, description="Размер страницы")
     total: int = Field(ge=0, description="Всего объектов")
+    embedded: dict[str, dict[str, dict[str, Any]]] = Field(
+        description="Расширение запроса: сущности по именам и идентификаторам", default={}
+    )
 
     @computed_field(description="Всего страниц")
     @property
     def total_pages(self) -> int:
         """Количество страниц всего."""
+        if self.size == 0:
+            return 0
+
         return (self.total + self.size - 1) // self.size
+
+
+# Позиция объекта в выдаче: время создания и идентификатор
+CursorKey = tuple[datetime, str]
+
+
+class CursorPagination(BaseModel):
+    """Класс Query параметров, необходимых для указания пагинации по курсору."""
+
+    cursor: str | None = Field(default=None, description="Курсор следующей страницы")
+    size: int = Field(gt=0, default=50, description="Размер страницы")
+
+    def get_key(self) -> CursorKey | None:
+        """Возвращает позицию, после которой начинается страница.
+
+        Raises:
+            HTTPException: 422. Курсор повреждён.
+
+        Returns:
+            CursorKey | None: Позиция или None для первой страницы.
+        """
+        if self.cursor is None:
+            return None
+
+        try:
+            created_at, item_id = json.loads(base64.urlsafe_b64decode(self.cursor))
+            return datetime.fromisoformat(created_at), str(item_id)
+
+        except (ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Invalid pagination cursor",
+            )
+
+
+def encode_cursor(key: CursorKey) -> str:
+    """Собирает курсор, указывающий на позицию объекта в выдаче.
+
+    Args:
+        key (CursorKey): Позиция последнего объекта страницы.
+
+    Returns:
+        str: Курсор следующей страницы.
+    """
+    created_at, item_id = key
+    return base64.urlsafe_b64encode(json.dumps([created_at.isoformat(), item_id]).encode()).decode()
+
+
+class CursorPaginatedResponse(BaseModel, Generic[M]):
+    """Класс ответа с пагинацией по курсору."""
+
+    items: list[M] = Field(description="Список объектов")
+    size: int = Field(gt=0, description="Размер страницы")
+    next_cursor: str | None = Field(description="Курсор следующей страницы")
+    embedded: dict[str, dict[str, dict[str, Any]]] = Field(
+        description="Расширение запроса: сущности по именам и идентификаторам", default={}
+    )
@@ -0,0 +1,166 @@
+import random
+from typing import Any, AsyncGenerator
+
+import httpx
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+from .http_proxy import proxy_request
+
+# Заголовки ответа сервиса, передаваемые клиенту без изменений
+PASSTHROUGH_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "content-language")
+
+
+def should_validate() -> bool:
+    """Определяет, нужно ли валидировать передаваемый ответ схемой.
+    В режиме отладки валидируется каждый ответ, иначе - случайная выборка.
+
+    Returns:
+        bool: Флаг валидации.
+    """
+    return configs.DEBUG_MODE or random.random() < configs.passthrough.VALIDATION_RATE
+
+
+def validate_content(content: bytes, model: type[BaseModel]) -> None:
+    """Проверяет соответствие тела ответа сервиса схеме роута.
+    Несоответствие логируется, но не прерывает запрос.
+
+    Args:
+        content (bytes): Тело ответа.
+        model (type[BaseModel]): Схема ответа роута.
+    """
+    try:
+        model.model_validate_json(content)
+
+    except ValidationError as error:
+        logger.error(f"Passthrough response does not match {model.__name__}: {error}")
+
+
+def get_passthrough_headers(response: httpx.Response) -> dict[str, str]:
+    """Отбирает заголовки ответа сервиса, передаваемые клиенту.
+
+    Args:
+        response (httpx.Response): Ответ сервиса.
+
+    Returns:
+        dict[str, str]: Заголовки.
+    """
+    return {
+        name: response.headers[name] for name in PASSTHROUGH_HEADERS if name in response.headers
+    }
+
+
+def passthrough_response(response: httpx.Response, model: type[BaseModel]) -> Response:
+    """Возвращает уже полученный ответ сервиса клиенту как есть,
+    минуя повторную сборку и сериализацию модели FastAPI.
+
+    Args:
+        response (httpx.Response): Прочитанный ответ сервиса.
+        model (type[BaseModel]): Схема ответа роута.
+
+    Returns:
+        Response: Ответ FastAPI.
+    """
+    if should_validate():
+        validate_content(response.content, model)
+
+    return to_response(response)
+
+
+def to_response(response: httpx.Response) -> Response:
+    """Собирает ответ FastAPI из прочитанного ответа сервиса.
+
+    Args:
+        response (httpx.Response): Прочитанный ответ сервиса.
+
+    Returns:
+        Response: Ответ FastAPI.
+    """
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        headers=get_passthrough_headers(response),
+    )
+
+
+async def open_stream(
+    service: ServiceConfiguration, method: str, path: str, **kwargs: Any
+) -> httpx.Response:
+    """Выполняет запрос к сервису, не читая тело успешного ответа.
+    Ответ необходимо закрыть после чтения.
+
+    Args:
+        service (ServiceConfiguration): Конфигурация сервиса.
+        method (str): HTTP метод.
+        path (str): Путь запроса.
+        **kwargs (Any): Параметры запроса httpx.
+
+    Raises:
+        HTTPException: Проксированная ошибка от сервиса.
+
+    Returns:
+        httpx.Response: Ответ сервиса с непрочитанным телом.
+    """
+    async with proxy_request(service) as client:
+        request = client.build_request(method, path, **kwargs)
+        response = await client.send(request, stream=True)
+
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+
+    return response
+
+
+async def stream_passthrough(
+    service: ServiceConfiguration,
+    method: str,
+    path: str,
+    model: type[BaseModel],
+    **kwargs: Any,
+) -> Response:
+    """Выполняет запрос к сервису и передаёт тело его ответа клиенту потоком,
+    не декодируя и не разбирая его на шлюзе. Ответы, попавшие в выборку
+    для валидации, предварительно читаются целиком.
+
+    Args:
+        service (ServiceConfiguration): Конфигурация сервиса.
+        method (str): HTTP метод.
+        path (str): Путь запроса.
+        model (type[BaseModel]): Схема ответа роута.
+        **kwargs (Any): Параметры запроса httpx.
+
+    Raises:
+        HTTPException: Проксированная ошибка от сервиса.
+
+    Returns:
+        Response: Потоковый ответ FastAPI.
+    """
+    if should_validate():
+        async with proxy_request(service) as client:
+            response = await client.request(method, path, **kwargs)
+            response.raise_for_status()
+
+        validate_content(response.content, model)
+        return to_response(response)
+
+    response = await open_stream(service, method, path, **kwargs)
+
+    headers = get_passthrough_headers(response)
+    for name in ("content-encoding", "content-length"):
+        if name in response.headers:
+            headers[name] = response.headers[name]
+
+    async def stream_body() -> AsyncGenerator[bytes, None]:
+        try:
+            async for chunk in response.aiter_raw():
+                yield chunk
+        finally:
+            await response.aclose()
+
+    return StreamingResponse(stream_body(), status_code=response.status_code, headers=headers)
@@ -0,0 +1,180 @@
+import asyncio
+import datetime
+import json
+import time
+
+from httpx import AsyncClient, HTTPError, Limits, Timeout
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+
+class EndpointHealth:
+    """Результат последних проверок одного экземпляра сервиса."""
+
+    def __init__(self, url: str) -> None:
+        """Конструктор класса.
+
+        Args:
+            url (str): Адрес экземпляра.
+        """
+        self.url = url
+
+        self.status = "unknown"
+        self.latency: float | None = None
+        self.error: str | None = None
+        self.failures = 0
+
+    def record(self, latency: float, error: str | None, threshold: int) -> None:
+        """Учитывает результат проверки. Доступный экземпляр считается
+        недоступным только после threshold неудачных проверок подряд.
+
+        Args:
+            latency (float): Время проверки в секундах.
+            error (str | None): Описание ошибки или None при успехе.
+            threshold (int): Число неудач подряд для смены статуса.
+        """
+        self.latency = latency
+        self.error = error
+
+        if error is None:
+            self.failures = 0
+            self.status = "up"
+            return
+
+        self.failures += 1
+        if self.status != "up" or self.failures >= threshold:
+            self.status = "down"
+
+    def to_dict(self) -> dict[str, str | float | None]:
+        """Возвращает результат проверки в виде словаря."""
+        return {
+            "status": self.status,
+            "latency_ms": None if self.latency is None else round(self.latency * 1000, 2),
+            "error": self.error,
+        }
+
+
+class HealthProber:
+    """Фоновая проверка доступности связанных сервисов.
+
+    Периодически запрашивает адрес проверки состояния каждого экземпляра
+    каждого сервиса и хранит готовый ответ о готовности шлюза, поэтому
+    проверка готовности не обращается к сервисам и выполняется из памяти.
+    Сервис доступен, если доступен хотя бы один из его экземпляров.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._endpoints: dict[str, list[EndpointHealth]] = {}
+        self._client: AsyncClient | None = None
+        self._probe_task: asyncio.Task | None = None
+
+        self.ready = False
+        self.body = self._render(checked_at=None)
+
+    async def startup(self) -> None:
+        """Запускает периодическую проверку сервисов."""
+        if not configs.probes.ENABLE:
+            self.ready = True
+            self.body = self._render(checked_at=None)
+            return
+
+        self._endpoints = {
+            service.NAME: [EndpointHealth(url) for url in service.ENDPOINT_URLS]
+            for service in configs.services.all()
+        }
+        self._client = AsyncClient(
+            timeout=Timeout(configs.probes.TIMEOUT),
+            limits=Limits(max_keepalive_connections=sum(map(len, self._endpoints.values()))),
+        )
+        self._probe_task = asyncio.create_task(self._probe_periodically())
+
+    async def shutdown(self) -> None:
+        """Останавливает проверку сервисов."""
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def probe(self) -> None:
+        """Проверяет все экземпляры всех сервисов и обновляет ответ о готовности."""
+        await asyncio.gather(
+            *(
+                self._probe_endpoint(service, endpoint)
+                for service in configs.services.all()
+                for endpoint in self._endpoints.get(service.NAME, [])
+            )
+        )
+
+        ready = all(self._get_status(name) == "up" for name in self._endpoints)
+        if ready != self.ready:
+            log = logger.info if ready else logger.warning
+            log(f"Gateway readiness changed: {'ready' if ready else 'not ready'}.")
+
+        self.ready = ready
+        self.body = self._render(checked_at=datetime.datetime.now(datetime.timezone.utc))
+
+    async def _probe_endpoint(
+        self, service: ServiceConfiguration, endpoint: EndpointHealth
+    ) -> None:
+        """Проверяет один экземпляр сервиса."""
+        started_at = time.monotonic()
+        try:
+            response = await self._client.get(endpoint.url + service.HEALTH_PATH)
+            error = None if response.is_success else f"HTTP {response.status_code}"
+
+        except HTTPError as exception:
+            error = str(exception) or type(exception).__name__
+
+        endpoint.record(time.monotonic() - started_at, error, configs.probes.FAILURE_THRESHOLD)
+
+    async def _probe_periodically(self) -> None:
+        """Фоновая задача периодической проверки сервисов."""
+        while True:
+            try:
+                await self.probe()
+
+            except Exception as error:
+                logger.error(f"Health probe failed: {error}")
+
+            await asyncio.sleep(configs.probes.INTERVAL)
+
+    def _get_status(self, name: str) -> str:
+        """Возвращает статус сервиса по статусам его экземпляров."""
+        statuses = {endpoint.status for endpoint in self._endpoints[name]}
+
+        if "up" in statuses:
+            return "up"
+
+        return "unknown" if statuses == {"unknown"} else "down"
+
+    def _render(self, checked_at: datetime.datetime | None) -> bytes:
+        """Формирует тело ответа о готовности шлюза."""
+        services = {}
+        for name, endpoints in self._endpoints.items():
+            latencies = [
+                endpoint.latency
+                for endpoint in endpoints
+                if endpoint.status == "up" and endpoint.latency is not None
+            ]
+
+            services[name] = {
+                "status": self._get_status(name),
+                "latency_ms": round(min(latencies) * 1000, 2) if latencies else None,
+                "endpoints": {endpoint.url: endpoint.to_dict() for endpoint in endpoints},
+            }
+
+        content = {
+            "status": "ready" if self.ready else "not_ready",
+            "services": services,
+            "checked_at": None if checked_at is None else checked_at.isoformat(),
+        }
+        return json.dumps(content).encode("utf-8")
+
+
+health_prober = HealthProber()
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any
+
+# Трассировки, которые не относятся к работе шлюза
+MEMORY_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class Profiler:
+    """Профилирование работающего шлюза по запросу.
+
+    Процессор профилируется выборкой: отдельный поток периодически считывает
+    стек потока цикла событий, и стеки подсчитываются в формате collapsed stacks
+    (строка "frame;frame;frame count"), который принимают flamegraph.pl,
+    speedscope и аналогичные инструменты. Память профилируется сравнением
+    снимков tracemalloc в начале и в конце интервала.
+
+    Поток выборки и трассировка выделений памяти существуют только на время
+    профилирования, поэтому вне его профилировщик не создаёт накладных расходов.
+    Одновременно выполняется только одно профилирование.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._lock = asyncio.Lock()
+        self._prefixes = sorted(
+            {os.path.join(path, "") for path in sys.path if path}, key=len, reverse=True
+        )
+
+    @property
+    def active(self) -> bool:
+        """Выполняется ли профилирование."""
+        return self._lock.locked()
+
+    async def profile_cpu(self, duration: float, interval: float) -> tuple[Counter[str], int]:
+        """Профилирует цикл событий выборкой стеков.
+
+        Args:
+            duration (float): Длительность профилирования в секундах.
+            interval (float): Интервал между выборками в секундах.
+
+        Returns:
+            tuple[Counter[str], int]: Количество выборок по стекам и общее количество выборок.
+        """
+        thread_id = threading.get_ident()
+
+        async with self._lock:
+            return await asyncio.to_thread(self._sample, thread_id, duration, interval)
+
+    async def profile_memory(
+        self, duration: float, frames: int, group_by: str, limit: int
+    ) -> dict[str, Any]:
+        """Сравнивает снимки выделений памяти в начале и в конце интервала.
+
+        Args:
+            duration (float): Длительность профилирования в секундах.
+            frames (int): Глубина сохраняемого стека выделения.
+            group_by (str): Группировка: lineno, filename или traceback.
+            limit (int): Максимум мест выделения в результате.
+
+        Returns:
+            dict[str, Any]: Прирост памяти по местам выделения и объём отслеживаемой памяти.
+        """
+        async with self._lock:
+            # Трассировка могла быть включена при запуске (PYTHONTRACEMALLOC)
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start(frames)
+
+            try:
+                first = await asyncio.to_thread(self._take_snapshot)
+                await asyncio.sleep(duration)
+                second = await asyncio.to_thread(self._take_snapshot)
+                current, peak = tracemalloc.get_traced_memory()
+
+            finally:
+                if started:
+                    tracemalloc.stop()
+
+        statistics = await asyncio.to_thread(second.compare_to, first, group_by)
+
+        return {
+            "duration": duration,
+            "traced_memory": current,
+            "traced_memory_peak": peak,
+            "stats": [
+                {
+                    "traceback": [
+                        self._shorten(frame.filename)
+                        if group_by == "filename"
+                        else f"{self._shorten(frame.filename)}:{frame.lineno}"
+                        for frame in stat.traceback
+                    ],
+                    "size": stat.size,
+                    "size_diff": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in statistics[:limit]
+            ],
+        }
+
+    def _sample(self, thread_id: int, duration: float, interval: float) -> tuple[Counter[str], int]:
+        """Считывает стек потока с заданным интервалом. Выполняется в отдельном потоке."""
+        stacks: Counter[str] = Counter()
+        labels: dict[CodeType, str] = {}
+        samples = 0
+
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                stacks[self._collapse(frame, labels)] += 1
+                samples += 1
+
+            del frame
+            time.sleep(interval)
+
+        return stacks, samples
+
+    def _collapse(self, frame: FrameType | None, labels: dict[CodeType, str]) -> str:
+        """Преобразует стек в строку кадров от корня к вершине, разделённых ";"."""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = f"{code.co_qualname} ({self._shorten(code.co_filename)})"
+
+            names.append(label)
+            frame = frame.f_back
+
+        return ";".join(reversed(names))
+
+    def _shorten(self, filename: str) -> str:
+        """Убирает из пути к файлу самый длинный подходящий путь поиска модулей."""
+        for prefix in self._prefixes:
+            if filename.startswith(prefix):
+                return filename[len(prefix) :]
+
+        return filename
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        """Делает снимок выделений памяти без служебных трассировок."""
+        return tracemalloc.take_snapshot().filter_traces(MEMORY_FILTERS)
+
+
+def format_collapsed(stacks: Counter[str]) -> str:
+    """Формирует вывод профиля в формате collapsed stacks.
+
+    Args:
+        stacks (Counter[str]): Количество выборок по стекам.
+
+    Returns:
+        str: Строки вида "frame;frame;frame count", начиная с самых частых стеков.
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+profiler = Profiler()
@@ -1,13 +1,25 @@
+import base64
+import hashlib
 import json
+import time
+from typing import Any
 
+import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from pydantic import ValidationError
 
 from configs import configs
 from schemas.auth import AuthorizedUser
 from service_logging import logger
 
+from .caching import TTLCache
+from .coalescing import SingleFlight
 from .http_proxy import proxy_request
+from .jwks import jwks_store
+from .metrics import auth_duration
+from .timing import phase
+from .tracing import tracer
 
 # ! На данный момент это не будет работать непостредственно в Swagger
 # ! URL /auth/login принимает JSON, а не URL-Encoded, что подразумевается
@@ -15,6 +27,110 @@ from .http_proxy import proxy_request
 # TODO: Рассмотреть варианты
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Общий для всех защищённых роутов кэш результатов проверки токенов.
+# Значение - авторизованный пользователь либо ошибка (негативный кэш).
+token_cache: TTLCache[str, AuthorizedUser | HTTPException] = TTLCache(
+    maxsize=configs.auth.CACHE_SIZE,
+    ttl=configs.auth.CACHE_TTL,
+)
+
+# Отказы проверки токена, сохраняемые в негативном кэше.
+NEGATIVE_CACHE_STATUSES = frozenset({status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN})
+
+# Одновременные проверки одного и того же токена выполняются один раз.
+verification_flight: SingleFlight[str, AuthorizedUser] = SingleFlight()
+
+
+def get_token_key(token: str) -> str:
+    """Возвращает ключ кэша для токена доступа, не храня сам токен в памяти.
+
+    Args:
+        token (str): Токен доступа.
+
+    Returns:
+        str: SHA-256 хэш токена.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_token_expiration(token: str) -> float | None:
+    """Извлекает время истечения (claim `exp`) из JWT без проверки подписи.
+
+    Args:
+        token (str): Токен доступа.
+
+    Returns:
+        float | None: UNIX время истечения токена или None, если его нет.
+    """
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def get_verification_key(token: str) -> Any | None:
+    """Подбирает ключ для локальной проверки подписи токена.
+
+    Args:
+        token (str): Токен доступа.
+
+    Raises:
+        jwt.PyJWTError: Заголовок токена повреждён.
+
+    Returns:
+        Any | None: Ключ проверки подписи или None, если он неизвестен.
+    """
+    if jwks_store.enabled:
+        header = jwt.get_unverified_header(token)
+        jwk = jwks_store.get(header.get("kid"))
+        return jwk.key if jwk else None
+
+    return configs.auth.JWT_PUBLIC_KEY or configs.auth.JWT_SECRET
+
+
+def verify_token_locally(token: str) -> AuthorizedUser | None:
+    """Проверяет подпись, срок действия и claims токена без обращения к сервису auth.
+
+    Args:
+        token (str): Токен доступа.
+
+    Raises:
+        HTTPException: 401. Токен недействителен.
+
+    Returns:
+        AuthorizedUser | None: Данные пользователя или None, если токен
+        невозможно проверить локально (неизвестный ключ или набор claims).
+    """
+    try:
+        key = get_verification_key(token)
+        if key is None:
+            return None
+
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=configs.auth.JWT_ALGORITHMS,
+            options={"require": ["exp"]},
+        )
+
+    # Кроме недействительного токена, ключ может не подходить к алгоритму из заголовка
+    except jwt.PyJWTError as error:
+        logger.info(f"Token rejected locally: {error}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    try:
+        return AuthorizedUser(id=claims["id"], name=claims["name"], is_admin=claims["is_admin"])
+
+    except (KeyError, ValidationError):
+        return None
+
 
 class RouteProtection:
     """Класс, предоставляющий интерфейс зависимости FastAPI для защиты
@@ -34,26 +150,123 @@ class RouteProtection:
         Производит авторизацию пользователя, возвращает информацию о нем и его правах в системе.
         """
         logger.info("The authorization process has begun...")
-        async with proxy_request(configs.services.auth.URL) as client:
-            try:
-                response = await client.post("/verify", content=json.dumps({"access_token": token}))
-                response.raise_for_status()
-
-            except HTTPException as error:
-                logger.info("The authorization process has been interrupted.")
-
-                raise HTTPException(
-                    status_code=error.status_code,
-                    detail=error.detail,
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+        with tracer.start_span("auth.authenticate") as span, phase("auth"):
+            subject = await self.__authenticate(token)
+            span.attributes["user.id"] = str(subject.id)
 
-        subject = AuthorizedUser(**response.json())
         logger.info(f"User {subject.name} authenticated.")
         self.__check_rights(subject)
 
         return subject
 
+    async def __authenticate(self, token: str) -> AuthorizedUser:
+        """Аутентифицирует пользователя по токену, используя кэш проверенных токенов.
+
+        Args:
+            token (str): Токен доступа.
+
+        Raises:
+            HTTPException: Ошибка проверки токена (в том числе из негативного кэша).
+
+        Returns:
+            AuthorizedUser: Данные авторизованного пользователя.
+        """
+        key = get_token_key(token)
+
+        if not configs.auth.CACHE_ENABLE:
+            return await verification_flight.do(key, lambda: self.__verify(token))
+
+        cached = token_cache.get(key)
+
+        if isinstance(cached, HTTPException):
+            logger.info("The authorization process has been interrupted (cached).")
+            raise HTTPException(
+                status_code=cached.status_code,
+                detail=cached.detail,
+                headers=cached.headers,
+            )
+
+        if cached is not None:
+            return cached
+
+        try:
+            subject = await verification_flight.do(key, lambda: self.__verify(token))
+
+        except HTTPException as error:
+            # Кэшируются только отказы в доступе, но не недоступность сервиса авторизации
+            # или ошибки, не относящиеся к самому токену
+            if error.status_code in NEGATIVE_CACHE_STATUSES:
+                token_cache.set(key, error, ttl=configs.auth.CACHE_NEGATIVE_TTL)
+            raise
+
+        ttl = configs.auth.CACHE_TTL
+        expiration = get_token_expiration(token)
+        if expiration is not None:
+            ttl = min(ttl, expiration - time.time())
+
+        token_cache.set(key, subject, ttl=ttl)
+
+        return subject
+
+    async def __verify(self, token: str) -> AuthorizedUser:
+        """Проверяет токен доступа. В локальном режиме токен проверяется
+        на шлюзе, а сервис авторизации используется как запасной вариант.
+
+        Args:
+            token (str): Токен доступа.
+
+        Raises:
+            HTTPException: Ошибка проверки токена.
+
+        Returns:
+            AuthorizedUser: Данные авторизованного пользователя.
+        """
+        started_at = time.perf_counter()
+        mode = "remote"
+
+        try:
+            if configs.auth.VERIFICATION_MODE == "local":
+                mode = "local"
+                subject = verify_token_locally(token)
+                if subject is not None:
+                    return subject
+
+                mode = "fallback"
+                logger.info("Token cannot be verified locally, falling back to the auth service.")
+
+            return await self.__verify_remotely(token)
+
+        finally:
+            auth_duration.observe(time.perf_counter() - started_at, (mode,))
+
+    async def __verify_remotely(self, token: str) -> AuthorizedUser:
+        """Проверяет токен доступа в сервисе авторизации.
+
+        Args:
+            token (str): Токен доступа.
+
+        Raises:
+            HTTPException: Проксированная ошибка проверки токена.
+
+        Returns:
+            AuthorizedUser: Данные авторизованного пользователя.
+        """
+        try:
+            async with proxy_request(configs.services.auth) as client:
+                response = await client.post("/verify", content=json.dumps({"access_token": token}))
+                response.raise_for_status()
+
+        except HTTPException as error:
+            logger.info("The authorization process has been interrupted.")
+
+            raise HTTPException(
+                status_code=error.status_code,
+                detail=error.detail,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        return AuthorizedUser(**response.json())
+
     def __check_rights(self, subject: AuthorizedUser) -> None:
         """Проверка необходимых прав у авторизованного пользователя.
 
@@ -0,0 +1,170 @@
+import asyncio
+import contextvars
+import time
+from typing import Any, Iterable
+
+from httpx import Response
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+from .caching import TTLCache
+from .coalescing import SingleFlight
+from .http_proxy import proxy_request
+
+CacheKey = tuple[str, str, tuple[tuple[str, Any], ...]]
+
+
+class ResponseCache:
+    """Кэш ответов связанных сервисов на GET запросы.
+
+    Записи вытесняются по LRU, имеют время жизни, задаваемое на уровне роута,
+    и помечаются тегами для точечной инвалидации при изменении данных.
+    Устаревшая запись ещё некоторое время (stale-while-revalidate) отдаётся
+    клиентам, пока в фоне запрашивается её актуальная версия.
+    """
+
+    def __init__(self, maxsize: int, stale_ttl: float) -> None:
+        """Конструктор класса.
+
+        Args:
+            maxsize (int): Максимальное количество ответов в кэше.
+            stale_ttl (float): Сколько секунд устаревший ответ может отдаваться клиентам.
+        """
+        self.stale_ttl = stale_ttl
+        self.stale_hits = 0
+
+        # Значение: (момент устаревания, теги, ответ)
+        self._entries: TTLCache[CacheKey, tuple[float, frozenset[str], Response]] = TTLCache(
+            maxsize=maxsize, ttl=0
+        )
+        self._flight: SingleFlight[CacheKey, Response] = SingleFlight()
+        self._revalidations: set[asyncio.Task] = set()
+        self._generation = 0
+
+    async def get(
+        self,
+        service: ServiceConfiguration,
+        path: str,
+        ttl: float,
+        tags: Iterable[str] = (),
+        params: dict[str, Any] | None = None,
+    ) -> Response:
+        """Возвращает ответ сервиса на GET запрос, используя кэш.
+
+        Args:
+            service (ServiceConfiguration): Конфигурация сервиса.
+            path (str): Путь запроса.
+            ttl (float): Время жизни ответа в секундах.
+            tags (Iterable[str], optional): Теги для инвалидации. Defaults to ().
+            params (dict[str, Any] | None, optional): Query параметры. Defaults to None.
+
+        Raises:
+            HTTPException: Проксированная ошибка от сервиса.
+
+        Returns:
+            Response: Ответ сервиса.
+        """
+        if not configs.cache.ENABLE or ttl <= 0:
+            return await self._fetch(service, path, params)
+
+        key = (service.NAME, path, tuple(sorted((params or {}).items())))
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            fresh_until, _, response = entry
+
+            if time.monotonic() >= fresh_until:
+                self.stale_hits += 1
+                self._revalidate(key, service, path, ttl, frozenset(tags), params)
+
+            return response
+
+        return await self._flight.do(
+            key, lambda: self._fill(key, service, path, ttl, frozenset(tags), params)
+        )
+
+    def invalidate(self, *tags: str) -> None:
+        """Удаляет из кэша все ответы, помеченные хотя бы одним из тегов.
+
+        Args:
+            *tags (str): Теги инвалидируемых ответов.
+        """
+        # Ответы, запрошенные до инвалидации, не должны попасть в кэш
+        self._generation += 1
+
+        invalidated = set(tags)
+        for key in self._entries.keys():
+            entry = self._entries.peek(key)
+            if entry is not None and entry[1] & invalidated:
+                self._entries.pop(key)
+
+        logger.info(f"Response cache invalidated: {', '.join(tags)}")
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает статистику использования кэша.
+
+        Returns:
+            dict[str, int]: Статистика кэша.
+        """
+        return {**self._entries.stats(), "stale_hits": self.stale_hits}
+
+    async def _fill(
+        self,
+        key: CacheKey,
+        service: ServiceConfiguration,
+        path: str,
+        ttl: float,
+        tags: frozenset[str],
+        params: dict[str, Any] | None,
+    ) -> Response:
+        """Запрашивает ответ у сервиса и сохраняет его в кэш."""
+        generation = self._generation
+        response = await self._fetch(service, path, params)
+
+        if generation == self._generation:
+            entry = (time.monotonic() + ttl, tags, response)
+            self._entries.set(key, entry, ttl=ttl + self.stale_ttl)
+
+        return response
+
+    def _revalidate(
+        self,
+        key: CacheKey,
+        service: ServiceConfiguration,
+        path: str,
+        ttl: float,
+        tags: frozenset[str],
+        params: dict[str, Any] | None,
+    ) -> None:
+        """Запускает фоновое обновление устаревшего ответа."""
+        # Обновление переживает запрос клиента, получившего устаревший ответ, поэтому
+        # не наследует срок обработки, текущий спан и фазы этого запроса
+        task = asyncio.get_running_loop().create_task(
+            self._flight.do(key, lambda: self._fill(key, service, path, ttl, tags, params)),
+            context=contextvars.Context(),
+        )
+        self._revalidations.add(task)
+        task.add_done_callback(self._on_revalidated)
+
+    def _on_revalidated(self, task: asyncio.Task) -> None:
+        """Завершает фоновое обновление, логируя его ошибку."""
+        self._revalidations.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Background cache revalidation failed: {task.exception()}")
+
+    @staticmethod
+    async def _fetch(
+        service: ServiceConfiguration, path: str, params: dict[str, Any] | None
+    ) -> Response:
+        """Выполняет GET запрос к сервису."""
+        async with proxy_request(service) as client:
+            response = await client.get(path, params=params)
+            response.raise_for_status()
+
+        return response
+
+
+response_cache = ResponseCache(maxsize=configs.cache.SIZE, stale_ttl=configs.cache.STALE_TTL)
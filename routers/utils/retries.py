@@ -0,0 +1,346 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+from httpx import (
+    AsyncBaseTransport,
+    ConnectError,
+    ConnectTimeout,
+    ReadError,
+    RemoteProtocolError,
+    Request,
+    Response,
+    WriteError,
+)
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+from .deadlines import request_deadline
+
+# Повторяются только идемпотентные запросы без побочных эффектов
+RETRYABLE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+RETRYABLE_ERRORS = (ConnectError, ConnectTimeout, ReadError, WriteError, RemoteProtocolError)
+
+
+class RetryBudget:
+    """Общий для всех сервисов бюджет повторных запросов.
+
+    Каждый исходный запрос пополняет бюджет на долю ratio, а каждый повторный
+    или дублирующий (hedged) запрос расходует единицу. Поэтому дополнительная
+    нагрузка на сервисы не превышает заданной доли даже во время их отказа.
+    """
+
+    def __init__(self, ratio: float, reserve: float) -> None:
+        """Конструктор класса.
+
+        Args:
+            ratio (float): Доля повторных запросов от исходных.
+            reserve (float): Максимальный запас бюджета.
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = reserve
+
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        """Пополняет бюджет при исходном запросе."""
+        self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Расходует бюджет на повторный запрос.
+
+        Returns:
+            bool: False, если бюджет исчерпан.
+        """
+        if self.balance < 1:
+            self.exhausted += 1
+            return False
+
+        self.balance -= 1
+        self.retries += 1
+        return True
+
+    def stats(self) -> dict[str, float]:
+        """Возвращает состояние бюджета.
+
+        Returns:
+            dict[str, float]: Остаток, повторные запросы и отказы из-за исчерпания.
+        """
+        return {"balance": self.balance, "retries": self.retries, "exhausted": self.exhausted}
+
+
+class LatencyTracker:
+    """Скользящее окно задержек ответов сервиса для выбора момента дублирования."""
+
+    def __init__(self, size: int, min_samples: int) -> None:
+        """Конструктор класса.
+
+        Args:
+            size (int): Количество хранимых замеров.
+            min_samples (int): Минимум замеров для оценки перцентиля.
+        """
+        self.min_samples = min_samples
+
+        self.hedges = 0
+        self.hedge_wins = 0
+
+        self._samples: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] | None = None
+
+    def add(self, latency: float) -> None:
+        """Добавляет замер задержки.
+
+        Args:
+            latency (float): Задержка в секундах.
+        """
+        self._samples.append(latency)
+        self._sorted = None
+
+    def percentile(self, quantile: float) -> float | None:
+        """Возвращает перцентиль задержек.
+
+        Args:
+            quantile (float): Квантиль (от 0 до 1).
+
+        Returns:
+            float | None: Задержка в секундах или None, если замеров недостаточно.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+
+        if self._sorted is None:
+            self._sorted = sorted(self._samples)
+
+        index = min(len(self._sorted) - 1, int(quantile * len(self._sorted)))
+        return self._sorted[index]
+
+    def stats(self) -> dict[str, float | int | None]:
+        """Возвращает статистику задержек и дублирования.
+
+        Returns:
+            dict[str, float | int | None]: p95, дублированные запросы и победы дублей.
+        """
+        return {"p95": self.percentile(0.95), "hedges": self.hedges, "hedge_wins": self.hedge_wins}
+
+
+class RetryTransport(AsyncBaseTransport):
+    """Транспорт httpx, повторяющий идемпотентные запросы при ошибках соединения
+    и ответах 502/503/504 с экспоненциальной задержкой со случайным разбросом.
+    """
+
+    def __init__(
+        self, transport: AsyncBaseTransport, service: ServiceConfiguration, budget: RetryBudget
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            service (ServiceConfiguration): Конфигурация сервиса.
+            budget (RetryBudget): Бюджет повторных запросов.
+        """
+        self._transport = transport
+        self._service = service
+        self._budget = budget
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method not in RETRYABLE_METHODS:
+            return await self._transport.handle_async_request(request)
+
+        self._budget.deposit()
+        deadline = time.monotonic() + self._service.RETRY_DEADLINE
+        deadline = min(deadline, request_deadline.get() or deadline)
+        attempt = 0
+
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+
+            except RETRYABLE_ERRORS as error:
+                delay = self._get_delay(attempt)
+                if not self._can_retry(attempt, delay, deadline):
+                    raise
+                reason = type(error).__name__
+
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    return response
+
+                delay = self._get_delay(attempt)
+                if not self._can_retry(attempt, delay, deadline):
+                    return response
+
+                await response.aclose()
+                reason = str(response.status_code)
+
+            attempt += 1
+            logger.warning(f"Retrying {request.method} {request.url} after {reason} ({attempt}).")
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def _get_delay(self, attempt: int) -> float:
+        """Возвращает задержку перед повтором (full jitter)."""
+        backoff = self._service.RETRY_BACKOFF * 2**attempt
+        return random.uniform(0, min(self._service.RETRY_BACKOFF_MAX, backoff))
+
+    def _can_retry(self, attempt: int, delay: float, deadline: float) -> bool:
+        """Проверяет, можно ли повторить запрос."""
+        if attempt >= self._service.RETRY_ATTEMPTS:
+            return False
+
+        if time.monotonic() + delay >= deadline:
+            return False
+
+        return self._budget.withdraw()
+
+
+class HedgingTransport(AsyncBaseTransport):
+    """Транспорт httpx, дублирующий GET запрос, если ответ не получен за время,
+    превышающее заданный перцентиль задержек сервиса. Используется ответ,
+    полученный первым, а второй запрос отменяется.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport,
+        service: ServiceConfiguration,
+        tracker: LatencyTracker,
+        budget: RetryBudget,
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            service (ServiceConfiguration): Конфигурация сервиса.
+            tracker (LatencyTracker): Задержки ответов сервиса.
+            budget (RetryBudget): Бюджет повторных запросов.
+        """
+        self._transport = transport
+        self._service = service
+        self._tracker = tracker
+        self._budget = budget
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+
+        delay = self._tracker.percentile(self._service.HEDGE_PERCENTILE)
+        if delay is None:
+            return await self._send(request)
+
+        first = asyncio.ensure_future(self._send(request))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+
+            if done or not self._budget.withdraw():
+                return await first
+
+        except BaseException:
+            self._discard(first)
+            raise
+
+        self._tracker.hedges += 1
+        second = asyncio.ensure_future(self._send(request))
+
+        return await self._race(first, second)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    async def _send(self, request: Request) -> Response:
+        """Выполняет запрос, замеряя задержку успешного ответа."""
+        started_at = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+
+        if response.status_code < 500:
+            self._tracker.add(time.monotonic() - started_at)
+
+        return response
+
+    async def _race(self, first: asyncio.Future, second: asyncio.Future) -> Response:
+        """Возвращает первый успешный ответ из двух запросов, отменяя оставшийся."""
+        pending = {first, second}
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                succeeded = [
+                    task
+                    for task in done
+                    if task.exception() is None and task.result().status_code < 500
+                ]
+
+                if succeeded or not pending:
+                    winner = succeeded[0] if succeeded else done.pop()
+                    if winner is second:
+                        self._tracker.hedge_wins += 1
+
+                    for task in done - {winner}:
+                        self._discard(task)
+                    return winner.result()
+
+                for task in done:
+                    self._discard(task)
+
+        finally:
+            for task in pending:
+                self._discard(task)
+
+        raise RuntimeError("Hedged request finished without a result")
+
+    @staticmethod
+    def _discard(task: asyncio.Future) -> None:
+        """Отменяет ненужный запрос и закрывает его ответ, если он уже получен."""
+
+        def close(done: asyncio.Future) -> None:
+            if not done.cancelled() and done.exception() is None:
+                asyncio.ensure_future(done.result().aclose())
+
+        task.cancel()
+        task.add_done_callback(close)
+
+
+class LatencyTrackers:
+    """Реестр задержек ответов связанных сервисов."""
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._trackers: dict[str, LatencyTracker] = {}
+
+    def get(self, service: ServiceConfiguration) -> LatencyTracker:
+        """Возвращает задержки ответов сервиса, создавая их при первом обращении.
+
+        Args:
+            service (ServiceConfiguration): Конфигурация сервиса.
+
+        Returns:
+            LatencyTracker: Задержки ответов сервиса.
+        """
+        tracker = self._trackers.get(service.NAME)
+
+        if tracker is None:
+            tracker = self._trackers[service.NAME] = LatencyTracker(
+                size=service.HEDGE_WINDOW, min_samples=service.HEDGE_MIN_SAMPLES
+            )
+
+        return tracker
+
+    def stats(self) -> dict[str, dict[str, float | int | None]]:
+        """Возвращает статистику задержек всех сервисов.
+
+        Returns:
+            dict[str, dict[str, float | int | None]]: Статистика по именам сервисов.
+        """
+        return {name: tracker.stats() for name, tracker in self._trackers.items()}
+
+
+retry_budget = RetryBudget(ratio=configs.retry.BUDGET_RATIO, reserve=configs.retry.BUDGET_RESERVE)
+latency_trackers = LatencyTrackers()
@@ -0,0 +1,377 @@
+import asyncio
+import contextvars
+import json
+import secrets
+from collections import deque
+from typing import AsyncGenerator
+
+from configs import configs
+from schemas.tasks import Status
+from service_logging import logger
+
+from .caching import TTLCache
+from .http_proxy import proxy_task_sse_request
+
+ChannelKey = tuple[str, str]
+
+# Событие SSE: идентификатор (id) и JSON-строка с данными (data)
+Event = dict[str, str]
+
+# Статусы, после которых обновлений задачи больше не будет
+FINAL_STATUSES = frozenset({Status.COMPLETED.value, Status.FAILED.value})
+
+
+class Subscription:
+    """Подписка клиента на события задачи с ограниченной очередью."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Конструктор класса.
+
+        Args:
+            maxsize (int): Максимальное количество непрочитанных событий.
+        """
+        self.maxsize = maxsize
+
+        # None - конец потока, исключение - ошибка связанного сервиса
+        self.queue: asyncio.Queue[Event | BaseException | None] = asyncio.Queue()
+
+    def put(self, event: Event) -> bool:
+        """Добавляет событие в очередь подписки.
+
+        Args:
+            event (Event): Событие.
+
+        Returns:
+            bool: False, если очередь переполнена.
+        """
+        if self.queue.qsize() >= self.maxsize:
+            return False
+
+        self.queue.put_nowait(event)
+        return True
+
+    def close(self, error: BaseException | None = None) -> None:
+        """Завершает подписку после уже полученных событий.
+
+        Args:
+            error (BaseException | None, optional): Ошибка для клиента. Defaults to None.
+        """
+        self.queue.put_nowait(error)
+
+    def drop(self) -> None:
+        """Завершает подписку, отбрасывая непрочитанные события."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+        self.close()
+
+    async def __aiter__(self) -> AsyncGenerator[Event, None]:
+        while True:
+            event = await self.queue.get()
+
+            if event is None:
+                return
+            if isinstance(event, BaseException):
+                raise event
+
+            yield event
+
+
+class EventHistory:
+    """Кольцевой буфер последних событий задачи.
+
+    Идентификаторы событий состоят из случайной эпохи буфера и порядкового
+    номера, поэтому идентификатор из вытесненного буфера не будет принят
+    за идентификатор события нового.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Конструктор класса.
+
+        Args:
+            maxsize (int): Максимальное количество хранимых событий.
+        """
+        self.epoch = secrets.token_hex(4)
+        self.sequence = 0
+        self.finished = False
+
+        self._events: deque[tuple[int, Event]] = deque(maxlen=maxsize)
+
+    def append(self, message: str) -> Event:
+        """Присваивает событию идентификатор и сохраняет его.
+
+        Args:
+            message (str): JSON-строка с событием.
+
+        Returns:
+            Event: Событие с идентификатором.
+        """
+        self.sequence += 1
+        event = {"id": f"{self.epoch}-{self.sequence}", "data": message}
+        self._events.append((self.sequence, event))
+
+        return event
+
+    def latest(self) -> Event | None:
+        """Возвращает последнее событие задачи.
+
+        Returns:
+            Event | None: Событие или None, если событий ещё не было.
+        """
+        return self._events[-1][1] if self._events else None
+
+    def after(self, last_event_id: str) -> list[Event] | None:
+        """Возвращает события, следующие за указанным.
+
+        Args:
+            last_event_id (str): Идентификатор последнего полученного клиентом события.
+
+        Returns:
+            list[Event] | None: События или None, если идентификатор не из этого буфера.
+        """
+        epoch, _, sequence = last_event_id.partition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+
+        return [event for number, event in self._events if number > int(sequence)]
+
+
+class TaskChannel:
+    """Канал событий одной задачи с общим потоком из сервиса-менеджера."""
+
+    def __init__(self, hub: "SSEHub", key: ChannelKey) -> None:
+        """Конструктор класса.
+
+        Args:
+            hub (SSEHub): Хаб, которому принадлежит канал.
+            key (ChannelKey): Идентификаторы задачи и пользователя.
+        """
+        self.hub = hub
+        self.key = key
+        self.subscribers: set[Subscription] = set()
+
+        # Поток живёт дольше запроса клиента, открывшего его, поэтому не наследует
+        # срок обработки, текущий спан и фазы этого запроса
+        self._task = asyncio.create_task(self._pump(), context=contextvars.Context())
+
+    def subscribe(self) -> Subscription:
+        """Добавляет подписчика канала.
+
+        Returns:
+            Subscription: Подписка.
+        """
+        subscription = Subscription(configs.streams.QUEUE_SIZE)
+        self.subscribers.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Удаляет подписчика. Без подписчиков канал закрывается.
+
+        Args:
+            subscription (Subscription): Подписка.
+        """
+        self.subscribers.discard(subscription)
+
+        if not self.subscribers:
+            self.close()
+
+    def publish(self, event: Event) -> None:
+        """Рассылает событие подписчикам. Подписчики, не успевающие
+        читать события, отключаются.
+
+        Args:
+            event (Event): Событие.
+        """
+        for subscription in list(self.subscribers):
+            if not subscription.put(event):
+                logger.warning(f"Dropping slow SSE subscriber of task {self.key[0]}.")
+                self.hub.dropped += 1
+                self.subscribers.discard(subscription)
+                subscription.drop()
+
+        if not self.subscribers:
+            self.close()
+
+    def close(self, error: BaseException | None = None) -> None:
+        """Закрывает поток из сервиса и завершает все подписки.
+
+        Args:
+            error (BaseException | None, optional): Ошибка для подписчиков. Defaults to None.
+        """
+        self.hub.remove(self)
+
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+
+        for subscription in self.subscribers:
+            subscription.close(error)
+        self.subscribers.clear()
+
+    async def _pump(self) -> None:
+        """Фоновая задача чтения потока событий задачи из сервиса-менеджера."""
+        task_id, user_id = self.key
+
+        try:
+            async for message in proxy_task_sse_request(task_id, user_id):
+                finished = get_status(message) in FINAL_STATUSES
+                self.publish(self.hub.record(self.key, message, finished))
+
+                if finished:
+                    break
+
+        except asyncio.CancelledError:
+            raise
+
+        except Exception as error:
+            self.close(error)
+            return
+
+        self.close()
+
+
+def get_status(message: str) -> str | None:
+    """Извлекает статус задачи из события.
+
+    Args:
+        message (str): JSON-строка с событием.
+
+    Returns:
+        str | None: Статус или None, если его нет в событии.
+    """
+    try:
+        content = json.loads(message)
+
+    except ValueError:
+        return None
+
+    return content.get("status") if isinstance(content, dict) else None
+
+
+class SSEHub:
+    """Хаб рассылки событий статусов задач.
+
+    На каждую задачу открывается один поток из сервиса-менеджера, события
+    которого рассылаются всем подключённым к шлюзу клиентам. Каналы разделены
+    по пользователям, так как доступ к задаче проверяется сервисом-менеджером.
+    Поток закрывается, когда отключается последний клиент или задача завершается.
+
+    Последние события задачи хранятся некоторое время после закрытия потока,
+    что позволяет переподключившемуся клиенту получить пропущенные события.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self._channels: dict[ChannelKey, TaskChannel] = {}
+        self._history: TTLCache[ChannelKey, EventHistory] = TTLCache(
+            maxsize=configs.streams.HISTORY_CHANNELS, ttl=configs.streams.HISTORY_TTL
+        )
+
+        self.events = 0
+        self.dropped = 0
+        self.replayed = 0
+
+    async def subscribe(
+        self, task_id: str, user_id: str, last_event_id: str | None = None
+    ) -> AsyncGenerator[Event, None]:
+        """Подписывает клиента на события задачи. При переподключении сначала
+        отдаются события, пропущенные клиентом, а при подключении к уже открытому
+        потоку - последнее событие задачи. Если задача уже завершилась,
+        поток из сервиса не открывается.
+
+        Args:
+            task_id (str): ID задачи.
+            user_id (str): ID пользователя, создавшего задачу.
+            last_event_id (str | None, optional): ID последнего полученного события.
+                Defaults to None.
+
+        Raises:
+            HTTPException: Проксированная ошибка от сервиса.
+
+        Yields:
+            Event: Событие SSE с идентификатором.
+        """
+        key = (task_id, user_id)
+        history = self._history.get(key)
+
+        missed = None
+        if history is not None and last_event_id:
+            missed = history.after(last_event_id)
+
+        if missed is not None and history.finished:
+            self.replayed += len(missed)
+            for event in missed:
+                yield event
+            return
+
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = self._channels[key] = TaskChannel(self, key)
+
+        # Новый поток из сервиса начинается с текущего состояния задачи, а клиент,
+        # присоединившийся к уже открытому, получает его из последнего события
+        elif missed is None and history is not None and history.latest() is not None:
+            missed = [history.latest()]
+
+        subscription = channel.subscribe()
+        try:
+            self.replayed += len(missed or [])
+            for event in missed or []:
+                yield event
+
+            async for event in subscription:
+                yield event
+
+        finally:
+            channel.unsubscribe(subscription)
+
+    def record(self, key: ChannelKey, message: str, finished: bool) -> Event:
+        """Сохраняет событие задачи в буфер, присваивая ему идентификатор.
+
+        Args:
+            key (ChannelKey): Идентификаторы задачи и пользователя.
+            message (str): JSON-строка с событием.
+            finished (bool): Является ли событие последним для задачи.
+
+        Returns:
+            Event: Событие с идентификатором.
+        """
+        history = self._history.peek(key) or EventHistory(configs.streams.HISTORY_SIZE)
+        event = history.append(message)
+        history.finished = finished
+
+        self._history.set(key, history)
+        self.events += 1
+
+        return event
+
+    def remove(self, channel: TaskChannel) -> None:
+        """Удаляет закрытый канал из хаба.
+
+        Args:
+            channel (TaskChannel): Канал.
+        """
+        if self._channels.get(channel.key) is channel:
+            del self._channels[channel.key]
+
+    async def shutdown(self) -> None:
+        """Закрывает все каналы."""
+        for channel in list(self._channels.values()):
+            channel.close()
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает статистику хаба.
+
+        Returns:
+            dict[str, int]: Каналы, подписчики и счётчики событий.
+        """
+        return {
+            "channels": len(self._channels),
+            "subscribers": sum(len(channel.subscribers) for channel in self._channels.values()),
+            "events": self.events,
+            "dropped": self.dropped,
+            "replayed": self.replayed,
+        }
+
+
+sse_hub = SSEHub()
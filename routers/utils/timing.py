@@ -0,0 +1,298 @@
+import asyncio
+import datetime
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Coroutine, Iterator
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from httpx import AsyncBaseTransport, Request as HTTPXRequest, Response as HTTPXResponse
+
+from configs import configs
+from configs.services import ServiceConfiguration
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Фаза обработки запроса: имя и описание (например, имя сервиса)
+PhaseKey = tuple[str, str | None]
+
+
+class RequestTimings:
+    """Длительности фаз обработки одного запроса клиента.
+
+    Фазы auth, upstream и queue накапливаются по мере выполнения, а фазы validate,
+    endpoint и serialize вычисляются по отметкам времени обработчика роута:
+    validate - разбор и валидация запроса (без аутентификации), endpoint - функция
+    роута (включая обращения к сервисам), serialize - валидация и сериализация ответа.
+    """
+
+    __slots__ = (
+        "started",
+        "durations",
+        "handler_started",
+        "handler_finished",
+        "endpoint_started",
+        "endpoint_finished",
+    )
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self.started = time.perf_counter()
+        self.durations: dict[PhaseKey, float] = {}
+
+        self.handler_started: float | None = None
+        self.handler_finished: float | None = None
+        self.endpoint_started: float | None = None
+        self.endpoint_finished: float | None = None
+
+    def add(self, name: str, duration: float, desc: str | None = None) -> None:
+        """Добавляет время к фазе.
+
+        Args:
+            name (str): Имя фазы.
+            duration (float): Длительность в секундах.
+            desc (str | None, optional): Описание фазы. Defaults to None.
+        """
+        key = (name, desc)
+        self.durations[key] = self.durations.get(key, 0.0) + duration
+
+    def get_phases(self) -> list[tuple[str, str | None, float]]:
+        """Возвращает длительности всех фаз. Последней идёт общая длительность запроса (total).
+
+        Returns:
+            list[tuple[str, str | None, float]]: Имя, описание и длительность фазы в секундах.
+        """
+        durations = dict(self.durations)
+
+        # Если запрос не прошёл валидацию, функция роута не вызывается
+        validated_at = self.endpoint_started or self.handler_finished
+        if self.handler_started is not None and validated_at is not None:
+            auth = sum(value for (name, _), value in durations.items() if name == "auth")
+            validate = validated_at - self.handler_started - auth
+            durations["validate", None] = max(validate, 0.0)
+
+        if self.endpoint_started is not None and self.endpoint_finished is not None:
+            durations["endpoint", None] = self.endpoint_finished - self.endpoint_started
+
+        if self.endpoint_finished is not None and self.handler_finished is not None:
+            durations["serialize", None] = self.handler_finished - self.endpoint_finished
+
+        durations["total", None] = time.perf_counter() - self.started
+
+        return [(name, desc, duration) for (name, desc), duration in durations.items()]
+
+
+# Фазы обрабатываемого запроса (None вне запроса клиента)
+request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def record_phase(name: str, duration: float, desc: str | None = None) -> None:
+    """Добавляет время к фазе текущего запроса, если фазы измеряются.
+
+    Args:
+        name (str): Имя фазы.
+        duration (float): Длительность в секундах.
+        desc (str | None, optional): Описание фазы. Defaults to None.
+    """
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add(name, duration, desc)
+
+
+@contextmanager
+def phase(name: str, desc: str | None = None) -> Iterator[None]:
+    """Контекстный менеджер, измеряющий фазу текущего запроса.
+
+    Args:
+        name (str): Имя фазы.
+        desc (str | None, optional): Описание фазы. Defaults to None.
+    """
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_phase(name, time.perf_counter() - started_at, desc)
+
+
+def format_server_timing(phases: list[tuple[str, str | None, float]]) -> str:
+    """Формирует значение заголовка Server-Timing.
+
+    Args:
+        phases (list[tuple[str, str | None, float]]): Имя, описание и длительность фаз.
+
+    Returns:
+        str: Значение заголовка (длительности в миллисекундах).
+    """
+    return ", ".join(
+        f'{name};desc="{desc}";dur={duration * 1000:.2f}'
+        if desc is not None
+        else f"{name};dur={duration * 1000:.2f}"
+        for name, desc, duration in phases
+    )
+
+
+def time_endpoint(endpoint: Callable) -> Callable:
+    """Оборачивает функцию роута, отмечая время её начала и завершения.
+
+    Args:
+        endpoint (Callable): Функция роута.
+
+    Returns:
+        Callable: Обёртка с той же сигнатурой.
+    """
+    if getattr(endpoint, "__timed__", False) or not asyncio.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @wraps(endpoint)
+    async def timed_endpoint(*args: Any, **kwargs: Any) -> Any:
+        timings = request_timings.get()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+
+        timings.endpoint_started = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings.endpoint_finished = time.perf_counter()
+
+    timed_endpoint.__timed__ = True
+    return timed_endpoint
+
+
+class TimedRoute(APIRoute):
+    """Роут FastAPI, отмечающий границы фаз обработки запроса:
+    до вызова функции роута, её выполнение и подготовку ответа.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        """Конструктор класса.
+
+        Args:
+            path (str): Путь роута.
+            endpoint (Callable): Функция роута.
+        """
+        super().__init__(path, time_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = request_timings.get()
+            if timings is None:
+                return await handler(request)
+
+            timings.handler_started = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                timings.handler_finished = time.perf_counter()
+
+        return timed_handler
+
+
+class ServerTimingTransport(AsyncBaseTransport):
+    """Транспорт httpx, добавляющий время обращения к сервису (с учётом повторов)
+    к фазе upstream текущего запроса.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, service: ServiceConfiguration) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            service (ServiceConfiguration): Конфигурация сервиса.
+        """
+        self._transport = transport
+        self._service = service.NAME
+
+    async def handle_async_request(self, request: HTTPXRequest) -> HTTPXResponse:
+        with phase("upstream", self._service):
+            return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class SlowRequestLog:
+    """Кольцевой буфер последних запросов, обработка которых превысила порог."""
+
+    def __init__(self, size: int) -> None:
+        """Конструктор класса.
+
+        Args:
+            size (int): Максимум хранимых запросов.
+        """
+        self.captured = 0
+        self._entries: deque[dict[str, Any]] = deque(maxlen=size)
+
+    def add(
+        self,
+        request: Request,
+        status_code: int,
+        phases: list[tuple[str, str | None, float]],
+        trace_id: str | None,
+    ) -> None:
+        """Сохраняет медленный запрос вместе с длительностями фаз.
+
+        Args:
+            request (Request): Запрос клиента.
+            status_code (int): Код статуса ответа.
+            phases (list[tuple[str, str | None, float]]): Имя, описание и длительность фаз.
+            trace_id (str | None): Идентификатор трассы запроса.
+        """
+        route = request.scope.get("route")
+        duration = next(value for name, _, value in phases if name == "total")
+
+        self.captured += 1
+        self._entries.append(
+            {
+                "timestamp": datetime.datetime.now(datetime.timezone.utc),
+                "method": request.method,
+                "path": request.url.path,
+                "route": route.path if route is not None else None,
+                "status_code": status_code,
+                "duration_ms": round(duration * 1000, 2),
+                "trace_id": trace_id,
+                "phases": [
+                    {"name": name, "desc": desc, "duration_ms": round(value * 1000, 2)}
+                    for name, desc, value in phases
+                    if name != "total"
+                ],
+            }
+        )
+
+    def get_entries(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Возвращает сохранённые запросы, начиная с последнего.
+
+        Args:
+            limit (int | None, optional): Максимум запросов. Defaults to None.
+
+        Returns:
+            list[dict[str, Any]]: Медленные запросы.
+        """
+        entries = list(reversed(self._entries))
+        return entries if limit is None else entries[:limit]
+
+    def clear(self) -> int:
+        """Очищает буфер.
+
+        Returns:
+            int: Количество удалённых запросов.
+        """
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает статистику буфера.
+
+        Returns:
+            dict[str, int]: Всего сохранённых запросов и запросов в буфере.
+        """
+        return {"captured": self.captured, "buffered": len(self._entries)}
+
+
+slow_requests = SlowRequestLog(configs.timing.SLOW_BUFFER_SIZE)
@@ -0,0 +1,399 @@
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from httpx import AsyncBaseTransport, Request, Response
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from service_logging import logger
+
+TRACEPARENT_HEADER = "traceparent"
+TRACESTATE_HEADER = "tracestate"
+TRACEPARENT_PATTERN = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class SpanContext:
+    """Контекст трассировки W3C (trace-id, span-id, флаг выборки и tracestate)."""
+
+    __slots__ = ("trace_id", "span_id", "sampled", "state")
+
+    def __init__(self, trace_id: str, span_id: str, sampled: bool, state: str | None = None):
+        """Конструктор класса.
+
+        Args:
+            trace_id (str): Идентификатор трассы (32 hex символа).
+            span_id (str): Идентификатор спана (16 hex символов).
+            sampled (bool): Записывается ли трасса.
+            state (str | None, optional): Значение заголовка tracestate. Defaults to None.
+        """
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.sampled = sampled
+        self.state = state
+
+    @property
+    def traceparent(self) -> str:
+        """Значение заголовка traceparent."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(traceparent: str | None, tracestate: str | None = None) -> SpanContext | None:
+    """Разбирает заголовок traceparent входящего запроса.
+
+    Args:
+        traceparent (str | None): Значение заголовка traceparent.
+        tracestate (str | None, optional): Значение заголовка tracestate. Defaults to None.
+
+    Returns:
+        SpanContext | None: Контекст вызывающей стороны или None, если заголовок некорректен.
+    """
+    match = TRACEPARENT_PATTERN.match((traceparent or "").strip().lower())
+    if match is None:
+        return None
+
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+
+    return SpanContext(trace_id, span_id, sampled=bool(int(flags, 16) & 1), state=tracestate)
+
+
+def generate_id(bits: int) -> str:
+    """Возвращает случайный ненулевой идентификатор в hex записи.
+
+    Args:
+        bits (int): Размер идентификатора в битах.
+
+    Returns:
+        str: Идентификатор.
+    """
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+class Span:
+    """Интервал работы (спан) в пределах трассы."""
+
+    __slots__ = ("name", "kind", "context", "parent_id", "attributes", "status", "start", "end")
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        context: SpanContext,
+        parent_id: str | None,
+        attributes: dict[str, Any],
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            name (str): Имя спана.
+            kind (str): Вид спана: server, client или internal.
+            context (SpanContext): Контекст трассировки спана.
+            parent_id (str | None): Идентификатор родительского спана.
+            attributes (dict[str, Any]): Атрибуты спана.
+        """
+        self.name = name
+        self.kind = kind
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.time_ns()
+        self.end: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Возвращает спан в виде словаря для экспорта."""
+        return {
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "service": configs.SERVICE_NAME,
+            "start_time": self.start,
+            "duration_ms": round(((self.end or self.start) - self.start) / 1e6, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+# Текущий спан обрабатываемого запроса
+current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class SpanExporter(ABC):
+    """Базовый класс экспорта пачек спанов."""
+
+    @abstractmethod
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        """Экспортирует пачку спанов. Вызывается в отдельном потоке.
+
+        Args:
+            spans (list[dict[str, Any]]): Спаны в виде словарей.
+        """
+
+    def shutdown(self) -> None:
+        """Освобождает ресурсы экспорта."""
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Экспорт спанов в stdout (JSON строка на спан)."""
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        sys.stdout.write("".join(json.dumps(span, default=str) + "\n" for span in spans))
+        sys.stdout.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Экспорт спанов в файл (JSON строка на спан)."""
+
+    def __init__(self, path: str) -> None:
+        """Конструктор класса.
+
+        Args:
+            path (str): Путь к файлу.
+        """
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, spans: list[dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(span, default=str) + "\n" for span in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class BatchSpanProcessor:
+    """Накопление завершённых спанов и их периодический экспорт пачками.
+    При переполнении буфера спаны отбрасываются и подсчитываются.
+    """
+
+    def __init__(self, batch_size: int, queue_size: int, interval: float) -> None:
+        """Конструктор класса.
+
+        Args:
+            batch_size (int): Количество спанов, при котором экспорт начинается досрочно.
+            queue_size (int): Максимум спанов в буфере.
+            interval (float): Период экспорта в секундах.
+        """
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.interval = interval
+        self.exporter: SpanExporter | None = None
+
+        self.exported = 0
+        self.dropped = 0
+
+        self._buffer: list[Span] = []
+        self._ready = asyncio.Event()
+        self._export_task: asyncio.Task | None = None
+
+    def add(self, span: Span) -> None:
+        """Добавляет завершённый спан в буфер.
+
+        Args:
+            span (Span): Спан.
+        """
+        if len(self._buffer) >= self.queue_size:
+            self.dropped += 1
+            return
+
+        self._buffer.append(span)
+        if len(self._buffer) >= self.batch_size:
+            self._ready.set()
+
+    async def startup(self, exporter: SpanExporter) -> None:
+        """Запускает периодический экспорт.
+
+        Args:
+            exporter (SpanExporter): Способ экспорта спанов.
+        """
+        self.exporter = exporter
+        self._export_task = asyncio.create_task(self._export_periodically())
+
+    async def shutdown(self) -> None:
+        """Останавливает периодический экспорт, экспортируя оставшиеся спаны."""
+        if self._export_task is None:
+            return
+
+        self._export_task.cancel()
+        self._export_task = None
+
+        await self.flush()
+        self.exporter.shutdown()
+        self.exporter = None
+
+    async def flush(self) -> None:
+        """Экспортирует накопленные спаны."""
+        batch, self._buffer = self._buffer, []
+        self._ready.clear()
+
+        if not batch or self.exporter is None:
+            return
+
+        try:
+            await asyncio.to_thread(self.exporter.export, [span.to_dict() for span in batch])
+            self.exported += len(batch)
+
+        except Exception as error:
+            logger.error(f"Failed to export {len(batch)} spans: {error}")
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает статистику экспорта.
+
+        Returns:
+            dict[str, int]: Экспортированные, отброшенные и ожидающие спаны.
+        """
+        return {"exported": self.exported, "dropped": self.dropped, "queued": len(self._buffer)}
+
+    async def _export_periodically(self) -> None:
+        """Фоновая задача периодического экспорта."""
+        while True:
+            try:
+                async with asyncio.timeout(self.interval):
+                    await self._ready.wait()
+            except TimeoutError:
+                pass
+
+            await self.flush()
+
+
+class Tracer:
+    """Создание спанов и их передача на экспорт.
+
+    Контекст трассировки создаётся всегда, чтобы передавать его сервисам
+    и связывать логи, а спаны записываются только при включённой трассировке
+    и попадании трассы в выборку.
+    """
+
+    def __init__(self) -> None:
+        """Конструктор класса."""
+        self.processor = BatchSpanProcessor(
+            batch_size=configs.tracing.BATCH_SIZE,
+            queue_size=configs.tracing.QUEUE_SIZE,
+            interval=configs.tracing.EXPORT_INTERVAL,
+        )
+
+    async def startup(self) -> None:
+        """Запускает экспорт спанов согласно конфигурации."""
+        if not configs.tracing.ENABLE:
+            return
+
+        exporter: SpanExporter = ConsoleSpanExporter()
+        if configs.tracing.EXPORTER == "file":
+            exporter = FileSpanExporter(configs.tracing.FILE_PATH)
+
+        await self.processor.startup(exporter)
+
+    async def shutdown(self) -> None:
+        """Останавливает экспорт спанов."""
+        await self.processor.shutdown()
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: dict[str, Any] | None = None,
+        parent: SpanContext | None = None,
+    ) -> Iterator[Span]:
+        """Контекстный менеджер спана, который становится текущим на время выполнения.
+
+        Args:
+            name (str): Имя спана.
+            kind (str, optional): Вид спана. Defaults to "internal".
+            attributes (dict[str, Any] | None, optional): Атрибуты спана. Defaults to None.
+            parent (SpanContext | None, optional): Контекст вызывающей стороны.
+                По умолчанию родителем становится текущий спан.
+
+        Yields:
+            Iterator[Span]: Спан.
+        """
+        if parent is None:
+            parent_span = current_span.get()
+            parent = parent_span.context if parent_span is not None else None
+
+        if parent is None:
+            context = SpanContext(
+                generate_id(128),
+                generate_id(64),
+                sampled=random.random() < configs.tracing.SAMPLE_RATE,
+            )
+        else:
+            context = SpanContext(parent.trace_id, generate_id(64), parent.sampled, parent.state)
+
+        span = Span(
+            name,
+            kind,
+            context,
+            parent_id=parent.span_id if parent is not None else None,
+            attributes=attributes or {},
+        )
+        token = current_span.set(span)
+
+        try:
+            yield span
+
+        except BaseException as error:
+            span.status = "error"
+            span.attributes["error"] = type(error).__name__
+            raise
+
+        finally:
+            current_span.reset(token)
+            span.end = time.time_ns()
+
+            if configs.tracing.ENABLE and context.sampled:
+                self.processor.add(span)
+
+
+class TracingTransport(AsyncBaseTransport):
+    """Транспорт httpx, создающий спан для каждого обращения к сервису
+    и передающий сервису контекст трассировки в заголовке traceparent.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, service: ServiceConfiguration) -> None:
+        """Конструктор класса.
+
+        Args:
+            transport (AsyncBaseTransport): Нижележащий транспорт.
+            service (ServiceConfiguration): Конфигурация сервиса.
+        """
+        self._transport = transport
+        self._service = service.NAME
+
+    async def handle_async_request(self, request: Request) -> Response:
+        attributes = {
+            "peer.service": self._service,
+            "http.method": request.method,
+            "http.url": str(request.url),
+        }
+
+        with tracer.start_span(
+            f"{request.method} {self._service}", kind="client", attributes=attributes
+        ) as span:
+            request.headers[TRACEPARENT_HEADER] = span.context.traceparent
+            if span.context.state:
+                request.headers[TRACESTATE_HEADER] = span.context.state
+
+            response = await self._transport.handle_async_request(request)
+
+            span.attributes["http.status_code"] = response.status_code
+            if response.status_code >= 500:
+                span.status = "error"
+
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+tracer = Tracer()
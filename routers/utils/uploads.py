@@ -0,0 +1,259 @@
+from typing import Any, AsyncGenerator, AsyncIterator, Callable
+
+from fastapi import HTTPException, Request, status
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from configs import configs
+
+FieldParser = Callable[[str], Any]
+
+
+class MultipartUpload:
+    """Потоковая пересылка multipart/form-data запроса клиента в связанный сервис.
+
+    Тело запроса разбирается по мере поступления и сразу же собирается заново
+    с той же границей частей: файл передаётся дальше по частям, не сохраняясь
+    на шлюзе, текстовые поля проверяются, а неизвестные поля отбрасываются.
+    Скорость чтения запроса клиента ограничена скоростью отправки в сервис.
+
+    Текстовые поля должны предшествовать файлу: метод prepare читает запрос до начала
+    файла и проверяет поля и тип файла до обращения к сервису. Во время пересылки файла
+    проверяется только его размер; ошибка сохраняется в атрибуте error.
+    """
+
+    def __init__(
+        self,
+        request: Request,
+        file_field: str,
+        fields: dict[str, FieldParser],
+        extra: dict[str, str] | None = None,
+    ) -> None:
+        """Конструктор класса. Проверяет заголовки запроса до чтения его тела.
+
+        Args:
+            request (Request): Запрос клиента.
+            file_field (str): Имя поля с файлом.
+            fields (dict[str, FieldParser]): Имена текстовых полей и функции их проверки.
+            extra (dict[str, str] | None, optional): Поля, добавляемые шлюзом. Defaults to None.
+
+        Raises:
+            HTTPException: Запрос не является multipart/form-data или слишком велик.
+        """
+        self.request = request
+        self.file_field = file_field
+        self.fields = fields
+        self.extra = extra or {}
+
+        content_type, options = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Expected multipart/form-data request body",
+            )
+
+        self.content_type = request.headers["content-type"]
+        self.boundary: bytes = options[b"boundary"]
+
+        content_length = request.headers.get("content-length", "")
+        limit = configs.uploads.MAX_SIZE + configs.uploads.FIELD_MAX_SIZE
+        if content_length.isdigit() and int(content_length) > limit:
+            raise self.__too_large()
+
+        self.error: HTTPException | None = None
+
+        self._parser = MultipartParser(
+            self.boundary,
+            callbacks={
+                "on_part_begin": self._on_part_begin,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": self._on_headers_finished,
+                "on_end": self._on_end,
+            },
+        )
+        self._chunks: AsyncIterator[bytes] = request.stream().__aiter__()
+        self._output: list[bytes] = []
+        self._received: set[str] = set()
+        self._headers: list[tuple[bytes, bytes]] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._name: str | None = None
+        self._value = b""
+        self._size = 0
+        self._file_started = False
+        self._finished = False
+
+    async def prepare(self) -> None:
+        """Читает запрос клиента до начала файла, проверяя текстовые поля и тип файла.
+        Прочитанная часть запроса передаётся в сервис первой частью тела.
+
+        Raises:
+            HTTPException: Поля формы не прошли проверку, отсутствуют или следуют
+            за файлом, файл имеет неподдерживаемый тип или запрос повреждён.
+        """
+        while not self._file_started and not self._finished:
+            if not await self._read():
+                break
+
+    async def stream(self) -> AsyncGenerator[bytes, None]:
+        """Отдаёт тело запроса к сервису по частям, продолжая чтение запроса клиента.
+
+        Raises:
+            HTTPException: Файл слишком велик или запрос повреждён.
+
+        Yields:
+            bytes: Очередная часть тела запроса к сервису.
+        """
+        try:
+            await self.prepare()
+
+            while True:
+                if self._output:
+                    yield b"".join(self._output)
+                    self._output.clear()
+
+                if not await self._read():
+                    break
+
+        except HTTPException as error:
+            self.error = error
+            raise
+
+    async def _read(self) -> bool:
+        """Разбирает очередную часть запроса клиента.
+
+        Raises:
+            HTTPException: Часть запроса не прошла проверку или запрос повреждён.
+
+        Returns:
+            bool: Остались ли непрочитанные части запроса.
+        """
+        chunk = await anext(self._chunks, None)
+        if chunk is not None:
+            self._parser.write(chunk)
+            return True
+
+        self._parser.finalize()
+
+        if not self._finished:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Malformed multipart/form-data request body",
+            )
+
+        return False
+
+    def _on_part_begin(self) -> None:
+        self._headers = []
+        self._name = None
+        self._value = b""
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers.append((self._header_field, self._header_value))
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        headers = {field.lower(): value for field, value in self._headers}
+        _, options = parse_options_header(headers.get(b"content-disposition", b""))
+        name = options.get(b"name", b"").decode("latin-1")
+
+        if name == self.file_field:
+            # Поля, следующие за файлом, можно проверить только после его пересылки
+            missing = set(self.fields) - self._received
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Form fields must precede the file: {', '.join(sorted(missing))}",
+                )
+
+            content_type, _ = parse_options_header(headers.get(b"content-type", b""))
+            allowed = configs.uploads.CONTENT_TYPES
+            if allowed and content_type.decode("latin-1").lower() not in allowed:
+                raise HTTPException(
+                    status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                    detail=f"Unsupported file type: {content_type.decode('latin-1')}",
+                )
+
+            lines = [field + b": " + value for field, value in self._headers]
+            self._output.append(self.__part_header(lines))
+            self._file_started = True
+
+        if name == self.file_field or name in self.fields:
+            self._name = name
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._name is None:
+            return
+
+        if self._name == self.file_field:
+            self._size += end - start
+            if self._size > configs.uploads.MAX_SIZE:
+                raise self.__too_large()
+
+            self._output.append(data[start:end])
+            return
+
+        self._value += data[start:end]
+        if len(self._value) > configs.uploads.FIELD_MAX_SIZE:
+            raise self.__too_large()
+
+    def _on_part_end(self) -> None:
+        if self._name is None:
+            return
+
+        if self._name == self.file_field:
+            self._output.append(b"\r\n")
+
+        else:
+            try:
+                self.fields[self._name](self._value.decode())
+
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Invalid form field: {self._name}",
+                )
+
+            self.__emit_field(self._name, self._value)
+
+        self._received.add(self._name)
+
+    def _on_end(self) -> None:
+        missing = {self.file_field, *self.fields} - self._received
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Missing form fields: {', '.join(sorted(missing))}",
+            )
+
+        for name, value in self.extra.items():
+            self.__emit_field(name, value.encode())
+
+        self._output.append(b"--" + self.boundary + b"--\r\n")
+        self._finished = True
+
+    def __emit_field(self, name: str, value: bytes) -> None:
+        """Добавляет в тело запроса к сервису текстовое поле."""
+        header = f'Content-Disposition: form-data; name="{name}"'.encode()
+        self._output.append(self.__part_header([header]) + value + b"\r\n")
+
+    def __part_header(self, lines: list[bytes]) -> bytes:
+        """Собирает границу и заголовки части тела запроса."""
+        return b"--" + self.boundary + b"\r\n" + b"\r\n".join(lines) + b"\r\n\r\n"
+
+    @staticmethod
+    def __too_large() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Upload exceeds {configs.uploads.MAX_SIZE} bytes",
+        )
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class RequestPhaseResponse(BaseModel):
+    """Длительность одной фазы обработки запроса."""
+
+    name: str = Field(description="Имя фазы", examples=["auth", "upstream", "serialize"])
+    desc: str | None = Field(description="Описание фазы (например, имя сервиса)", default=None)
+    duration_ms: float = Field(description="Длительность в миллисекундах", examples=[12.5])
+
+
+class SlowRequestResponse(BaseModel):
+    """Запрос, обработка которого превысила порог медленных запросов."""
+
+    timestamp: datetime = Field(description="Время завершения обработки запроса")
+    method: str = Field(description="HTTP метод", examples=["GET"])
+    path: str = Field(description="Путь запроса", examples=["/texts/"])
+    route: str | None = Field(description="Шаблон пути роута", examples=["/texts/{uuid}"])
+    status_code: int = Field(description="Код статуса ответа", examples=[200])
+    duration_ms: float = Field(description="Общая длительность в миллисекундах", examples=[1520.3])
+    trace_id: str | None = Field(description="Идентификатор трассы запроса")
+    phases: list[RequestPhaseResponse] = Field(description="Длительности фаз обработки")
+
+
+class ClearSlowRequestsResponse(BaseModel):
+    """Результат очистки журнала медленных запросов."""
+
+    removed: int = Field(description="Количество удалённых запросов", examples=[42])
+
+
+class MemoryStatResponse(BaseModel):
+    """Изменение выделенной памяти в одном месте выделения."""
+
+    traceback: list[str] = Field(
+        description="Стек выделения (файл:строка)", examples=[["routers/utils/caching.py:42"]]
+    )
+    size: int = Field(description="Выделено байт в конце интервала", examples=[524288])
+    size_diff: int = Field(description="Прирост выделенных байт за интервал", examples=[131072])
+    count: int = Field(description="Количество блоков в конце интервала", examples=[1024])
+    count_diff: int = Field(description="Прирост количества блоков за интервал", examples=[256])
+
+
+class MemoryProfileResponse(BaseModel):
+    """Результат сравнения снимков выделений памяти."""
+
+    duration: float = Field(description="Длительность профилирования в секундах", examples=[30.0])
+    traced_memory: int = Field(description="Отслеживаемая память в конце интервала (байт)")
+    traced_memory_peak: int = Field(description="Пиковая отслеживаемая память (байт)")
+    stats: list[MemoryStatResponse] = Field(description="Места выделения по убыванию прироста")
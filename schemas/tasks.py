@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import TypedDict
+from typing import Any, TypedDict
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -28,6 +28,13 @@ class Status(Enum):
     UNKNOWN = "unknown"
 
 
+class StreamAction(Enum):
+    """Перечисление действий с подписками на события задач."""
+
+    SUBSCRIBE = "subscribe"
+    UNSUBSCRIBE = "unsubscribe"
+
+
 class PhoneticMistake(TypedDict):
     """Типизированный словарь для описания фонетической ошибки пользователя."""
 
@@ -97,3 +104,50 @@ class DetailTaskResponse(BaseSchema):
         description="Ошибки произношения", examples=MISTAKES_EXAMPLES
     )
     comment: str | None = Field(description="Комментарий к задаче", examples=COMMENTS_EXAMPLES)
+
+
+class TasksStatusRequest(BaseSchema):
+    """Данные, необходимые для получения статусов нескольких задач."""
+
+    ids: list[UUID] = Field(
+        description="Идентификаторы задач", min_length=1, examples=[ID_EXAMPLES]
+    )
+
+
+class TaskStatusResponse(BaseSchema):
+    """Краткая информация о состоянии задачи."""
+
+    status: Status = Field(description="Статуст выполнения", examples=STATUS_EXAMPLES)
+    accuracy: float | None = Field(
+        description="Точность произношения", ge=0, le=100, examples=ACCURACY_EXAMPLES
+    )
+
+
+class TasksStatusResponse(BaseSchema):
+    """Данные, отправляемые в ответ на получение статусов нескольких задач."""
+
+    items: dict[UUID, TaskStatusResponse] = Field(description="Состояния задач по идентификаторам")
+    missing: list[UUID] = Field(description="Задачи, которые не найдены или недоступны")
+
+
+class TaskStreamRequest(BaseSchema):
+    """Сообщение клиента для управления подписками на события задач."""
+
+    action: StreamAction = Field(description="Действие с подписками")
+    task_ids: list[UUID] = Field(description="Идентификаторы задач", examples=[ID_EXAMPLES])
+    last_event_ids: dict[UUID, str] = Field(
+        description="ID последних полученных событий по задачам", default={}
+    )
+
+
+class TaskStreamEvent(BaseSchema):
+    """Событие задачи, отправляемое клиенту по мультиплексированному потоку."""
+
+    task_id: UUID | None = Field(description="Идентификатор задачи", examples=ID_EXAMPLES)
+    id: str | None = Field(description="Идентификатор события", default=None)
+    status: Status | None = Field(
+        description="Статуст выполнения", examples=STATUS_EXAMPLES, default=None
+    )
+    data: dict[str, Any] | None = Field(description="Данные события", default=None)
+    error: str | None = Field(description="Описание ошибки", default=None)
+    closed: bool = Field(description="Завершён ли поток событий задачи", default=False)
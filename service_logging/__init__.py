@@ -1,5 +1,5 @@
-from .setup import setup_logger
+from .setup import log_sinks, setup_logger
 
 logger = setup_logger()
 
-__all__ = ("logger",)
+__all__ = ("logger", "log_sinks")
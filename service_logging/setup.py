@@ -8,6 +8,11 @@ from loguru import logger
 
 from configs import configs
 
+from .sinks import GELFWriter, LogSampler, QueueSink, StreamWriter
+
+# Неблокирующие sink асинхронного режима логирования
+log_sinks: dict[str, QueueSink] = {}
+
 
 def loguru_formatter(record: loguru.Record) -> str:
     """Возвращает строку формата логирования для loguru.
@@ -36,36 +41,79 @@ def loguru_formatter(record: loguru.Record) -> str:
     )
 
 
+def create_gelf_handler() -> graypy.handler.BaseGELFHandler:
+    """Создаёт GELF хендлер graypy согласно протоколу из конфигурации проекта.
+
+    Returns:
+        graypy.handler.BaseGELFHandler: GELF хендлер (UDP или TCP).
+    """
+    if configs.graylog.PROTOCOL.lower() == "tcp":
+        return graypy.GELFTCPHandler(configs.graylog.HOST, configs.graylog.PORT)
+
+    return graypy.GELFUDPHandler(configs.graylog.HOST, configs.graylog.PORT)
+
+
+def create_queue_sink(name: str, writer: StreamWriter | GELFWriter) -> QueueSink:
+    """Создаёт неблокирующий sink и регистрирует его для сбора статистики.
+
+    Args:
+        name (str): Имя sink.
+        writer (StreamWriter | GELFWriter): Получатель пачек записей.
+
+    Returns:
+        QueueSink: Sink с очередью и фоновым потоком записи.
+    """
+    sink = log_sinks[name] = QueueSink(
+        name,
+        writer,
+        queue_size=configs.logs.QUEUE_SIZE,
+        batch_size=configs.logs.BATCH_SIZE,
+        flush_interval=configs.logs.FLUSH_INTERVAL,
+    )
+    return sink
+
+
 def setup_logger() -> loguru.Logger:
     """Функция инициализации кастомного логера loguru.
 
-    В процессе инициализации устанавливается хендлер stdout,
-    с уровнем DEBUG и кастомным оформлением формата лога.
+    В процессе инициализации устанавливается хендлер stdout
+    с уровнем из конфигурации и кастомным оформлением формата лога.
 
     Дополнительно, если в конфигурации проекта установлена
     переменная GRAYLOG_ENABLE, подключается GELF хендлер
     для оправки логов в Graylog.
+
+    В асинхронном режиме записи помещаются в очереди и выводятся пачками
+    фоновыми потоками. Для всех хендлеров применяется выборка записей.
     """
     logger.remove()
 
+    sampler = LogSampler(configs.logs.LEVEL_SAMPLE_RATES, configs.logs.ROUTE_SAMPLE_RATES)
+
+    stdout_sink = sys.stdout
+    if configs.logs.ASYNC_MODE:
+        stdout_sink = create_queue_sink("stdout", StreamWriter(sys.stdout))
+
     logger.add(
-        sink=sys.stdout,  # ?
+        sink=stdout_sink,
         format=loguru_formatter,
-        level="DEBUG",
+        filter=sampler,
+        level=configs.logs.LEVEL,
         colorize=True,
         backtrace=True,
         diagnose=True,
     )
 
     if configs.graylog.ENABLE:
-        gelf_handler = graypy.GELFUDPHandler(
-            configs.graylog.HOST,
-            configs.graylog.PORT,
-        )
+        gelf_sink = gelf_handler = create_gelf_handler()
+        if configs.logs.ASYNC_MODE:
+            gelf_sink = create_queue_sink("graylog", GELFWriter(gelf_handler))
+
         logger.add(
-            sink=gelf_handler,
+            sink=gelf_sink,
             format=loguru_formatter,
-            level="DEBUG",
+            filter=sampler,
+            level=configs.logs.LEVEL,
             backtrace=True,
             diagnose=True,
         )
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import logging
+import queue
+import random
+import sys
+import threading
+from typing import TextIO
+
+import loguru
+from graypy.handler import BaseGELFHandler, GELFTCPHandler
+
+# Записи с этим уровнем и выше не отбрасываются выборкой
+SAMPLING_MAX_LEVEL = logging.WARNING
+
+
+class LogSampler:
+    """Фильтр loguru, пропускающий заданную долю записей по уровню и роуту.
+
+    Решение принимается по идентификатору запроса (request_hash), поэтому
+    записи одного запроса клиента сохраняются или отбрасываются вместе.
+    Предупреждения и ошибки сохраняются всегда.
+    """
+
+    def __init__(self, level_rates: dict[str, float], route_rates: dict[str, float]) -> None:
+        """Конструктор класса.
+
+        Args:
+            level_rates (dict[str, float]): Доли сохраняемых записей по уровням.
+            route_rates (dict[str, float]): Доли сохраняемых записей по префиксам путей.
+        """
+        self._level_rates = {level.upper(): rate for level, rate in level_rates.items()}
+        self._route_rates = sorted(route_rates.items(), key=lambda item: -len(item[0]))
+
+    def __call__(self, record: loguru.Record) -> bool:
+        if record["level"].no >= SAMPLING_MAX_LEVEL:
+            return True
+
+        rate = self._level_rates.get(record["level"].name, 1.0)
+
+        path = record["extra"].get("request_path")
+        if path is not None:
+            for prefix, route_rate in self._route_rates:
+                if path.startswith(prefix):
+                    rate *= route_rate
+                    break
+
+        if rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        request_hash = record["extra"].get("request_hash")
+        if request_hash is None:
+            return random.random() < rate
+
+        return int(request_hash, 16) / 16 ** len(request_hash) < rate
+
+
+class StreamWriter:
+    """Запись пачки логов в текстовый поток одной операцией."""
+
+    def __init__(self, stream: TextIO) -> None:
+        """Конструктор класса.
+
+        Args:
+            stream (TextIO): Текстовый поток (например, stdout).
+        """
+        self._stream = stream
+
+    def write_batch(self, batch: list[loguru.Message]) -> None:
+        """Записывает пачку отформатированных записей.
+
+        Args:
+            batch (list[loguru.Message]): Записи лога.
+        """
+        self._stream.write("".join(batch))
+        self._stream.flush()
+
+    def close(self) -> None:
+        """Сбрасывает буфер потока."""
+        self._stream.flush()
+
+
+class GELFWriter:
+    """Отправка пачки логов в Graylog через GELF хендлер graypy.
+
+    По UDP каждое сообщение сжимается и при необходимости разбивается
+    на фрагменты (chunking), по TCP пачка сообщений отправляется одним вызовом.
+    """
+
+    def __init__(self, handler: BaseGELFHandler) -> None:
+        """Конструктор класса.
+
+        Args:
+            handler (BaseGELFHandler): GELF хендлер graypy.
+        """
+        self._handler = handler
+
+    def write_batch(self, batch: list[loguru.Message]) -> None:
+        """Отправляет пачку записей.
+
+        Args:
+            batch (list[loguru.Message]): Записи лога.
+        """
+        packets = [self._handler.makePickle(self._make_record(message)) for message in batch]
+
+        if isinstance(self._handler, GELFTCPHandler):
+            self._handler.send(b"".join(packets))
+            return
+
+        for packet in packets:
+            self._handler.send(packet)
+
+    def close(self) -> None:
+        """Закрывает соединение хендлера."""
+        self._handler.close()
+
+    @staticmethod
+    def _make_record(message: loguru.Message) -> logging.LogRecord:
+        """Преобразует запись loguru в запись стандартного logging."""
+        raw_record = message.record
+        exception = raw_record["exception"]
+
+        record = logging.getLogger().makeRecord(
+            raw_record["name"],
+            raw_record["level"].no,
+            raw_record["file"].path,
+            raw_record["line"],
+            str(message),
+            (),
+            (exception.type, exception.value, exception.traceback) if exception else None,
+            raw_record["function"],
+            {"extra": raw_record["extra"]},
+        )
+        if exception:
+            record.exc_text = "\n"
+        record.levelname = raw_record["level"].name
+
+        return record
+
+
+class QueueSink:
+    """Неблокирующий sink loguru с очередью и фоновым потоком записи.
+
+    Запись лога только помещается в ограниченную очередь, а вывод выполняется
+    пачками в отдельном потоке, поэтому логирование не блокирует цикл событий.
+    При переполнении очереди записи отбрасываются и подсчитываются.
+
+    Фильтрация и форматирование записи выполняются loguru в вызывающем потоке
+    до передачи в sink, поэтому в фоновый поток выносится только вывод
+    (и сборка GELF сообщений).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        writer: StreamWriter | GELFWriter,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+    ) -> None:
+        """Конструктор класса.
+
+        Args:
+            name (str): Имя sink.
+            writer (StreamWriter | GELFWriter): Получатель пачек записей.
+            queue_size (int): Максимум записей в очереди.
+            batch_size (int): Максимум записей в одной пачке.
+            flush_interval (float): Максимальная задержка записи в секундах.
+        """
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+
+        self._writer = writer
+        self._queue: queue.Queue[loguru.Message | None] = queue.Queue(maxsize=queue_size)
+        self._reported_drops = 0
+        self._thread = threading.Thread(target=self._run, name=f"log-{name}", daemon=True)
+        self._thread.start()
+
+    def write(self, message: loguru.Message) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self) -> None:
+        """Записывает оставшиеся в очереди записи и останавливает поток."""
+        self._queue.put(None)
+        self._thread.join(timeout=5.0)
+
+    def stats(self) -> dict[str, int]:
+        """Возвращает статистику sink.
+
+        Returns:
+            dict[str, int]: Записанные, отброшенные записи, ошибки и размер очереди.
+        """
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "queued": self._queue.qsize(),
+        }
+
+    def _run(self) -> None:
+        """Фоновый поток записи пачек."""
+        stopped = False
+
+        while not stopped:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in batch:
+                stopped = True
+                batch = [message for message in batch if message is not None]
+
+            self._write(batch)
+
+        self._writer.close()
+
+    def _write(self, batch: list[loguru.Message]) -> None:
+        """Передаёт пачку получателю, сообщая об отброшенных записях."""
+        try:
+            if batch:
+                self._writer.write_batch(batch)
+                self.written += len(batch)
+
+        except Exception as error:
+            self.errors += 1
+            sys.stderr.write(f"Log sink {self.name} failed: {error}\n")
+
+        dropped = self.dropped
+        if dropped > self._reported_drops:
+            sys.stderr.write(
+                f"Log sink {self.name} dropped {dropped - self._reported_drops} messages.\n"
+            )
+            self._reported_drops = dropped
@@ -0,0 +1,79 @@
+import os
+
+for service in ("AUTH", "TEXTS", "MANAGER", "EXERCISES"):
+    os.environ.setdefault(f"GATEWAY_SERVICE_{service}_HOST", "127.0.0.1")
+    os.environ.setdefault(f"GATEWAY_SERVICE_{service}_PORT", "9000")
+os.environ.setdefault("GATEWAY_PROBES_ENABLE", "false")
+os.environ.setdefault("GATEWAY_LOGS_ASYNC_MODE", "false")
+os.environ.setdefault("GATEWAY_LOGS_LEVEL", "WARNING")
+
+from typing import Callable
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from schemas.auth import AuthorizedUser
+
+# Обработчик запросов к фиктивному сервису
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+class FakeClock:
+    """Управляемые часы вместо модуля time (time.monotonic и time.time)."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+def user() -> AuthorizedUser:
+    return AuthorizedUser(id=uuid4(), name="alice", is_admin=False)
+
+
+@pytest.fixture
+def upstream(monkeypatch: pytest.MonkeyPatch) -> dict[str, Handler]:
+    """Подменяет клиенты сервисов клиентами с фиктивными обработчиками по именам сервисов."""
+    from routers.utils.clients import service_clients
+
+    handlers: dict[str, Handler] = {}
+
+    def get_client(service: ServiceConfiguration) -> httpx.AsyncClient:
+        transport = httpx.MockTransport(lambda request: handlers[service.NAME](request))
+        return httpx.AsyncClient(base_url=service.URL, transport=transport)
+
+    monkeypatch.setattr(service_clients, "get", get_client)
+    monkeypatch.setattr(configs.cache, "ENABLE", False)
+    return handlers
+
+
+@pytest.fixture
+async def gateway_client(user: AuthorizedUser, upstream: dict[str, Handler]):
+    """Клиент шлюза, в котором все роуты считают пользователя авторизованным."""
+    from app import gateway
+    from routers import exercises, tasks, texts
+
+    for module in (exercises, tasks, texts):
+        gateway.dependency_overrides[module.protected] = lambda: user
+
+    transport = httpx.ASGITransport(app=gateway)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        yield client
+
+    gateway.dependency_overrides.clear()
@@ -0,0 +1,143 @@
+import asyncio
+import heapq
+import random
+
+import pytest
+
+from routers.utils import admission
+from routers.utils.admission import AdaptiveLimiter
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(admission, "time", clock)
+    return clock
+
+
+def create_limiter(**overrides) -> AdaptiveLimiter:
+    settings = {
+        "name": "default",
+        "initial_limit": 50,
+        "min_limit": 5,
+        "max_limit": 500,
+        "tolerance": 2.0,
+        "backoff_ratio": 0.9,
+        "window": 0.1,
+        "window_samples": 20,
+        "queue_size": 100,
+        "queue_timeout": 0.5,
+    }
+    return AdaptiveLimiter(**(settings | overrides))
+
+
+async def simulate(limiter, clock, rate: float, duration: float, get_latency) -> None:
+    """Подаёт запросы с постоянной частотой, освобождая места по завершении запросов.
+    Запросы сверх лимита отклоняются сразу, если очередь ожидания отключена.
+    """
+    finishing: list[tuple[float, float]] = []
+    started_at = clock.now
+
+    for number in range(int(rate * duration)):
+        arrival = started_at + number / rate
+        while finishing and finishing[0][0] <= arrival:
+            clock.now, latency = heapq.heappop(finishing)
+            limiter.release(latency)
+
+        clock.now = arrival
+        if not await limiter.acquire():
+            continue
+
+        latency = get_latency()
+        heapq.heappush(finishing, (arrival + latency, latency))
+
+    while finishing:
+        clock.now, latency = heapq.heappop(finishing)
+        limiter.release(latency)
+
+
+async def test_mixed_latencies_keep_limit(clock: FakeClock) -> None:
+    limiter = create_limiter()
+    rng = random.Random(1)
+
+    await simulate(limiter, clock, 100, 30, lambda: 0.002 if rng.random() < 0.7 else 0.05)
+
+    assert limiter.rejected == 0
+    assert limiter.decreases == 0
+    assert limiter.limit >= 50
+
+
+async def test_latency_growth_decreases_limit(clock: FakeClock) -> None:
+    limiter = create_limiter(queue_size=0)
+    rng = random.Random(2)
+
+    await simulate(limiter, clock, 100, 10, lambda: rng.uniform(0.01, 0.03))
+    await simulate(limiter, clock, 100, 5, lambda: rng.uniform(0.08, 0.12))
+
+    assert limiter.decreases > 5
+    assert limiter.limit < 35
+
+
+async def test_utilized_limit_grows(clock: FakeClock) -> None:
+    limiter = create_limiter(initial_limit=10)
+
+    # 400 запросов в секунду по 20 мс - около 8 одновременных запросов
+    await simulate(limiter, clock, 400, 10, lambda: 0.02)
+
+    assert limiter.decreases == 0
+    assert limiter.limit > 10
+
+
+async def test_timeouts_decrease_once_per_window(clock: FakeClock) -> None:
+    limiter = create_limiter()
+
+    for _ in range(10):
+        assert await limiter.acquire()
+    for _ in range(10):
+        limiter.release(0.5, overloaded=True)
+
+    assert limiter.decreases == 1
+    assert limiter.limit == pytest.approx(45)
+
+    clock.now += 1.0
+    assert await limiter.acquire()
+    limiter.release(0.5, overloaded=True)
+
+    assert limiter.decreases == 2
+
+
+async def test_queue_overflow_and_handoff() -> None:
+    limiter = create_limiter(initial_limit=1, min_limit=1, queue_size=1, queue_timeout=1.0)
+
+    assert await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    assert not await limiter.acquire()
+    assert limiter.rejected == 1
+
+    limiter.release()
+    assert await waiter
+    assert limiter.inflight == 1
+
+
+async def test_queue_timeout_rejects() -> None:
+    limiter = create_limiter(initial_limit=1, min_limit=1, queue_timeout=0.01)
+
+    assert await limiter.acquire()
+    assert not await limiter.acquire()
+    assert limiter.rejected == 1
+    assert limiter.stats()["queued"] == 0
+
+
+def test_heavy_routes_match_exact_path() -> None:
+    controller = admission.AdmissionController()
+
+    assert controller.get_limiter("POST", "/tasks/").name == "heavy"
+    assert controller.get_limiter("POST", "/tasks/status:batch").name == "default"
+    assert controller.get_limiter("GET", "/tasks/").name == "default"
+    assert controller.get_limiter("POST", "/auth/login").name == "light"
+    assert controller.get_limiter("GET", "/health/ready") is None
@@ -0,0 +1,129 @@
+import httpx
+import pytest
+
+from routers.utils import balancer as balancer_module
+from routers.utils.balancer import LoadBalancer, LoadBalancingTransport
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.anyio
+
+URLS = ["http://texts:8000", "http://texts-2:8000", "http://texts-3:8000"]
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(balancer_module, "time", clock)
+    return clock
+
+
+def create_balancer(urls: list[str] = URLS) -> LoadBalancer:
+    return LoadBalancer("texts", urls=urls, eject_failures=3, eject_duration=30.0, slow_start=10.0)
+
+
+def test_less_loaded_of_two_is_chosen(clock: FakeClock) -> None:
+    balancer = create_balancer(URLS[:2])
+    busy, idle = balancer.endpoints
+    busy.outstanding = 5
+
+    assert all(balancer.choose() is idle for _ in range(20))
+
+
+def test_failing_endpoint_is_ejected_and_readmitted(clock: FakeClock) -> None:
+    balancer = create_balancer(URLS[:2])
+    failing, healthy = balancer.endpoints
+
+    for _ in range(2):
+        balancer.record(failing, success=False)
+    balancer.record(failing, success=True)
+    for _ in range(2):
+        balancer.record(failing, success=False)
+    assert not failing.is_ejected(clock.now)
+
+    balancer.record(failing, success=False)
+    assert failing.is_ejected(clock.now) and failing.ejections == 1
+    assert all(balancer.choose() is healthy for _ in range(20))
+
+    clock.now += 30.0
+    assert not failing.is_ejected(clock.now)
+
+    # После разогрева вернувшийся экземпляр снова получает запросы наравне с остальными
+    clock.now += balancer.slow_start
+    healthy.outstanding = 1
+    assert balancer.choose() is failing
+
+
+def test_readmitted_endpoint_warms_up(clock: FakeClock) -> None:
+    balancer = create_balancer(URLS[:2])
+    recovered, steady = balancer.endpoints
+    for _ in range(3):
+        balancer.record(recovered, success=False)
+
+    clock.now += 30.0 + 5.0
+    assert recovered.get_weight(clock.now, balancer.slow_start) == pytest.approx(0.5)
+
+    # При равной нагрузке разогревающийся экземпляр получает меньше запросов
+    assert all(balancer.choose() is steady for _ in range(20))
+
+    clock.now += 5.0
+    assert recovered.get_weight(clock.now, balancer.slow_start) == 1.0
+    assert recovered.recovered_at is None
+
+
+async def test_each_attempt_gets_its_own_request(clock: FakeClock) -> None:
+    balancer = create_balancer()
+    hosts: list[str] = []
+
+    async def body():
+        yield b"ok"
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.headers["Host"])
+        assert request.url.host == request.headers["Host"].split(":")[0]
+        return httpx.Response(200, content=body())
+
+    transport = LoadBalancingTransport(httpx.MockTransport(handle), balancer)
+    request = httpx.Request("GET", "http://texts:8000/items", headers={"Host": "texts:8000"})
+
+    # Повтор и дублирование одного запроса не видят экземпляр предыдущей попытки
+    balancer.endpoints[0].outstanding = 10
+    first = await transport.handle_async_request(request)
+    second = await transport.handle_async_request(request)
+
+    assert str(request.url) == "http://texts:8000/items"
+    assert request.headers["Host"] == "texts:8000"
+    assert len(hosts) == 2 and "texts:8000" not in hosts
+    assert sum(endpoint.outstanding for endpoint in balancer.endpoints[1:]) == 2
+
+    await first.aclose()
+    await second.aclose()
+    assert sum(endpoint.outstanding for endpoint in balancer.endpoints[1:]) == 0
+
+
+async def test_other_hosts_are_not_balanced(clock: FakeClock) -> None:
+    balancer = create_balancer()
+    urls: list[str] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        urls.append(str(request.url))
+        return httpx.Response(200)
+
+    transport = LoadBalancingTransport(httpx.MockTransport(handle), balancer)
+    await transport.handle_async_request(httpx.Request("GET", "https://idp.example/jwks"))
+
+    assert urls == ["https://idp.example/jwks"]
+    assert all(endpoint.outstanding == 0 for endpoint in balancer.endpoints)
+
+
+async def test_failed_attempt_releases_endpoint(clock: FakeClock) -> None:
+    balancer = create_balancer(URLS[:1])
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    transport = LoadBalancingTransport(httpx.MockTransport(handle), balancer)
+    with pytest.raises(httpx.ConnectError):
+        await transport.handle_async_request(httpx.Request("GET", "http://texts:8000/items"))
+
+    assert balancer.endpoints[0].outstanding == 0
+    assert balancer.endpoints[0].failures == 1
@@ -0,0 +1,138 @@
+import httpx
+import pytest
+
+from routers.utils import breaker as breaker_module
+from routers.utils.breaker import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    CircuitOpenError,
+)
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(breaker_module, "time", clock)
+    return clock
+
+
+def create_breaker(half_open_requests: int = 1) -> CircuitBreaker:
+    return CircuitBreaker(
+        "texts",
+        failure_rate=0.5,
+        min_requests=4,
+        window=10.0,
+        cooldown=5.0,
+        half_open_requests=half_open_requests,
+    )
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    for success in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(success)
+
+
+def test_trips_on_failure_rate(clock: FakeClock) -> None:
+    breaker = create_breaker()
+
+    # До минимума запросов в окне доля неудач не оценивается
+    for _ in range(3):
+        breaker.allow()
+        breaker.record(False)
+    assert breaker.state is BreakerState.CLOSED
+
+    breaker.allow()
+    breaker.record(True)
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.opened == 1
+
+
+def test_old_outcomes_leave_the_window(clock: FakeClock) -> None:
+    breaker = create_breaker()
+    for _ in range(3):
+        breaker.allow()
+        breaker.record(False)
+
+    clock.now += 11.0
+    for _ in range(2):
+        breaker.allow()
+        breaker.record(True)
+    breaker.allow()
+    breaker.record(False)
+
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_rejects_while_open(clock: FakeClock) -> None:
+    breaker = create_breaker()
+    trip(breaker)
+
+    clock.now += 2.0
+    assert not breaker.allow() and not breaker.allow()
+    assert breaker.rejected == 2
+    assert breaker.retry_after() == pytest.approx(3.0)
+
+
+def test_half_open_admits_limited_probes(clock: FakeClock) -> None:
+    breaker = create_breaker()
+    trip(breaker)
+    clock.now += 5.0
+
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # Отменённый пробный запрос освобождает место для следующего
+    breaker.release()
+    assert breaker.allow()
+
+
+def test_probe_success_closes(clock: FakeClock) -> None:
+    breaker = create_breaker(half_open_requests=2)
+    trip(breaker)
+    clock.now += 5.0
+
+    assert breaker.allow() and breaker.allow()
+    breaker.record(True)
+    assert breaker.state is BreakerState.HALF_OPEN
+
+    breaker.record(True)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_probe_failure_reopens(clock: FakeClock) -> None:
+    breaker = create_breaker()
+    trip(breaker)
+    clock.now += 5.0
+
+    assert breaker.allow()
+    breaker.record(False)
+
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.opened == 2
+    assert not breaker.allow()
+
+
+async def test_transport_rejects_without_calling_service(clock: FakeClock) -> None:
+    breaker = create_breaker()
+    calls: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    transport = CircuitBreakerTransport(httpx.MockTransport(handle), breaker)
+    for _ in range(4):
+        await transport.handle_async_request(httpx.Request("GET", "http://texts/"))
+
+    with pytest.raises(CircuitOpenError) as error:
+        await transport.handle_async_request(httpx.Request("GET", "http://texts/"))
+
+    assert len(calls) == 4
+    assert error.value.get_retry_after() == "5"
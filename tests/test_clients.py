@@ -0,0 +1,131 @@
+import asyncio
+
+import httpx
+import pytest
+
+from configs import configs
+from routers.utils.clients import ServiceClients
+from routers.utils.metrics import MetricsTransport
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_outstanding_requests_are_counted_until_body_is_closed() -> None:
+    released = asyncio.Event()
+
+    async def body():
+        yield b"done"
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        await released.wait()
+        return httpx.Response(200, content=body())
+
+    transport = MetricsTransport(httpx.MockTransport(handle), configs.services.manager)
+    async with httpx.AsyncClient(transport=transport, base_url="http://manager") as client:
+        request = asyncio.create_task(client.get("/"))
+        await asyncio.sleep(0)
+        assert transport.outstanding == 1
+
+        released.set()
+        async with client.stream("GET", "/") as response:
+            assert transport.outstanding == 2
+            await response.aread()
+
+        await request
+        assert transport.outstanding == 0
+
+
+async def test_failed_requests_are_not_outstanding() -> None:
+    def handle(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    transport = MetricsTransport(httpx.MockTransport(handle), configs.services.manager)
+    async with httpx.AsyncClient(transport=transport, base_url="http://manager") as client:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/")
+
+    assert transport.outstanding == 0
+
+
+async def test_pool_stats_survive_missing_pool() -> None:
+    clients = ServiceClients()
+    service = configs.services.manager
+    clients.get(service)
+
+    stats = clients.pool_stats()[service.NAME]
+    assert stats == {
+        "connections": 0,
+        "idle": 0,
+        "outstanding": 0,
+        "queued": 0,
+        "size": service.POOL_SIZE,
+    }
+
+    # Без доступа к пулу httpx остаются счётчики транспорта метрик
+    metered, _ = clients._transports[service.NAME]
+    metered.outstanding = 3
+    clients._transports[service.NAME] = (metered, httpx.MockTransport(lambda _: None))
+
+    stats = clients.pool_stats()[service.NAME]
+    assert stats["connections"] == 0 and stats["queued"] == 3
+
+    await clients.shutdown()
+
+
+async def test_metrics_report_pool_state(gateway_client: httpx.AsyncClient) -> None:
+    response = await gateway_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert "gateway_pool_outstanding_requests" in response.text
+
+
+@pytest.fixture
+async def server():
+    """HTTP сервер с keep-alive соединениями. Возвращает порт и число принятых соединений."""
+    state = {"connections": 0}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        state["connections"] += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    state["port"] = server.sockets[0].getsockname()[1]
+    async with server:
+        yield state
+
+
+async def test_client_is_shared_between_requests() -> None:
+    clients = ServiceClients()
+    service = configs.services.texts
+
+    client = clients.get(service)
+    assert clients.get(service) is client
+    assert clients.get(configs.services.manager) is not client
+
+    await clients.shutdown()
+    assert client.is_closed
+    assert clients.get(service) is not client
+
+    await clients.shutdown()
+
+
+async def test_connection_is_reused(server: dict) -> None:
+    clients = ServiceClients()
+    service = configs.services.texts.model_copy(
+        update={"HOST": "127.0.0.1", "PORT": server["port"]}
+    )
+
+    for _ in range(3):
+        response = await clients.get(service).get("/")
+        assert response.text == "ok"
+
+    assert server["connections"] == 1
+    assert clients.pool_stats()[service.NAME]["idle"] == 1
+
+    await clients.shutdown()
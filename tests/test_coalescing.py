@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from routers.utils.coalescing import CoalescingTransport, SingleFlight
+from routers.utils.deadlines import (
+    DEADLINE_HEADER,
+    DeadlineExceeded,
+    DeadlineTransport,
+    request_deadline,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+async def stream(content: bytes):
+    """Тело ответа, которое вычитывается как у настоящего транспорта."""
+    yield content
+
+
+async def test_short_deadline_does_not_cut_coalesced_request() -> None:
+    requests: list[httpx.Request] = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, content=stream(b"shared"))
+
+    coalescing = CoalescingTransport(
+        httpx.MockTransport(handle), SingleFlight(), httpx.Timeout(5.0)
+    )
+    transport = DeadlineTransport(coalescing)
+
+    async def get(deadline: float | None) -> httpx.Response:
+        request_deadline.set(None if deadline is None else time.monotonic() + deadline)
+        async with httpx.AsyncClient(transport=transport, base_url="http://texts") as client:
+            return await client.get("/same")
+
+    hurried = asyncio.create_task(get(0.05))
+    await asyncio.sleep(0.01)
+    patient = asyncio.create_task(get(None))
+
+    with pytest.raises(DeadlineExceeded):
+        await hurried
+
+    response = await patient
+    assert response.status_code == 200 and response.content == b"shared"
+
+    # Общий запрос не получает срок и таймауты первого клиента
+    assert len(requests) == 1
+    assert DEADLINE_HEADER not in requests[0].headers
+    assert requests[0].extensions["timeout"]["read"] == 5.0
+
+
+async def test_concurrent_calls_share_one_result() -> None:
+    flight: SingleFlight[str, int] = SingleFlight()
+    released = asyncio.Event()
+    calls: list[int] = []
+
+    async def call() -> int:
+        calls.append(1)
+        await released.wait()
+        return len(calls)
+
+    waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(3)]
+    await asyncio.sleep(0)
+    released.set()
+
+    assert await asyncio.gather(*waiters) == [1, 1, 1]
+    assert flight.stats() == {"calls": 1, "collapsed": 2, "in_flight": 0}
+
+    # Завершённый вызов не переиспользуется
+    assert await flight.do("key", call) == 2
+
+
+async def test_cancelled_waiter_does_not_cancel_call() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    released = asyncio.Event()
+
+    async def call() -> str:
+        await released.wait()
+        return "done"
+
+    cancelled = asyncio.create_task(flight.do("key", call))
+    waiting = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    released.set()
+    assert await waiting == "done"
+
+
+async def test_error_is_shared_and_forgotten() -> None:
+    flight: SingleFlight[str, str] = SingleFlight()
+    released = asyncio.Event()
+
+    async def call() -> str:
+        await released.wait()
+        raise RuntimeError("boom")
+
+    waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+    released.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert [str(result) for result in results] == ["boom", "boom"]
+    assert flight.stats()["in_flight"] == 0
+
+
+async def test_only_get_requests_are_coalesced() -> None:
+    released = asyncio.Event()
+    requests: list[str] = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        await released.wait()
+        return httpx.Response(200, content=stream(b"shared"))
+
+    transport = CoalescingTransport(httpx.MockTransport(handle), SingleFlight(), httpx.Timeout(5.0))
+    async with httpx.AsyncClient(transport=transport, base_url="http://texts") as client:
+        pending = [
+            asyncio.create_task(client.request(method, "/same"))
+            for method in ("GET", "GET", "POST", "POST")
+        ]
+        await asyncio.sleep(0.01)
+        released.set()
+        responses = await asyncio.gather(*pending)
+
+    assert [response.content for response in responses] == [b"shared"] * 4
+    assert sorted(requests) == ["GET", "POST", "POST"]
@@ -0,0 +1,92 @@
+import asyncio
+from typing import Any
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from httpx import ConnectError
+
+from routers.utils.embeded import EmbeddedRegistry
+from schemas.auth import AuthorizedUser
+
+pytestmark = pytest.mark.anyio
+
+
+def create_registry() -> EmbeddedRegistry:
+    """Реестр, в котором текст не найден, упражнение доступно, а задача зависает."""
+    registry = EmbeddedRegistry()
+
+    @registry.register("text", field="text_id")
+    async def fetch_text(text_id: Any, _: AuthorizedUser) -> dict[str, Any]:
+        raise HTTPException(status_code=404, detail="Text not found")
+
+    @registry.register("exercise", field="exercise_id")
+    async def fetch_exercise(exercise_id: Any, _: AuthorizedUser) -> dict[str, Any]:
+        await asyncio.sleep(0.01)
+        return {"id": exercise_id}
+
+    @registry.register("task", field="task_id", timeout=0.01)
+    async def fetch_task(task_id: Any, _: AuthorizedUser) -> dict[str, Any]:
+        await asyncio.sleep(1)
+        return {"id": task_id}
+
+    return registry
+
+
+async def test_resolve_skips_failed_entities(user: AuthorizedUser) -> None:
+    registry = create_registry()
+    item = {"text_id": "t1", "exercise_id": "e1", "task_id": "k1"}
+
+    embedded = await registry.resolve(item, ["text", "exercise", "task"], user)
+
+    assert embedded == {"exercise": {"id": "e1"}}
+
+
+async def test_resolve_skips_transport_errors(user: AuthorizedUser) -> None:
+    registry = EmbeddedRegistry()
+
+    @registry.register("text", field="text_id")
+    async def fetch_text(text_id: Any, _: AuthorizedUser) -> dict[str, Any]:
+        raise ConnectError("Connection refused")
+
+    assert await registry.resolve({"text_id": "t1"}, ["text"], user) == {}
+
+
+async def test_resolve_many_skips_failed_entities(user: AuthorizedUser) -> None:
+    registry = create_registry()
+    items = [{"text_id": "t1", "exercise_id": "e1"}, {"exercise_id": "e2"}]
+
+    embedded = await registry.resolve_many(items, ["text", "exercise"], user)
+
+    assert embedded == {"exercise": {"e1": {"id": "e1"}, "e2": {"id": "e2"}}}
+
+
+async def test_tasks_page_survives_missing_text(gateway_client, upstream) -> None:
+    text_ids = [str(uuid4()), str(uuid4())]
+    tasks = [
+        {
+            "id": str(uuid4()),
+            "status": "completed",
+            "title": f"Task {number}",
+            "accuracy": 90.0,
+            "created_at": f"2025-01-0{number + 1}T00:00:00",
+            "text_id": text_id,
+        }
+        for number, text_id in enumerate(text_ids)
+    ]
+
+    def texts(request: httpx.Request) -> httpx.Response:
+        text_id = request.url.path.strip("/")
+        if text_id == text_ids[0]:
+            return httpx.Response(404, json={"detail": "Text not found"})
+        return httpx.Response(200, json={"id": text_id, "title": "Text"})
+
+    upstream["manager"] = lambda request: httpx.Response(200, json=tasks)
+    upstream["texts"] = texts
+
+    response = await gateway_client.get("/tasks/", params={"entities": "text"})
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 2
+    assert list(response.json()["embedded"]["text"]) == [text_ids[1]]
@@ -0,0 +1,79 @@
+import logging
+import threading
+from types import SimpleNamespace
+
+from service_logging.sinks import LogSampler, QueueSink
+
+
+def create_record(level: str, request_hash: str | None = None, path: str | None = None) -> dict:
+    extra = {}
+    if request_hash is not None:
+        extra["request_hash"] = request_hash
+    if path is not None:
+        extra["request_path"] = path
+
+    return {"level": SimpleNamespace(name=level, no=logging.getLevelName(level)), "extra": extra}
+
+
+def test_request_records_are_sampled_together() -> None:
+    sampler = LogSampler({"info": 0.5}, {})
+
+    # Решение зависит только от идентификатора запроса
+    assert sampler(create_record("INFO", "0000000001"))
+    assert sampler(create_record("DEBUG", "0000000001"))
+    assert not sampler(create_record("INFO", "ffffffffff"))
+    assert [sampler(create_record("INFO", "ffffffffff")) for _ in range(10)] == [False] * 10
+
+
+def test_route_rate_is_applied_by_longest_prefix() -> None:
+    sampler = LogSampler({}, {"/tasks": 1.0, "/tasks/stream": 0.0})
+
+    assert sampler(create_record("INFO", "0000000001", path="/tasks/"))
+    assert not sampler(create_record("INFO", "0000000001", path="/tasks/stream/1"))
+
+
+def test_warnings_are_never_sampled() -> None:
+    sampler = LogSampler({"warning": 0.0, "error": 0.0}, {"/": 0.0})
+
+    for level in ("WARNING", "ERROR", "CRITICAL"):
+        assert sampler(create_record(level, "ffffffffff", path="/tasks/"))
+    assert not sampler(create_record("INFO", "0000000001", path="/tasks/"))
+
+
+class BlockingWriter:
+    """Получатель, задерживающий первую пачку до разрешения теста."""
+
+    def __init__(self) -> None:
+        self.entered = threading.Event()
+        self.released = threading.Event()
+        self.batches: list[list[str]] = []
+        self.closed = False
+
+    def write_batch(self, batch: list[str]) -> None:
+        self.entered.set()
+        self.released.wait(timeout=5.0)
+        self.batches.append(batch)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_full_queue_drops_and_counts(capsys) -> None:
+    writer = BlockingWriter()
+    sink = QueueSink("test", writer, queue_size=1, batch_size=10, flush_interval=0.01)
+
+    sink.write("first\n")
+    assert writer.entered.wait(timeout=5.0)
+
+    sink.write("second\n")
+    sink.write("third\n")
+    sink.write("fourth\n")
+    assert sink.stats() == {"written": 0, "dropped": 2, "errors": 0, "queued": 1}
+
+    writer.released.set()
+    sink.stop()
+
+    assert writer.batches == [["first\n"], ["second\n"]]
+    assert writer.closed
+    assert sink.stats() == {"written": 2, "dropped": 2, "errors": 0, "queued": 0}
+    assert "Log sink test dropped 2 messages." in capsys.readouterr().err
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import AsyncIterator
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from routers.utils import multiplex
+from routers.utils.multiplex import TaskStreamMultiplexer
+from schemas.auth import AuthorizedUser
+from schemas.tasks import TaskStreamRequest
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeWebSocket:
+    """Соединение, сохраняющее отправленные клиенту сообщения."""
+
+    def __init__(self, messages: list[dict] = ()) -> None:
+        self.sent: list[dict] = []
+        self.closed: tuple[int, str] | None = None
+        self._messages = iter(messages)
+
+    async def receive(self) -> dict:
+        return next(self._messages, {"type": "websocket.disconnect", "code": 1000})
+
+    async def send_text(self, text: str) -> None:
+        self.sent.append(json.loads(text))
+
+    async def close(self, code: int, reason: str) -> None:
+        self.closed = (code, reason)
+
+
+async def forward(monkeypatch: pytest.MonkeyPatch, user: AuthorizedUser, error: Exception):
+    """Подписывает клиента на задачу, поток которой завершается ошибкой после первого события."""
+
+    async def subscribe(*_) -> AsyncIterator[dict]:
+        yield {"id": "1", "data": json.dumps({"status": "transcribing"})}
+        raise error
+
+    monkeypatch.setattr(multiplex.sse_hub, "subscribe", subscribe)
+
+    websocket = FakeWebSocket()
+    multiplexer = TaskStreamMultiplexer(websocket, user)
+    task_id = uuid4()
+
+    await multiplexer.subscribe(TaskStreamRequest(action="subscribe", task_ids=[task_id]))
+    await multiplexer._streams[task_id]
+
+    assert multiplexer._streams == {}
+    return websocket.sent
+
+
+async def test_unexpected_error_closes_task_stream(
+    monkeypatch: pytest.MonkeyPatch, user: AuthorizedUser
+) -> None:
+    sent = await forward(monkeypatch, user, RuntimeError("boom"))
+
+    assert [event.get("status") for event in sent] == ["transcribing", None]
+    assert sent[-1]["closed"] is True
+    assert sent[-1]["error"] == "Task stream failed"
+
+
+async def test_http_error_closes_task_stream(
+    monkeypatch: pytest.MonkeyPatch, user: AuthorizedUser
+) -> None:
+    sent = await forward(monkeypatch, user, HTTPException(status_code=404, detail="Not found"))
+
+    assert sent[-1] == {"task_id": sent[0]["task_id"], "error": "Not found", "closed": True}
+
+
+async def test_binary_message_closes_connection(
+    monkeypatch: pytest.MonkeyPatch, user: AuthorizedUser
+) -> None:
+    async def subscribe(*_) -> AsyncIterator[dict]:
+        await asyncio.Event().wait()
+        yield {}
+
+    monkeypatch.setattr(multiplex.sse_hub, "subscribe", subscribe)
+
+    request = TaskStreamRequest(action="subscribe", task_ids=[uuid4()])
+    websocket = FakeWebSocket(
+        [
+            {"type": "websocket.receive", "text": "{}"},
+            {"type": "websocket.receive", "text": request.model_dump_json()},
+            {"type": "websocket.receive", "bytes": b"\x00"},
+        ]
+    )
+    multiplexer = TaskStreamMultiplexer(websocket, user)
+
+    await multiplexer.run()
+
+    assert websocket.closed == (1003, "Only text messages are supported")
+    assert [event["task_id"] for event in websocket.sent] == [None]
+    assert multiplexer._streams == {}
@@ -0,0 +1,146 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from configs import configs
+from routers.utils import observability
+from routers.utils.admission import AdaptiveLimiter
+from routers.utils.metrics import requests_total
+from routers.utils.observability import ObservabilityMiddleware
+from routers.utils.timing import request_timings
+
+pytestmark = pytest.mark.anyio
+
+
+def create_app(released: asyncio.Event) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        assert request_timings.get() is not None
+        return {"id": item_id}
+
+    @app.get("/fail")
+    async def fail() -> dict:
+        raise RuntimeError("boom")
+
+    @app.get("/events")
+    async def events() -> StreamingResponse:
+        async def stream():
+            yield b"first\n"
+            await released.wait()
+            yield b"last\n"
+
+        return StreamingResponse(stream())
+
+    app.add_middleware(ObservabilityMiddleware)
+    return app
+
+
+@pytest.fixture
+def limiter(monkeypatch: pytest.MonkeyPatch) -> AdaptiveLimiter:
+    limiter = AdaptiveLimiter(
+        name="default",
+        initial_limit=1,
+        min_limit=1,
+        max_limit=1,
+        tolerance=2.0,
+        backoff_ratio=0.9,
+        window=0.1,
+        window_samples=20,
+        queue_size=0,
+        queue_timeout=0.1,
+    )
+    monkeypatch.setattr(configs.timing, "ENABLE", True)
+    monkeypatch.setattr(configs.timing, "HEADER_ENABLE", True)
+    monkeypatch.setattr(
+        observability.admission_controller, "get_limiter", lambda method, path: limiter
+    )
+    return limiter
+
+
+@pytest.fixture
+async def client():
+    transport = httpx.ASGITransport(app=create_app(asyncio.Event()), raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        yield client
+
+
+async def test_response_is_observed(client: httpx.AsyncClient, limiter: AdaptiveLimiter) -> None:
+    before = requests_total._values.get(("GET", "/items/{item_id}", "200"), 0)
+
+    response = await client.get("/items/1")
+
+    assert response.status_code == 200
+    assert len(response.headers["X-Trace-Id"]) == 32
+    assert "total;dur=" in response.headers["Server-Timing"]
+    assert requests_total._values[("GET", "/items/{item_id}", "200")] == before + 1
+    assert limiter.inflight == 0
+
+
+async def test_overloaded_request_is_rejected(
+    client: httpx.AsyncClient, limiter: AdaptiveLimiter
+) -> None:
+    limiter.inflight = 1
+
+    response = await client.get("/items/1")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(configs.admission.RETRY_AFTER)
+    assert "Server-Timing" in response.headers
+    assert "X-Trace-Id" not in response.headers
+    assert limiter.inflight == 1
+
+
+async def test_failed_request_is_released(
+    client: httpx.AsyncClient, limiter: AdaptiveLimiter
+) -> None:
+    before = requests_total._values.get(("GET", "/fail", "500"), 0)
+
+    response = await client.get("/fail")
+
+    assert response.status_code == 500
+    assert requests_total._values[("GET", "/fail", "500")] == before + 1
+    assert limiter.inflight == 0
+
+
+async def test_streaming_response_releases_limit_on_headers(limiter: AdaptiveLimiter) -> None:
+    released = asyncio.Event()
+    app = create_app(released)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/events",
+        "raw_path": b"/events",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"gateway")],
+        "client": ("127.0.0.1", 1),
+        "server": ("gateway", 80),
+    }
+    messages: list[dict] = []
+
+    async def receive() -> dict:
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict) -> None:
+        # Место в лимите освобождается до отправки заголовков, а тело ещё не передано
+        if message["type"] == "http.response.start":
+            assert limiter.inflight == 0
+        messages.append(message)
+
+        if message.get("body") == b"first\n":
+            released.set()
+
+    await asyncio.wait_for(app(scope, receive, send), timeout=1)
+
+    assert [message["type"] for message in messages][0] == "http.response.start"
+    assert b"".join(message.get("body", b"") for message in messages) == b"first\nlast\n"
+    assert limiter.inflight == 0
@@ -0,0 +1,93 @@
+import gzip
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from configs import configs
+from routers.utils import passthrough
+from routers.utils.passthrough import passthrough_response, stream_passthrough
+
+pytestmark = pytest.mark.anyio
+
+
+class Item(BaseModel):
+    id: int
+
+
+@pytest.fixture
+def sampling(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(configs, "DEBUG_MODE", False)
+    monkeypatch.setattr(configs.passthrough, "VALIDATION_RATE", 0.0)
+
+
+async def read(response: StreamingResponse) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+async def test_body_is_streamed_without_decoding(upstream, sampling) -> None:
+    compressed = gzip.compress(b'{"id": 1}')
+    closed: list[bool] = []
+
+    async def body():
+        try:
+            yield compressed[:5]
+            yield compressed[5:]
+        finally:
+            closed.append(True)
+
+    upstream["manager"] = lambda request: httpx.Response(
+        200,
+        content=body(),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip", "ETag": '"1"'},
+    )
+
+    response = await stream_passthrough(configs.services.manager, "GET", "/1", Item)
+
+    assert isinstance(response, StreamingResponse)
+    assert closed == []
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"1"'
+    assert await read(response) == compressed
+    assert closed == [True]
+
+
+async def test_error_response_is_proxied(upstream, sampling) -> None:
+    upstream["manager"] = lambda request: httpx.Response(404, json={"detail": "Task not found"})
+
+    with pytest.raises(HTTPException) as error:
+        await stream_passthrough(configs.services.manager, "GET", "/1", Item)
+
+    assert error.value.status_code == 404
+    assert error.value.detail == "Task not found"
+
+
+async def test_sampled_response_is_validated(upstream, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(configs, "DEBUG_MODE", True)
+    validated: list[type[BaseModel]] = []
+    monkeypatch.setattr(
+        passthrough, "validate_content", lambda content, model: validated.append(model)
+    )
+    upstream["manager"] = lambda request: httpx.Response(200, json={"id": "not a number"})
+
+    response = await stream_passthrough(configs.services.manager, "GET", "/1", Item)
+
+    # Несоответствие схеме не прерывает запрос
+    assert not isinstance(response, StreamingResponse)
+    assert response.body == b'{"id":"not a number"}'
+    assert validated == [Item]
+
+
+def test_read_response_is_passed_as_is(sampling) -> None:
+    upstream = httpx.Response(
+        201, content=b'{"id": 1}', headers={"Content-Type": "application/json", "X-Internal": "1"}
+    )
+
+    response = passthrough_response(upstream, Item)
+
+    assert response.status_code == 201
+    assert response.body == b'{"id": 1}'
+    assert response.headers["content-type"] == "application/json"
+    assert "x-internal" not in response.headers
@@ -0,0 +1,103 @@
+import json
+
+import httpx
+import pytest
+
+from configs import configs
+from routers import health
+from routers.utils.prober import EndpointHealth, HealthProber
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def services() -> dict[str, int | None]:
+    """Статус ответа сервисов на проверку (None - сервисы не принимают соединения)."""
+    return {"status": 200}
+
+
+@pytest.fixture
+def prober(services: dict[str, int | None], monkeypatch: pytest.MonkeyPatch) -> HealthProber:
+    monkeypatch.setattr(configs.probes, "FAILURE_THRESHOLD", 2)
+    prober = HealthProber()
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if services["status"] is None:
+            raise httpx.ConnectError("Connection refused", request=request)
+        return httpx.Response(services["status"])
+
+    prober._endpoints = {
+        service.NAME: [EndpointHealth(url) for url in service.ENDPOINT_URLS]
+        for service in configs.services.all()
+    }
+    prober._client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    monkeypatch.setattr(health, "health_prober", prober)
+    return prober
+
+
+def get_statuses(prober: HealthProber) -> set[str]:
+    body = json.loads(prober.body)
+    return {service["status"] for service in body["services"].values()}
+
+
+async def test_readiness_follows_failure_threshold(
+    prober: HealthProber, services: dict[str, int | None], gateway_client: httpx.AsyncClient
+) -> None:
+    response = await gateway_client.get("/health/ready")
+    assert response.status_code == 503 and response.json()["status"] == "not_ready"
+
+    await prober.probe()
+    assert (await gateway_client.get("/health/ready")).status_code == 200
+    assert get_statuses(prober) == {"up"}
+
+    # Единичная неудача не снимает готовность
+    services["status"] = 503
+    await prober.probe()
+    assert prober.ready and get_statuses(prober) == {"up"}
+
+    await prober.probe()
+    assert (await gateway_client.get("/health/ready")).status_code == 503
+    assert get_statuses(prober) == {"down"}
+
+    services["status"] = None
+    await prober.probe()
+    service = json.loads(prober.body)["services"]["auth"]
+    assert service["latency_ms"] is None
+    assert [endpoint["error"] for endpoint in service["endpoints"].values()] == [
+        "Connection refused"
+    ]
+
+    services["status"] = 200
+    await prober.probe()
+    assert (await gateway_client.get("/health/ready")).status_code == 200
+
+    await prober.shutdown()
+
+
+def test_unknown_endpoint_goes_down_on_first_failure() -> None:
+    endpoint = EndpointHealth("http://texts")
+
+    endpoint.record(0.01, "HTTP 500", threshold=3)
+    assert endpoint.status == "down"
+
+    endpoint.record(0.01, None, threshold=3)
+    endpoint.record(0.01, "HTTP 500", threshold=3)
+    endpoint.record(0.01, "HTTP 500", threshold=3)
+    assert endpoint.status == "up"
+
+    endpoint.record(0.01, "HTTP 500", threshold=3)
+    assert endpoint.status == "down" and endpoint.failures == 3
+
+
+async def test_service_is_up_while_any_endpoint_is_up(prober: HealthProber) -> None:
+    healthy, failed = EndpointHealth("http://texts-1"), EndpointHealth("http://texts-2")
+    healthy.record(0.01, None, threshold=1)
+    failed.record(0.01, "Connection refused", threshold=1)
+    prober._endpoints = {"texts": [healthy, failed]}
+
+    assert prober._get_status("texts") == "up"
+
+    healthy.record(0.01, "Connection refused", threshold=1)
+    assert prober._get_status("texts") == "down"
+
+    await prober.shutdown()
@@ -0,0 +1,66 @@
+import asyncio
+import tracemalloc
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from configs import configs
+from routers import admin
+from routers.utils.profiling import Profiler
+from schemas.auth import AuthorizedUser
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def admin_client(gateway_client: httpx.AsyncClient) -> httpx.AsyncClient:
+    from app import gateway
+
+    user = AuthorizedUser(id=uuid4(), name="root", is_admin=True)
+    gateway.dependency_overrides[admin.admin_protected] = lambda: user
+    return gateway_client
+
+
+async def test_only_one_profiling_runs_at_a_time(admin_client: httpx.AsyncClient) -> None:
+    running = asyncio.create_task(
+        admin_client.get("/admin/profile/cpu", params={"duration": 0.2, "interval": 0.01})
+    )
+    await asyncio.sleep(0.05)
+    assert admin.profiler.active
+
+    for path in ("/admin/profile/cpu", "/admin/profile/memory"):
+        response = await admin_client.get(path, params={"duration": 0.1})
+        assert response.status_code == 409
+
+    assert (await running).status_code == 200
+    assert not admin.profiler.active
+
+    response = await admin_client.get("/admin/profile/memory", params={"duration": 0.01})
+    assert response.status_code == 200
+
+
+async def test_disabled_profiling_is_not_found(
+    admin_client: httpx.AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(configs.profiling, "ENABLE", False)
+
+    response = await admin_client.get("/admin/profile/cpu", params={"duration": 0.01})
+
+    assert response.status_code == 404
+
+
+async def test_cpu_profile_samples_event_loop_stacks() -> None:
+    stacks, samples = await Profiler().profile_cpu(duration=0.05, interval=0.005)
+
+    assert samples > 0 and sum(stacks.values()) == samples
+    assert all(";" in stack for stack in stacks)
+
+
+async def test_memory_profile_stops_tracing() -> None:
+    assert not tracemalloc.is_tracing()
+
+    result = await Profiler().profile_memory(duration=0.01, frames=1, group_by="lineno", limit=5)
+
+    assert not tracemalloc.is_tracing()
+    assert len(result["stats"]) <= 5
@@ -0,0 +1,173 @@
+import base64
+import time
+from uuid import uuid4
+
+import httpx
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from configs import configs
+from routers.utils import caching, protection
+from routers.utils.caching import TTLCache
+from routers.utils.jwks import JWKSStore
+from routers.utils.protection import RouteProtection
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.anyio
+
+JWKS_PATH = "/.well-known/jwks.json"
+OLD_SECRET = "old-secret-of-the-auth-service-0001"
+NEW_SECRET = "new-secret-of-the-auth-service-0002"
+
+
+def create_jwk(key_id: str, secret: str) -> dict:
+    encoded = base64.urlsafe_b64encode(secret.encode()).rstrip(b"=").decode()
+    return {"kty": "oct", "kid": key_id, "alg": "HS256", "k": encoded}
+
+
+def create_token(key_id: str | None, secret: str, **claims) -> str:
+    payload = {"id": str(uuid4()), "name": "alice", "is_admin": False, "exp": time.time() + 60}
+    headers = {"kid": key_id} if key_id is not None else None
+    return jwt.encode({**payload, **claims}, secret, algorithm="HS256", headers=headers)
+
+
+@pytest.fixture
+def auth(upstream, monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Сервис авторизации с JWKS. Возвращает набор ключей и проверенные им токены."""
+    state = {"keys": [create_jwk("old", OLD_SECRET)], "verified": []}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        if request.url.path == JWKS_PATH:
+            return httpx.Response(200, json={"keys": state["keys"]})
+
+        state["verified"].append(request)
+        return httpx.Response(200, json={"id": str(uuid4()), "name": "bob", "is_admin": False})
+
+    upstream["auth"] = handle
+    monkeypatch.setattr(configs.auth, "VERIFICATION_MODE", "local")
+    monkeypatch.setattr(configs.auth, "CACHE_ENABLE", False)
+    monkeypatch.setattr(configs.auth, "JWKS_URL", JWKS_PATH)
+    monkeypatch.setattr(protection, "jwks_store", JWKSStore())
+    return state
+
+
+async def test_rotated_key_is_verified_after_refresh(auth: dict) -> None:
+    await protection.jwks_store.refresh()
+    token = create_token("new", NEW_SECRET)
+
+    # Токен с ещё неизвестным ключом проверяется сервисом авторизации
+    subject = await RouteProtection()(token)
+    assert subject.name == "bob" and len(auth["verified"]) == 1
+
+    auth["keys"] = [create_jwk("old", OLD_SECRET), create_jwk("new", NEW_SECRET)]
+    await protection.jwks_store.refresh()
+
+    subject = await RouteProtection()(token)
+    assert subject.name == "alice" and len(auth["verified"]) == 1
+
+
+async def test_unknown_claims_fall_back_to_auth_service(auth: dict) -> None:
+    await protection.jwks_store.refresh()
+    token = jwt.encode(
+        {"sub": "alice", "exp": time.time() + 60}, OLD_SECRET, "HS256", headers={"kid": "old"}
+    )
+
+    subject = await RouteProtection()(token)
+
+    assert subject.name == "bob" and len(auth["verified"]) == 1
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        create_token("old", NEW_SECRET),
+        create_token("old", OLD_SECRET, exp=time.time() - 60),
+        "not-a-token",
+    ],
+)
+async def test_invalid_token_is_rejected_locally(auth: dict, token: str) -> None:
+    await protection.jwks_store.refresh()
+
+    with pytest.raises(HTTPException) as error:
+        await RouteProtection()(token)
+
+    assert error.value.status_code == 401
+    assert auth["verified"] == []
+
+
+async def test_key_unsuitable_for_algorithm_is_rejected(
+    auth: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Публичный ключ RSA не может быть секретом HMAC (подмена алгоритма в заголовке)
+    public_key = "-----BEGIN PUBLIC KEY-----\nMFkwEwYHKoZIzj0CAQ==\n-----END PUBLIC KEY-----"
+    monkeypatch.setattr(configs.auth, "JWKS_URL", None)
+    monkeypatch.setattr(configs.auth, "JWT_PUBLIC_KEY", public_key)
+
+    with pytest.raises(HTTPException) as error:
+        await RouteProtection()(create_token(None, OLD_SECRET))
+
+    assert error.value.status_code == 401
+    assert auth["verified"] == []
+
+
+@pytest.fixture
+def remote_auth(upstream, monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Сервис авторизации с задаваемым статусом ответа. Возвращает статус, число проверок
+    и часы кэша токенов."""
+    clock = FakeClock()
+    state = {"status": 200, "verified": 0, "clock": clock}
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        state["verified"] += 1
+        if state["status"] != 200:
+            return httpx.Response(state["status"], json={"detail": "Rejected"})
+
+        return httpx.Response(200, json={"id": str(uuid4()), "name": "bob", "is_admin": False})
+
+    upstream["auth"] = handle
+    monkeypatch.setattr(caching, "time", clock)
+    monkeypatch.setattr(configs.auth, "VERIFICATION_MODE", "remote")
+    monkeypatch.setattr(configs.auth, "CACHE_ENABLE", True)
+    monkeypatch.setattr(protection, "token_cache", TTLCache(maxsize=10, ttl=configs.auth.CACHE_TTL))
+    return state
+
+
+async def test_cached_token_skips_auth_service(remote_auth: dict) -> None:
+    token = create_token("old", OLD_SECRET)
+
+    first = await RouteProtection()(token)
+    second = await RouteProtection()(token)
+
+    assert first == second
+    assert remote_auth["verified"] == 1
+
+
+async def test_rejection_is_cached_for_negative_ttl(remote_auth: dict) -> None:
+    clock = remote_auth["clock"]
+    remote_auth["status"] = 401
+    token = create_token("old", OLD_SECRET)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            await RouteProtection()(token)
+        assert error.value.status_code == 401
+    assert remote_auth["verified"] == 1
+
+    remote_auth["status"] = 200
+    clock.now += configs.auth.CACHE_NEGATIVE_TTL
+    await RouteProtection()(token)
+    assert remote_auth["verified"] == 2
+
+
+@pytest.mark.parametrize("status_code", [400, 429, 500, 503])
+async def test_other_errors_are_not_cached(remote_auth: dict, status_code: int) -> None:
+    remote_auth["status"] = status_code
+    token = create_token("old", OLD_SECRET)
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as error:
+            await RouteProtection()(token)
+        assert error.value.status_code == status_code
+
+    assert remote_auth["verified"] == 2
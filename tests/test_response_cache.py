@@ -0,0 +1,102 @@
+import asyncio
+
+import httpx
+import pytest
+
+from configs import configs
+from routers.utils import caching
+from routers.utils import response_cache as response_cache_module
+from routers.utils.deadlines import request_deadline
+from routers.utils.response_cache import ResponseCache
+from tests.conftest import FakeClock
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def clock(upstream, monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache_module, "time", clock)
+    monkeypatch.setattr(caching, "time", clock)
+    monkeypatch.setattr(configs.cache, "ENABLE", True)
+    return clock
+
+
+@pytest.fixture
+def texts(upstream) -> list[float | None]:
+    """Сервис текстов, отвечающий номером запроса. Возвращает сроки обработки запросов."""
+    deadlines: list[float | None] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        deadlines.append(request_deadline.get())
+        return httpx.Response(200, json={"version": len(deadlines)})
+
+    upstream["texts"] = handle
+    return deadlines
+
+
+async def get(cache: ResponseCache, path: str = "/", tags: tuple[str, ...] = ()) -> int:
+    response = await cache.get(configs.services.texts, path, ttl=10.0, tags=tags)
+    return response.json()["version"]
+
+
+async def test_stale_response_is_served_while_revalidating(clock: FakeClock, texts) -> None:
+    cache = ResponseCache(maxsize=10, stale_ttl=30.0)
+    assert await get(cache) == 1
+
+    clock.now += 15.0
+    token = request_deadline.set(clock.now + 1.0)
+    try:
+        assert await get(cache) == 1
+    finally:
+        request_deadline.reset(token)
+
+    await asyncio.gather(*cache._revalidations)
+    assert await get(cache) == 2
+    assert cache.stale_hits == 1
+
+    # Фоновое обновление не наследует срок обработки запроса клиента
+    assert texts == [None, None]
+
+
+async def test_expired_stale_response_is_fetched_again(clock: FakeClock, texts) -> None:
+    cache = ResponseCache(maxsize=10, stale_ttl=30.0)
+    assert await get(cache) == 1
+
+    clock.now += 45.0
+    assert await get(cache) == 2
+    assert cache.stale_hits == 0
+
+
+async def test_invalidation_removes_tagged_responses(clock: FakeClock, texts) -> None:
+    cache = ResponseCache(maxsize=10, stale_ttl=30.0)
+    assert await get(cache, "/a", tags=("texts:list",)) == 1
+    assert await get(cache, "/b", tags=("texts:b",)) == 2
+
+    cache.invalidate("texts:list")
+
+    assert await get(cache, "/a", tags=("texts:list",)) == 3
+    assert await get(cache, "/b", tags=("texts:b",)) == 2
+
+
+async def test_response_requested_before_invalidation_is_not_cached(
+    clock: FakeClock, upstream
+) -> None:
+    entered, released = asyncio.Event(), asyncio.Event()
+    versions = iter((1, 2))
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        entered.set()
+        await released.wait()
+        return httpx.Response(200, json={"version": next(versions)})
+
+    upstream["texts"] = handle
+    cache = ResponseCache(maxsize=10, stale_ttl=30.0)
+
+    pending = asyncio.create_task(get(cache, tags=("texts:list",)))
+    await entered.wait()
+    cache.invalidate("texts:list")
+    released.set()
+
+    assert await pending == 1
+    assert await get(cache, tags=("texts:list",)) == 2
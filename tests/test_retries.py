@@ -0,0 +1,187 @@
+import asyncio
+
+import httpx
+import pytest
+
+from configs import configs
+from configs.services import ServiceConfiguration
+from routers.utils.breaker import CircuitOpenError
+from routers.utils.retries import HedgingTransport, LatencyTracker, RetryBudget, RetryTransport
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def service() -> ServiceConfiguration:
+    return configs.services.texts.model_copy(
+        update={"RETRY_ATTEMPTS": 2, "RETRY_BACKOFF": 0.001, "RETRY_BACKOFF_MAX": 0.001}
+    )
+
+
+def create_transport(handle, service: ServiceConfiguration, budget: RetryBudget) -> RetryTransport:
+    return RetryTransport(httpx.MockTransport(handle), service, budget)
+
+
+async def send(transport: httpx.AsyncBaseTransport, method: str = "GET") -> httpx.Response:
+    async with httpx.AsyncClient(transport=transport, base_url="http://texts") as client:
+        return await client.request(method, "/")
+
+
+def test_budget_deposit_is_capped_by_reserve() -> None:
+    budget = RetryBudget(ratio=0.5, reserve=2.0)
+
+    assert budget.withdraw() and budget.withdraw()
+    assert not budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+
+    for _ in range(10):
+        budget.deposit()
+    assert budget.balance == 2.0
+    assert budget.stats() == {"balance": 2.0, "retries": 3, "exhausted": 2}
+
+
+async def test_unavailable_response_is_retried(service: ServiceConfiguration) -> None:
+    statuses = iter((503, 502, 200))
+    budget = RetryBudget(ratio=0.1, reserve=10.0)
+
+    transport = create_transport(lambda _: httpx.Response(next(statuses)), service, budget)
+    response = await send(transport)
+
+    assert response.status_code == 200
+    assert budget.retries == 2
+    assert budget.balance == 8.0
+
+
+async def test_attempts_are_limited(service: ServiceConfiguration) -> None:
+    calls: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise httpx.ConnectError("Connection refused", request=request)
+
+    transport = create_transport(handle, service, RetryBudget(ratio=0.1, reserve=10.0))
+    with pytest.raises(httpx.ConnectError):
+        await send(transport)
+
+    assert len(calls) == service.RETRY_ATTEMPTS + 1
+
+
+async def test_unsafe_method_is_not_retried(service: ServiceConfiguration) -> None:
+    calls: list[httpx.Request] = []
+    budget = RetryBudget(ratio=0.1, reserve=10.0)
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    response = await send(create_transport(handle, service, budget), method="POST")
+
+    assert response.status_code == 503
+    assert len(calls) == 1
+    assert budget.balance == 10.0
+
+
+async def test_open_circuit_is_not_retried(service: ServiceConfiguration) -> None:
+    calls: list[httpx.Request] = []
+    budget = RetryBudget(ratio=0.1, reserve=10.0)
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        raise CircuitOpenError("Circuit is open", retry_after=5.0, request=request)
+
+    with pytest.raises(CircuitOpenError):
+        await send(create_transport(handle, service, budget))
+
+    assert len(calls) == 1
+    assert budget.retries == 0
+
+
+async def test_exhausted_budget_stops_retries(service: ServiceConfiguration) -> None:
+    calls: list[httpx.Request] = []
+    budget = RetryBudget(ratio=0.1, reserve=1.0)
+    budget.balance = 0.0
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(503)
+
+    first = await send(create_transport(handle, service, budget))
+    assert first.status_code == 503 and len(calls) == 1
+    assert budget.exhausted == 1
+
+    # Пополнения от исходных запросов хватает на повтор только после накопления единицы
+    for _ in range(9):
+        budget.deposit()
+    await send(create_transport(handle, service, budget))
+
+    assert len(calls) == 3
+    assert budget.retries == 1
+
+
+def create_hedging(
+    handle, service: ServiceConfiguration, budget: RetryBudget
+) -> tuple[HedgingTransport, LatencyTracker]:
+    tracker = LatencyTracker(size=10, min_samples=1)
+    tracker.add(0.01)
+    return HedgingTransport(httpx.MockTransport(handle), service, tracker, budget), tracker
+
+
+async def test_faster_hedge_wins(service: ServiceConfiguration) -> None:
+    calls: list[int] = []
+    released = asyncio.Event()
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await released.wait()
+            return httpx.Response(200, text="first")
+
+        return httpx.Response(200, text="second")
+
+    budget = RetryBudget(ratio=0.1, reserve=10.0)
+    transport, tracker = create_hedging(handle, service, budget)
+    response = await send(transport)
+
+    assert response.text == "second"
+    assert tracker.hedges == 1 and tracker.hedge_wins == 1
+    assert budget.retries == 1
+
+
+async def test_failed_hedge_loses_to_slow_success(service: ServiceConfiguration) -> None:
+    calls: list[int] = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, text="first")
+
+        return httpx.Response(503)
+
+    transport, tracker = create_hedging(handle, service, RetryBudget(ratio=0.1, reserve=10.0))
+    response = await send(transport)
+
+    assert response.text == "first"
+    assert tracker.hedges == 1 and tracker.hedge_wins == 0
+
+
+async def test_no_hedge_without_budget(service: ServiceConfiguration) -> None:
+    calls: list[int] = []
+
+    async def handle(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200)
+
+    budget = RetryBudget(ratio=0.1, reserve=10.0)
+    budget.balance = 0.0
+    transport, tracker = create_hedging(handle, service, budget)
+    response = await send(transport)
+
+    assert response.status_code == 200
+    assert len(calls) == 1
+    assert tracker.hedges == 0 and budget.exhausted == 1
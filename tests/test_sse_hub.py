@@ -0,0 +1,197 @@
+import asyncio
+import json
+from typing import AsyncGenerator
+
+import pytest
+
+from configs import configs
+from routers.utils import sse_hub as hub_module
+from routers.utils.sse_hub import SSEHub
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeManager:
+    """Поток событий задачи из сервиса-менеджера, управляемый тестом."""
+
+    def __init__(self) -> None:
+        self.messages: asyncio.Queue[str | None] = asyncio.Queue()
+        self.opened = 0
+
+    async def stream(self, task_id: str, user_id: str) -> AsyncGenerator[str, None]:
+        self.opened += 1
+        while (message := await self.messages.get()) is not None:
+            yield message
+
+    def send(self, status: str) -> None:
+        self.messages.put_nowait(json.dumps({"status": status}))
+
+
+@pytest.fixture
+def manager(monkeypatch: pytest.MonkeyPatch) -> FakeManager:
+    manager = FakeManager()
+    monkeypatch.setattr(hub_module, "proxy_task_sse_request", manager.stream)
+    return manager
+
+
+async def receive(stream: AsyncGenerator[dict, None]) -> dict:
+    return await asyncio.wait_for(anext(stream), 1.0)
+
+
+async def test_joining_live_channel_replays_latest_event(manager: FakeManager) -> None:
+    hub = SSEHub()
+    first = hub.subscribe("task", "user")
+    pending = asyncio.ensure_future(receive(first))
+    await asyncio.sleep(0)
+
+    manager.send("preprocessing")
+    started = await pending
+
+    second = hub.subscribe("task", "user")
+    assert await receive(second) == started
+    assert manager.opened == 1
+
+    manager.send("transcribing")
+    assert json.loads((await receive(first))["data"])["status"] == "transcribing"
+    assert json.loads((await receive(second))["data"])["status"] == "transcribing"
+
+    await first.aclose()
+    await second.aclose()
+    assert hub.stats()["channels"] == 0
+
+
+async def test_reconnect_replays_missed_events(manager: FakeManager) -> None:
+    hub = SSEHub()
+    stream = hub.subscribe("task", "user")
+    pending = asyncio.ensure_future(receive(stream))
+    await asyncio.sleep(0)
+
+    manager.send("started")
+    last_event = await pending
+    manager.send("preprocessing")
+    manager.send("completed")
+    await asyncio.sleep(0.01)
+    await stream.aclose()
+
+    events = [event async for event in hub.subscribe("task", "user", last_event["id"])]
+
+    statuses = [json.loads(event["data"])["status"] for event in events]
+    assert statuses == ["preprocessing", "completed"]
+    assert hub.replayed == 2
+    assert manager.opened == 1
+
+
+async def test_slow_subscriber_is_dropped(
+    manager: FakeManager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(configs.streams, "QUEUE_SIZE", 2)
+    hub = SSEHub()
+    received = []
+
+    async def consume(stream: AsyncGenerator[dict, None]) -> None:
+        async for event in stream:
+            received.append(json.loads(event["data"])["status"])
+
+    slow = hub.subscribe("task", "user")
+    pending = asyncio.ensure_future(receive(slow))
+    fast = asyncio.ensure_future(consume(hub.subscribe("task", "user")))
+    await asyncio.sleep(0)
+
+    manager.send("started")
+    await pending
+
+    for status in ("preprocessing", "transcribing", "transcribing", "completed"):
+        manager.send(status)
+        await asyncio.sleep(0)
+    await asyncio.wait_for(fast, 1.0)
+
+    assert hub.dropped == 1
+    assert received == ["started", "preprocessing", "transcribing", "transcribing", "completed"]
+    assert [event async for event in slow] == []
+
+
+async def test_channel_stream_does_not_inherit_request_context(monkeypatch) -> None:
+    from routers.utils.deadlines import request_deadline
+    from routers.utils.timing import RequestTimings, request_timings
+    from routers.utils.tracing import current_span, tracer
+
+    seen = []
+
+    async def stream(task_id: str, user_id: str) -> AsyncGenerator[str, None]:
+        seen.append((request_deadline.get(), current_span.get(), request_timings.get()))
+        yield json.dumps({"status": "completed"})
+
+    monkeypatch.setattr(hub_module, "proxy_task_sse_request", stream)
+    hub = SSEHub()
+
+    request_deadline.set(123.0)
+    request_timings.set(RequestTimings())
+    with tracer.start_span("GET /tasks/{uuid}/stream", kind="server"):
+        events = [event async for event in hub.subscribe("task", "user")]
+
+    assert len(events) == 1
+    assert seen == [(None, None, None)]
+
+
+def test_history_replays_only_known_events() -> None:
+    history = hub_module.EventHistory(maxsize=2)
+    first, second, third = (history.append(json.dumps({"n": n})) for n in range(3))
+
+    assert history.after(second["id"]) == [third]
+    assert history.after(third["id"]) == []
+
+    # Вытесненное событие всё ещё задаёт позицию клиента в буфере
+    assert history.after(first["id"]) == [second, third]
+
+    other = hub_module.EventHistory(maxsize=2)
+    assert history.after(other.append("{}")["id"]) is None
+    assert history.after(f"{history.epoch}-last") is None
+    assert history.after("garbage") is None
+
+
+async def test_reconnect_to_live_channel_continues_after_missed_events(
+    manager: FakeManager,
+) -> None:
+    hub = SSEHub()
+    watcher = hub.subscribe("task", "user")
+    pending = asyncio.ensure_future(receive(watcher))
+    await asyncio.sleep(0)
+
+    manager.send("started")
+    last_event = await pending
+    manager.send("preprocessing")
+    assert json.loads((await receive(watcher))["data"])["status"] == "preprocessing"
+
+    # Клиент переподключается, пока поток задачи ещё открыт
+    stream = hub.subscribe("task", "user", last_event["id"])
+    assert json.loads((await receive(stream))["data"])["status"] == "preprocessing"
+
+    manager.send("transcribing")
+    assert json.loads((await receive(stream))["data"])["status"] == "transcribing"
+    assert hub.replayed == 1
+    assert manager.opened == 1
+
+    await stream.aclose()
+    await watcher.aclose()
+
+
+async def test_unknown_event_id_starts_from_current_state(manager: FakeManager) -> None:
+    hub = SSEHub()
+    stream = hub.subscribe("task", "user")
+    pending = asyncio.ensure_future(receive(stream))
+    await asyncio.sleep(0)
+    manager.send("completed")
+    await pending
+    await stream.aclose()
+
+    # Идентификатор из другого буфера не позволяет определить пропущенные события
+    reconnected = hub.subscribe("task", "user", "deadbeef-1")
+    pending = asyncio.ensure_future(receive(reconnected))
+    await asyncio.sleep(0)
+    manager.send("completed")
+
+    assert json.loads((await pending)["data"])["status"] == "completed"
+    assert hub.replayed == 0
+    assert manager.opened == 2
+
+    await reconnected.aclose()
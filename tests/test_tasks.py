@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from configs import configs
+from routers import tasks
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def manager(upstream, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Сервис-менеджер с пятью задачами. Возвращает пути полученных им запросов."""
+    monkeypatch.setattr(configs.cache, "ENABLE", True)
+    tasks.task_lists.clear()
+
+    now = datetime.now(timezone.utc)
+    items = [
+        {
+            "id": str(uuid4()),
+            "status": "completed",
+            "title": f"Task {i}",
+            "accuracy": 90.0,
+            "created_at": (now - timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(5)
+    ]
+    paths: list[str] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/transcribe":
+            return httpx.Response(200, json={"id": str(uuid4())})
+
+        return httpx.Response(200, json=list(reversed(items)))
+
+    upstream["manager"] = handle
+    yield paths
+
+    tasks.task_lists.clear()
+
+
+async def test_pages_share_task_list(gateway_client: httpx.AsyncClient, manager) -> None:
+    first = await gateway_client.get("/tasks/cursor", params={"size": 2})
+    cursor = first.json()["next_cursor"]
+    second = await gateway_client.get("/tasks/cursor", params={"size": 2, "cursor": cursor})
+    page = await gateway_client.get("/tasks/", params={"page": 3, "size": 2})
+
+    titles = [item["title"] for r in (first, second, page) for item in r.json()["items"]]
+    assert titles == [f"Task {i}" for i in range(5)]
+    assert manager == ["/"]
+
+
+async def test_created_task_resets_task_list(gateway_client: httpx.AsyncClient, manager) -> None:
+    await gateway_client.get("/tasks/", params={"size": 2})
+
+    boundary = "boundary"
+    body = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="title"\r\n\r\nReading\r\n'
+        f'--{boundary}\r\nContent-Disposition: form-data; name="text_id"\r\n\r\n{uuid4()}\r\n'
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.wav"\r\n'
+        f"Content-Type: audio/wav\r\n\r\nRIFF\r\n--{boundary}--\r\n"
+    )
+    created = await gateway_client.post(
+        "/tasks/",
+        content=body.encode(),
+        headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    )
+    await gateway_client.get("/tasks/", params={"size": 2})
+
+    assert created.status_code == 200
+    assert manager == ["/", "/transcribe", "/"]
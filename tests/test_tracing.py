@@ -0,0 +1,105 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from configs import configs
+from routers.utils.observability import ObservabilityMiddleware
+from routers.utils.tracing import (
+    TRACEPARENT_HEADER,
+    TRACESTATE_HEADER,
+    Tracer,
+    TracingTransport,
+    parse_traceparent,
+)
+
+pytestmark = pytest.mark.anyio
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+SPAN_ID = "00f067aa0ba902b7"
+
+
+def test_valid_traceparent_is_parsed() -> None:
+    context = parse_traceparent(f" 00-{TRACE_ID.upper()}-{SPAN_ID}-03 ", "vendor=1")
+
+    assert context is not None
+    assert (context.trace_id, context.span_id) == (TRACE_ID, SPAN_ID)
+    assert context.sampled and context.state == "vendor=1"
+    assert parse_traceparent(f"00-{TRACE_ID}-{SPAN_ID}-00").sampled is False
+
+
+@pytest.mark.parametrize(
+    "traceparent",
+    [
+        None,
+        "",
+        "garbage",
+        f"ff-{TRACE_ID}-{SPAN_ID}-01",
+        f"00-{'0' * 32}-{SPAN_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+        f"00-{TRACE_ID[:-1]}-{SPAN_ID}-01",
+        f"00-{TRACE_ID}-{SPAN_ID}-01-extra",
+    ],
+)
+def test_invalid_traceparent_is_ignored(traceparent: str | None) -> None:
+    assert parse_traceparent(traceparent) is None
+
+
+def test_child_spans_continue_remote_trace(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(configs.tracing, "ENABLE", True)
+    tracer = Tracer()
+    parent = parse_traceparent(f"00-{TRACE_ID}-{SPAN_ID}-01")
+
+    with tracer.start_span("GET", kind="server", parent=parent) as server:
+        with tracer.start_span("auth.authenticate") as child:
+            pass
+
+    assert server.context.trace_id == child.context.trace_id == TRACE_ID
+    assert server.parent_id == SPAN_ID
+    assert child.parent_id == server.context.span_id
+    assert tracer.processor.stats()["queued"] == 2
+
+
+def test_unsampled_trace_is_not_recorded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(configs.tracing, "ENABLE", True)
+    tracer = Tracer()
+
+    with tracer.start_span("GET", parent=parse_traceparent(f"00-{TRACE_ID}-{SPAN_ID}-00")):
+        pass
+
+    assert tracer.processor.stats()["queued"] == 0
+
+
+async def test_trace_context_is_propagated_to_services() -> None:
+    received: list[httpx.Request] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(200)
+
+    transport = TracingTransport(httpx.MockTransport(handle), configs.services.texts)
+    app = FastAPI()
+
+    @app.get("/texts")
+    async def get_texts() -> dict:
+        async with httpx.AsyncClient(transport=transport, base_url="http://texts") as client:
+            await client.get("/")
+        return {}
+
+    app.add_middleware(ObservabilityMiddleware)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://gateway"
+    ) as client:
+        response = await client.get(
+            "/texts",
+            headers={
+                TRACEPARENT_HEADER: f"00-{TRACE_ID}-{SPAN_ID}-01",
+                TRACESTATE_HEADER: "vendor=1",
+            },
+        )
+
+    assert response.headers["X-Trace-Id"] == TRACE_ID
+
+    outgoing = parse_traceparent(received[0].headers[TRACEPARENT_HEADER])
+    assert outgoing.trace_id == TRACE_ID and outgoing.sampled
+    assert outgoing.span_id != SPAN_ID
+    assert received[0].headers[TRACESTATE_HEADER] == "vendor=1"
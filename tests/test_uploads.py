@@ -0,0 +1,166 @@
+from typing import AsyncIterator
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import HTTPException, Request
+
+from configs import configs
+from routers.utils.uploads import MultipartUpload
+
+pytestmark = pytest.mark.anyio
+
+BOUNDARY = "boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def field(name: str, value: str) -> bytes:
+    return (
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+    ).encode()
+
+
+def file_header(content_type: str = "audio/wav") -> bytes:
+    return (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="speech.wav"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+
+
+def form(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+@pytest.fixture
+def manager(upstream) -> list[bytes]:
+    """Тела запросов, полученных сервисом-менеджером."""
+    bodies: list[bytes] = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(200, json={"id": str(uuid4())})
+
+    upstream["manager"] = handle
+    return bodies
+
+
+async def test_upload_is_forwarded(gateway_client: httpx.AsyncClient, manager) -> None:
+    body = form(
+        field("title", "Reading"), field("text_id", str(uuid4())), file_header() + b"RIFF\r\n"
+    )
+
+    response = await gateway_client.post(
+        "/tasks/", content=body, headers={"Content-Type": CONTENT_TYPE}
+    )
+
+    assert response.status_code == 200
+    assert len(manager) == 1
+    assert b"Reading" in manager[0] and b'name="user_id"' in manager[0]
+    assert b"RIFF" in manager[0]
+
+
+async def test_oversized_upload_is_rejected_before_upstream(
+    gateway_client: httpx.AsyncClient, manager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(configs.uploads, "MAX_SIZE", 16)
+    monkeypatch.setattr(configs.uploads, "FIELD_MAX_SIZE", 16)
+    body = form(
+        field("title", "Reading"), field("text_id", str(uuid4())), file_header() + b"0" * 64
+    )
+
+    response = await gateway_client.post(
+        "/tasks/", content=body, headers={"Content-Type": CONTENT_TYPE}
+    )
+
+    assert response.status_code == 413
+    assert manager == []
+
+
+async def test_oversized_stream_returns_clean_error(
+    gateway_client: httpx.AsyncClient, manager, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(configs.uploads, "MAX_SIZE", 16)
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield field("title", "Reading") + field("text_id", str(uuid4())) + file_header()
+        for _ in range(4):
+            yield b"0" * 8
+        yield f"\r\n--{BOUNDARY}--\r\n".encode()
+
+    # Без Content-Length размер файла известен только во время пересылки
+    response = await gateway_client.post(
+        "/tasks/", content=chunks(), headers={"Content-Type": CONTENT_TYPE}
+    )
+
+    assert response.status_code == 413
+    assert manager == []
+
+
+async def test_wrong_request_type_is_rejected(gateway_client: httpx.AsyncClient, manager) -> None:
+    response = await gateway_client.post("/tasks/", json={"title": "Reading"})
+
+    assert response.status_code == 415
+    assert manager == []
+
+
+async def test_wrong_file_type_is_rejected(gateway_client: httpx.AsyncClient, manager) -> None:
+    body = form(
+        field("title", "Reading"),
+        field("text_id", str(uuid4())),
+        file_header("text/plain") + b"hi\r\n",
+    )
+
+    response = await gateway_client.post(
+        "/tasks/", content=body, headers={"Content-Type": CONTENT_TYPE}
+    )
+
+    assert response.status_code == 415
+    assert manager == []
+
+
+@pytest.mark.parametrize(
+    "parts",
+    [
+        (field("title", "Reading"), file_header() + b"RIFF\r\n"),
+        (field("title", "Reading"), field("text_id", "not-a-uuid"), file_header() + b"RIFF\r\n"),
+        (field("title", "Reading"), field("text_id", str(uuid4()))),
+    ],
+    ids=["missing-field", "invalid-field", "missing-file"],
+)
+async def test_invalid_form_is_rejected(
+    gateway_client: httpx.AsyncClient, manager, parts: tuple[bytes, ...]
+) -> None:
+    response = await gateway_client.post(
+        "/tasks/", content=form(*parts), headers={"Content-Type": CONTENT_TYPE}
+    )
+
+    assert response.status_code == 422
+    assert manager == []
+
+
+async def test_fields_after_file_are_rejected_before_file_is_read() -> None:
+    chunks = [field("title", "Reading") + file_header(), b"0" * 1024, b"0" * 1024]
+    chunks.append(b"\r\n" + form(field("text_id", str(uuid4()))))
+    received: list[bytes] = []
+
+    async def receive() -> dict:
+        received.append(chunks[len(received)])
+        more = len(received) < len(chunks)
+        return {"type": "http.request", "body": received[-1], "more_body": more}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/tasks/",
+        "headers": [(b"content-type", CONTENT_TYPE.encode())],
+    }
+    upload = MultipartUpload(
+        Request(scope, receive), file_field="file", fields={"title": str, "text_id": str}
+    )
+
+    with pytest.raises(HTTPException) as error:
+        await upload.prepare()
+
+    assert error.value.status_code == 422
+    assert len(received) == 1